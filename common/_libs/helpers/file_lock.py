@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+        Exclusive inter-process lock based on the OS file locking. Lock file is created if it does not exist.
+        Lock is also exclusive between threads of the same process. It is released automatically if the process dies.
+
+    Examples:
+        with FileLock("/tmp/tokens.json.lock", timeout=30):
+            update_shared_file()
+
+    Args:
+        path (str): Path to the lock file
+        timeout (float): Max time in seconds to wait for the lock. Waits forever if not set
+        poll_interval (float): Interval in seconds between attempts to acquire the lock
+    """
+
+    def __init__(self, path, timeout=None, poll_interval=0.05):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+        self._thread_lock = threading.Lock()
+
+    def _try_lock(self):
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                # the first byte of the file is locked
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        """Acquires the lock
+
+        Raises:
+            TimeoutError if the lock is not acquired during timeout
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        if not self._thread_lock.acquire(timeout=self.timeout if self.timeout is not None else -1):
+            raise TimeoutError(f"Lock {self.path} is not acquired in {self.timeout} seconds")
+        self._file = open(self.path, "a+")
+        while not self._try_lock():
+            if deadline is not None and time.monotonic() > deadline:
+                self._file.close()
+                self._thread_lock.release()
+                raise TimeoutError(f"Lock {self.path} is not acquired in {self.timeout} seconds")
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        """Releases the lock"""
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+def lock_path(path):
+    """Returns path of the lock file for the file. E.x.: /tmp/tokens.json.lock"""
+    return f"{os.path.abspath(path)}.lock"
@@ -1,10 +1,63 @@
+import random
 from functools import wraps
 from operator import eq, lt, ne, gt
-from time import sleep
+from time import monotonic, sleep
+from typing import Any, Callable, Iterator, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+POLL_INITIAL_INTERVAL = 0.01
+POLL_MAX_INTERVAL = 0.25
+
+
+def backoff_intervals(initial: float = POLL_INITIAL_INTERVAL, max_interval: float = POLL_MAX_INTERVAL,
+                      factor: float = 2.0, jitter: float = 0.1) -> Iterator[float]:
+    """Yields sleep intervals growing exponentially from initial to max_interval. Each interval is randomly
+    changed by up to jitter part of it, so parallel waiters do not poll in step
+
+    Examples:
+        intervals = backoff_intervals()
+        while not condition():
+            sleep(next(intervals))   # 0.01, 0.02, 0.04 ... 0.25, 0.25
+    """
+    interval = min(initial, max_interval)
+    while True:
+        yield min(interval * (1 + random.uniform(-jitter, jitter)), max_interval)
+        interval = min(interval * factor, max_interval)
+
+
+def poll_until(getter: Callable[[], Any], predicate: Callable[[Any], bool], timeout: float = 0,
+               initial_interval: float = POLL_INITIAL_INTERVAL,
+               max_interval: float = POLL_MAX_INTERVAL) -> Tuple[bool, Any]:
+    """Calls getter till predicate of its value is true or timeout is over. Checks start with initial_interval
+    and are spread by backoff_intervals, so fast conditions are seen in milliseconds and slow ones do not load
+    the application. Value is checked at least once and once more at the deadline.
+
+    Examples:
+        passed, text = poll_until(lambda: element.text, lambda text: "Saved" in text, timeout=10)
+
+    Args:
+        getter (func):          Callable object without parameters returning the checked value.
+        predicate (func):       Condition of the value.
+        timeout (float):        Seconds to wait for the condition, 0 or None - check once.
+        initial_interval (float): First sleep between the checks.
+        max_interval (float):   Upper bound of the sleep between the checks.
+
+    Returns:
+        :tuple of the condition result and the last value
+    """
+    deadline = monotonic() + (timeout or 0)
+    intervals = backoff_intervals(initial_interval, max_interval)
+    while True:
+        value = getter()
+        if predicate(value):
+            return True, value
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            return False, value
+        sleep(min(next(intervals), remaining))
+
 
 def wait_for_return_value(
         function_getter, required_value,
@@ -85,13 +85,17 @@ class PyCatsLogger:
         self._logger_instances.append(self.logger)
         create_folder(self.log_dir)
 
-    def switch_test(self, filename: str):
+    @classmethod
+    def test_file_path(cls, filename: str, extension: str = ".log") -> str:
+        """Returns path of the test file in the log folder: test log or other file next to it (E.x.: .har)"""
         filename = slugify(filename)
-        if not filename.endswith(".log"):
-            filename += ".log"
+        if not filename.endswith(extension):
+            filename += extension
+        return f"{cls.log_dir}/{filename}"
 
+    def switch_test(self, filename: str):
         # prepare file handler for new test
-        self._file_handler = logging.FileHandler(f"{self.log_dir}/{filename}")
+        self._file_handler = logging.FileHandler(self.test_file_path(filename))
         self._file_handler.setLevel(self.log_level)
         self._file_handler.setFormatter(logging.Formatter(self.log_format))
 
@@ -5,3 +5,7 @@ method_exclude_lists = {"get": ["post_data", "put_data", "patch_data", "delete_d
                         "put": ["params", "post_data", "patch_data", "delete_data"],
                         "delete": ["params", "post_data", "patch_data", "put_data"],
                         "patch": ["params", "post_data", "delete_data", "put_data"]}
+
+# precomputed exclusion sets of request building for each method
+request_exclude_sets = {method: frozenset(default_exclude_list + exclude_list)
+                        for method, exclude_list in method_exclude_lists.items()}
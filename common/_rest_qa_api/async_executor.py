@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # to avoid import loop only for annotations
+    from common._rest_qa_api.base_endpoint import BaseEndpoint, BaseResponseModel  # noqa
+
+logger = logging.getLogger(__name__)
+
+
+class _WorkersSingleton(type):
+    """Metaclass with one instance per max_workers value, so endpoints with different pool sizes
+    do not share the thread pool of the size of the first one
+    """
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __call__(cls, max_workers: Optional[int] = None):
+        with _WorkersSingleton._lock:
+            key = (cls.__name__, max_workers)
+            instance = _WorkersSingleton._instances.get(key)
+            if instance is None:
+                instance = _WorkersSingleton._instances[key] = type.__call__(cls, max_workers)
+            return instance
+
+
+class AsyncHTTPClient(metaclass=_WorkersSingleton):
+    """asyncio stand-in of HTTP client on top of the pooled requests sessions.
+
+    Blocking send calls are executed in the shared thread pool, so the event loop can wait for many responses
+    at the same time while connections are still reused via SessionManager pools.
+    There is one client for each max_workers value: AsyncHTTPClient(max_workers) returns the client
+    with the thread pool of this size.
+
+    Args:
+        max_workers (int): Max number of requests in flight. Should not exceed [api] pool_maxsize to avoid
+            discarding of the extra connections
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pycats_http")
+
+    async def request(self, send: Callable, request_kwargs: dict):
+        """Sends request in the thread pool without blocking the event loop
+
+        Args:
+            send (Callable): Blocking send function. Accepts request kwargs and returns requests.Response
+            request_kwargs (dict): Arguments for requests.Session.request
+
+        Returns:
+            :requests.Response object
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(send, **request_kwargs))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+async def gather_endpoints(calls: Iterable[Tuple['BaseEndpoint', str]], concurrency: int = 10,
+                           base_validation=True, return_exceptions=False) -> List['BaseResponseModel']:
+    """Executes endpoint calls concurrently and validates each response with the endpoint response model
+
+    Examples:
+        weather = DailyWeatherEndpointBuilder()
+        users = UsersEndpointBuilder()
+        responses = await gather_endpoints([(weather.endpoint, "get"), (users.endpoint, "get")], concurrency=5)
+
+    Args:
+        calls (Iterable[Tuple[BaseEndpoint, str]]): pairs of endpoint and HTTP method to call
+        concurrency (int): Max number of requests executed at the same time
+        base_validation (bool): If True - performs validation for each response, otherwise skip it
+        return_exceptions (bool): If True - exceptions are returned in results list instead of raising the first one
+
+    Returns:
+        :list of BaseResponseModel objects (or exceptions) in the same order as calls
+
+    Raises:
+        :RestResponseValidationError if any response validation fails and return_exceptions is False
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited_call(endpoint, method):
+        async with semaphore:
+            return await endpoint.execute_async(method, base_validation=base_validation)
+
+    return await asyncio.gather(*(limited_call(endpoint, method) for endpoint, method in calls),
+                                return_exceptions=return_exceptions)
+
+
+def run_endpoints(calls: Iterable[Tuple['BaseEndpoint', str]], concurrency: int = 10,
+                  base_validation=True, return_exceptions=False) -> List['BaseResponseModel']:
+    """Synchronous shortcut for gather_endpoints to be used in tests and steps without event loop.
+    See gather_endpoints for arguments description.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(gather_endpoints(calls, concurrency=concurrency,
+                                                        base_validation=base_validation,
+                                                        return_exceptions=return_exceptions))
+    finally:
+        loop.close()
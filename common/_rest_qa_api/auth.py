@@ -0,0 +1,400 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+from common._libs.helpers.file_lock import FileLock, lock_path
+from common._libs.helpers.singleton import Singleton, get_singleton_instance
+from common._rest_qa_api.rest_utils import merge_params
+from common.config_manager import ConfigManager
+from common.config_parser.config_dto import APISettingsDTO
+
+logger = logging.getLogger(__name__)
+
+# max share of the token life time before the expiry when the token is refreshed in the background
+REFRESH_AHEAD_SHARE = 0.5
+
+
+def _api_settings() -> APISettingsDTO:
+    """Returns [api] settings of the loaded config or the default settings if the config is not loaded yet.
+    Settings are read on each use, so providers and the token cache created before the config is loaded
+    still follow it
+    """
+    config = get_singleton_instance(ConfigManager)
+    return config.get_api_settings() if config is not None else APISettingsDTO()
+
+
+@dataclass
+class Token:
+    """Auth token with expiry
+
+    Attributes:
+        value (str): Token value
+        expires_at (float): Expiry time as unix timestamp. Never expires if not set
+        issued_at (float): Fetch time as unix timestamp. Unknown if not set
+    """
+    value: str
+    expires_at: Optional[float] = None
+    issued_at: Optional[float] = None
+
+    def expires_in(self) -> float:
+        """Returns number of seconds the token is valid for"""
+        return float("inf") if self.expires_at is None else self.expires_at - time.time()
+
+    def lifetime(self) -> Optional[float]:
+        """Returns number of seconds the token was issued for or None if it is unknown"""
+        if self.expires_at is None or self.issued_at is None:
+            return None
+        return self.expires_at - self.issued_at
+
+
+class TokenCache(metaclass=Singleton):
+    """Cache of auth tokens shared by all endpoints of the process and, if the cache file is set,
+    by all processes of the test run.
+
+    Tokens are kept in memory. With the cache file they are also kept in the JSON file, so pytest-xdist workers
+    and subsequent runs get the token fetched by any of them. The file is updated under the file lock and the token
+    is fetched under the same lock, so only one process fetches the expired token, others wait and read it from
+    the file. The file is readable by the owner only.
+
+    Examples:
+        token = TokenCache().get_or_fetch("weather", lambda: Token(login(), time.time() + 3600))
+
+    Args:
+        cache_file (str): Path to the token cache file. token_cache_file option of [api] config section
+            is used if not set, it is read on each use. Tokens are not written to disk if neither is set
+        lock_timeout (float): Max time in seconds to wait for the cache file lock
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, lock_timeout: float = 120):
+        self._cache_file = cache_file
+        self.lock_timeout = lock_timeout
+        self._tokens: Dict[str, Token] = dict()
+        self._lock = threading.Lock()
+
+    @property
+    def cache_file(self) -> Optional[str]:
+        return self._cache_file or _api_settings().token_cache_file
+
+    @contextmanager
+    def _locked(self):
+        """Locks the cache for the threads of the process and, if the cache file is set, for the other processes"""
+        with self._lock:
+            cache_file = self.cache_file
+            if cache_file is None:
+                yield
+                return
+            with FileLock(lock_path(cache_file), self.lock_timeout):
+                yield
+
+    def _read_file(self) -> Dict[str, Token]:
+        cache_file = self.cache_file
+        if cache_file is None:
+            return dict()
+        try:
+            with open(cache_file) as file:
+                return {key: Token(**value) for key, value in json.load(file).items()}
+        except (OSError, ValueError, TypeError):
+            return dict()
+
+    def _write_file(self, tokens: Dict[str, Token]):
+        cache_file = self.cache_file
+        if cache_file is None:
+            return
+        # write to the temporary file first, so readers never get a partial file
+        temp_path = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w") as file:
+            json.dump({key: token.__dict__ for key, token in tokens.items()}, file)
+        os.replace(temp_path, cache_file)
+
+    def get(self, key: str, min_ttl: float = 0) -> Optional[Token]:
+        """Returns cached token valid for more than min_ttl seconds or None"""
+        token = self._tokens.get(key)
+        if token is None or token.expires_in() <= min_ttl:
+            token = self._read_file().get(key)
+            if token is None or token.expires_in() <= min_ttl:
+                return None
+            self._tokens[key] = token
+        return token
+
+    def put(self, key: str, token: Token):
+        """Saves token to the cache"""
+        with self._locked():
+            self._put(key, token)
+
+    def _put(self, key: str, token: Token):
+        self._tokens[key] = token
+        tokens = self._read_file()
+        tokens[key] = token
+        self._write_file(tokens)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Token], min_ttl: float = 0) -> Token:
+        """Returns cached token valid for more than min_ttl seconds or fetches the new one and saves it to the cache
+
+        Args:
+            key (str): Token name. E.x.: service and user name
+            fetch (Callable): Function which returns new Token
+            min_ttl (float): Min number of seconds the returned token should be valid for
+
+        Returns:
+            :Token object
+        """
+        token = self.get(key, min_ttl)
+        if token is not None:
+            return token
+        with self._locked():
+            # token may be fetched by another thread or process while the lock is awaited
+            token = self.get(key, min_ttl)
+            if token is None:
+                logger.info(f"Fetch auth token '{key}'")
+                token = fetch()
+                self._put(key, token)
+        return token
+
+    def remove(self, key: str):
+        """Removes token from the cache. E.x.: if the token was revoked"""
+        with self._locked():
+            self._tokens.pop(key, None)
+            tokens = self._read_file()
+            if tokens.pop(key, None) is not None:
+                self._write_file(tokens)
+
+
+class AuthProvider(metaclass=ABCMeta):
+    """Base class of the auth providers. Provider adds auth data to the request arguments built by BaseEndpoint"""
+
+    @abstractmethod
+    def apply(self, request_kwargs: dict) -> dict:
+        """Adds auth data to the request arguments
+
+        Args:
+            request_kwargs (dict): Arguments for requests.Session.request: method, url, params, headers, body, etc
+
+        Returns:
+            :dict with request arguments
+        """
+
+    def secret_names(self) -> Tuple[str, ...]:
+        """Returns names of the headers and query params the provider puts auth data in.
+        Their values are redacted in the recorded requests (E.x.: HAR files)
+        """
+        return ()
+
+
+def _add_credentials(request_kwargs: dict, value: str, header: Optional[str], scheme: Optional[str],
+                     param: Optional[str]) -> dict:
+    if param:
+        request_kwargs["params"] = merge_params(request_kwargs.get("params"), {param: value})
+    else:
+        request_kwargs["headers"] = dict(request_kwargs.get("headers") or {},
+                                         **{header: f"{scheme} {value}" if scheme else value})
+    return request_kwargs
+
+
+class StaticTokenAuth(AuthProvider):
+    """Adds the constant token to the header or query param of each request
+
+    Examples:
+        auth = StaticTokenAuth(api_key, param="appid")
+
+    Args:
+        token (str): Token value
+        header (str): Header name to send token in
+        scheme (str): Auth scheme to put before the token in the header. Token is sent as is if empty
+        param (str): Query param name to send token in. Header is not used if set
+    """
+
+    def __init__(self, token: str, header: str = "Authorization", scheme: Optional[str] = "Bearer",
+                 param: Optional[str] = None):
+        self.token = token
+        self.header = header
+        self.scheme = scheme
+        self.param = param
+
+    def apply(self, request_kwargs: dict) -> dict:
+        return _add_credentials(request_kwargs, self.token, self.header, self.scheme, self.param)
+
+    def secret_names(self) -> Tuple[str, ...]:
+        return (self.param or self.header,)
+
+
+class TokenAuth(AuthProvider):
+    """Adds the token fetched by the function and cached with expiry to each request.
+
+    Token is fetched once per its life time for all endpoints and processes sharing the TokenCache.
+    If the token expires in less than refresh_ahead seconds, the new one is fetched in the background thread
+    and the current token is used until then, so requests are not blocked by the token fetch.
+    refresh_ahead is limited to the half of the token life time, and the token is not refreshed in the background
+    if the last fetched token lived less than refresh_ahead, as the new token would need the refresh right away.
+    Expired token is fetched synchronously.
+
+    Examples:
+        def login():
+            response = AuthEndpointBuilder().endpoint.post()
+            return response.post_data["access_token"], response.post_data["expires_in"]
+
+        auth = TokenAuth(login, key="weather_user")
+        endpoint = endpoint_factory(BASE_URL, "Weather", _WeatherRequest, _WeatherResponse, auth=auth)
+
+    Args:
+        fetch_token (Callable): Function which returns the token: str, (str, seconds to expiry) tuple or Token
+        key (str): Token name in the cache. Should be unique for the service and user
+        ttl (float): Token life time in seconds if fetch_token does not return it. None - never expires
+        refresh_ahead (float): Number of seconds before expiry to refresh the token in the background.
+            token_refresh_ahead option of [api] config section is used if not set, it is read on each use
+        header (str): Header name to send token in
+        scheme (str): Auth scheme to put before the token in the header. Token is sent as is if empty
+        param (str): Query param name to send token in. Header is not used if set
+        cache (TokenCache): Cache to keep the token in. Shared TokenCache is used by default
+    """
+
+    def __init__(self, fetch_token: Callable[[], Union[str, Tuple[str, float], Token]], key: str,
+                 ttl: Optional[float] = 3600, refresh_ahead: Optional[float] = None, header: str = "Authorization",
+                 scheme: Optional[str] = "Bearer", param: Optional[str] = None, cache: Optional[TokenCache] = None):
+        self.fetch_token = fetch_token
+        self.key = key
+        self.ttl = ttl
+        self.cache = cache or TokenCache()
+        self._refresh_ahead_option = refresh_ahead
+        self.header = header
+        self.scheme = scheme
+        self.param = param
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_lock = threading.Lock()
+        # life time of the last token fetched by the provider
+        self._fetched_lifetime: Optional[float] = None
+
+    @property
+    def refresh_ahead(self) -> float:
+        return self._refresh_ahead_option if self._refresh_ahead_option is not None \
+            else _api_settings().token_refresh_ahead
+
+    def _fetch(self) -> Token:
+        issued_at = time.time()
+        token = self.fetch_token()
+        if isinstance(token, tuple):
+            value, expires_in = token
+            token = Token(value, issued_at + expires_in if expires_in is not None else None)
+        elif not isinstance(token, Token):
+            token = Token(token, issued_at + self.ttl if self.ttl is not None else None)
+        if token.issued_at is None:
+            token.issued_at = issued_at
+        self._fetched_lifetime = token.lifetime()
+        return token
+
+    def _refresh_ahead(self, token: Token) -> float:
+        """Returns number of seconds before expiry to refresh the token: refresh_ahead limited
+        to REFRESH_AHEAD_SHARE of the token life time
+        """
+        lifetime = token.lifetime()
+        if lifetime is None:
+            lifetime = self._fetched_lifetime
+        refresh_ahead = self.refresh_ahead
+        return refresh_ahead if lifetime is None else min(refresh_ahead, lifetime * REFRESH_AHEAD_SHARE)
+
+    def _refresh(self, min_ttl: float):
+        try:
+            self.cache.get_or_fetch(self.key, self._fetch, min_ttl=min_ttl)
+        except Exception as err:
+            # the current token is still valid, refresh is repeated on the next request
+            logger.warning(f"Background refresh of auth token '{self.key}' failed: {err}")
+
+    def _start_refresh(self, min_ttl: float):
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh, args=(min_ttl,),
+                                                    name=f"pycats_auth_{self.key}", daemon=True)
+            self._refresh_thread.start()
+
+    def token(self) -> str:
+        """Returns valid token value. Fetches the token if it is absent or expired"""
+        token = self.cache.get(self.key)
+        if token is None:
+            return self.cache.get_or_fetch(self.key, self._fetch).value
+        refresh_ahead = self._refresh_ahead(token)
+        if token.expires_in() <= refresh_ahead and \
+                (self._fetched_lifetime is None or self._fetched_lifetime > refresh_ahead):
+            self._start_refresh(refresh_ahead)
+        return token.value
+
+    def invalidate(self):
+        """Removes the token from the cache, so the new one is fetched on the next request"""
+        self.cache.remove(self.key)
+
+    def apply(self, request_kwargs: dict) -> dict:
+        return _add_credentials(request_kwargs, self.token(), self.header, self.scheme, self.param)
+
+    def secret_names(self) -> Tuple[str, ...]:
+        return (self.param or self.header,)
+
+
+class HMACAuth(AuthProvider):
+    """Signs each request with HMAC of the method, URL, query, timestamp and body hash.
+
+    String to sign: METHOD, URL, query string, timestamp and hex digest of the body joined by new line.
+    JSON body is serialized by the provider, so exactly the signed bytes are sent.
+    Signature is base64 encoded and sent in the signature header as '<key_id>:<signature>' or as is without key_id.
+
+    Examples:
+        auth = HMACAuth(secret=os.environ["API_SECRET"], key_id="qa")
+
+    Args:
+        secret (str|bytes): Secret key
+        key_id (str): Key identifier to send with the signature
+        header (str): Header name to send signature in
+        timestamp_header (str): Header name to send request timestamp in
+        digestmod (str): Hash algorithm name. E.x.: sha256, sha512
+    """
+
+    def __init__(self, secret: Union[str, bytes], key_id: Optional[str] = None, header: str = "X-Signature",
+                 timestamp_header: str = "X-Timestamp", digestmod: str = "sha256"):
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+        self.key_id = key_id
+        self.header = header
+        self.timestamp_header = timestamp_header
+        self.digestmod = digestmod
+
+    def _body(self, request_kwargs: dict) -> bytes:
+        if request_kwargs.get("json") is not None:
+            request_kwargs["data"] = json.dumps(request_kwargs.pop("json"), separators=(",", ":")).encode()
+            request_kwargs["headers"] = dict({"Content-Type": "application/json"},
+                                             **(request_kwargs.get("headers") or {}))
+        data = request_kwargs.get("data")
+        if data is None:
+            return b""
+        if isinstance(data, dict):
+            data = request_kwargs["data"] = urlencode(data)
+        return data.encode() if isinstance(data, str) else data
+
+    def sign(self, method: str, url: str, query: str, timestamp: str, body: bytes) -> str:
+        """Returns base64 encoded signature of the request"""
+        string_to_sign = "\n".join((method.upper(), url, query, timestamp,
+                                    hashlib.new(self.digestmod, body).hexdigest()))
+        signature = hmac.new(self.secret, string_to_sign.encode(), self.digestmod).digest()
+        return base64.b64encode(signature).decode()
+
+    def apply(self, request_kwargs: dict) -> dict:
+        body = self._body(request_kwargs)
+        params = request_kwargs.get("params")
+        # params are sent as the signed query string
+        query = request_kwargs["params"] = urlencode(merge_params(params, {})) if params else ""
+        timestamp = str(int(time.time()))
+        signature = self.sign(request_kwargs["method"], request_kwargs["url"], query, timestamp, body)
+        request_kwargs["headers"] = dict(request_kwargs.get("headers") or {}, **{
+            self.timestamp_header: timestamp,
+            self.header: f"{self.key_id}:{signature}" if self.key_id else signature})
+        return request_kwargs
+
+    def secret_names(self) -> Tuple[str, ...]:
+        return (self.header,)
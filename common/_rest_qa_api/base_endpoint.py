@@ -1,16 +1,24 @@
-import copy
 import logging
+import threading
+import time
 from abc import ABCMeta, abstractmethod
 from dataclasses import InitVar
 from typing import Any, Dict, Union, Optional, Tuple, Callable, List, Type
 
 from common.config_manager import ConfigManager
-from common._rest_qa_api import default_exclude_list, method_exclude_lists
-from common._rest_qa_api.response_converter import ResponseConverterMixin
+from common._rest_qa_api import request_exclude_sets
+from common._rest_qa_api.async_executor import AsyncHTTPClient
+from common._rest_qa_api.auth import AuthProvider
+from common._rest_qa_api.conditional_cache import CachedResponse, ConditionalCache, CONDITIONAL_METHODS, NOT_MODIFIED
+from common._rest_qa_api.instrumentation import Instrumentation, RequestMetrics
+from common._rest_qa_api.rate_limiter import RateLimiter
+from common._rest_qa_api.response_converter import NOT_DECODED, ResponseConverterMixin
 from common._rest_qa_api.response_validator import ResponseValidatorMixin
 from common._rest_qa_api.rest_exceptions import MethodNotSupportedByEndpoint, DataclassNameError, \
     RestResponseValidationError, MissingDecoratorError
 from common._rest_qa_api.rest_utils import pycats_dataclass, make_request_url, dict_to_obj, obj_to_dict
+from common._rest_qa_api.session_manager import SessionManager
+from common._rest_qa_api.transport import Transport
 
 import requests
 
@@ -449,14 +457,23 @@ class BaseResponseModel(ResponseConverterMixin, ResponseValidatorMixin, metaclas
             :str with class name and all public properties
         """
         return f"{self.__class__.__qualname__}" + f"(" + \
-               "\n".join(f"{f}={self.__getattribute__(f)}"
-                         for f in [field for field in dir(self) if
-                                   not callable(getattr(self, field)) and not field.startswith("_")]) + f")"
+               "\n".join(f"{key}={value}" for key, value in sorted(obj_to_dict(self).items())) + f")"
+
+
+class _RequestContainer:
+    """Dummy container to prepare request fields"""
 
 
 class BaseEndpoint:
+    # set to False to send requests of the endpoint without response caching in record and replay transport modes
+    use_response_cache = True
+    # True/False to send GET and HEAD requests of the endpoint with/without If-None-Match/If-Modified-Since headers,
+    # None - conditional_requests option of [api] config section
+    use_conditional_requests: Optional[bool] = None
+
     def __init__(self, base_url: str, request_model: BaseRequestModel,
-                 response_model: BaseResponseModel, make_url_method):
+                 response_model: BaseResponseModel, make_url_method, session_manager: SessionManager = None,
+                 transport: Transport = None, auth: AuthProvider = None):
         """Class representation for the agent and container for HTTP Request/Response models
 
         Takes request model, parses it and sends to request library,
@@ -482,13 +499,36 @@ class BaseEndpoint:
             response_model (BaseResponseModel): Instance of  BaseResponseModel
             make_url_method (object): collable object to format the URL based on the base_url and
                 resource from BaseRequestModel.resource
+            session_manager (SessionManager): Manager of pooled keep-alive HTTP sessions.
+                Shared SessionManager instance is used by default
+            transport (Transport): Transport to send requests with (passthrough, record or replay mode).
+                Shared Transport instance is used by default
+            auth (AuthProvider): Provider to add auth token or signature to each sent request. E.x.: TokenAuth
+
+        With conditional requests enabled (conditional_requests option of [api] config section or
+        use_conditional_requests attribute) GET and HEAD responses with ETag or Last-Modified header are kept
+        in the shared ConditionalCache, repeated requests are sent with If-None-Match/If-Modified-Since headers
+        and body of 304 Not Modified response is taken from the cache. Requests with their own validator headers
+        are sent as is.
+
+        If rate_limit option of [api] config section is set, requests wait for their turn in the shared RateLimiter
+        and 429 responses are retried after Retry-After time.
         """
         self.base_url = base_url
         self.request_model = request_model
         self.response_model = response_model
         self.make_url_method = make_url_method
+        self.session_manager = session_manager or SessionManager()
+        self.transport = transport or Transport(self.session_manager)
+        self.auth = auth
+        settings = self.session_manager.api_settings
+        use_conditional_requests = settings.conditional_requests if self.use_conditional_requests is None \
+            else self.use_conditional_requests
+        self.conditional_cache = ConditionalCache(settings.conditional_cache_max_bytes) \
+            if use_conditional_requests else None
+        self.rate_limiter = RateLimiter.from_settings(settings) if settings.rate_limit else None
         # Dummy container to prepare request fields
-        self._request = type("Jon_Galt", (object,), dict())()
+        self._request = _RequestContainer()
 
     def __getattr__(self, item):
         """Verifies if the called method presents in self.request_model.allowed_methods
@@ -496,19 +536,25 @@ class BaseEndpoint:
         Args:
             item (str): method name to call
 
+        Methods with '_async' suffix return coroutine of execute_async, e.x: endpoint.get_async()
+
         Returns:
             :BaseResponseModel - requests.Response object converted to BaseResponseModel class
 
         Raises:
             MethodNotSupportedByEndpoint if method not in allowed list
         """
+        if not item.startswith("__") and item.endswith("_async") and \
+                item[:-len("_async")] in self.request_model.allowed_methods:
+            return lambda: self.execute_async(item[:-len("_async")])
         if not item.startswith("__") and item not in self.request_model.allowed_methods:
             raise MethodNotSupportedByEndpoint(item)
         else:
             return lambda: self.execute(item)
 
-    def __request_builder(self, method):
-        value = obj_to_dict(self._request, exclude_params=default_exclude_list + method_exclude_lists[method])
+    @staticmethod
+    def __request_builder(request, method):
+        value = obj_to_dict(request, exclude_params=request_exclude_sets[method])
         if method == "get":
             return value
         # JSON supports 2 formats - dict and list
@@ -518,8 +564,116 @@ class BaseEndpoint:
             value["data"] = value.pop(f"{method}_data")
         return value
 
+    def _prepare_request(self, method: str) -> dict:
+        """Builds requests.Session.request arguments from the request model
+
+        New container is created for each request, so concurrent calls of the same endpoint do not interfere
+        """
+        request = _RequestContainer()
+        dict_to_obj(request, method=method, base_url=self.base_url, **obj_to_dict(self.request_model))
+        self.make_url_method(request)
+        self._request = request
+        request_kwargs = self.__request_builder(request, method)
+        if self.response_model._stream_body:
+            request_kwargs["stream"] = True
+        return request_kwargs
+
+    def _send(self, **request_kwargs):
+        """Sends the request via transport and returns requests.Response. Waits for the rate limit if it is set"""
+        def send():
+            return self.transport.send(self.base_url, use_cache=self.use_response_cache, auth=self.auth,
+                                       **request_kwargs)
+        if self.rate_limiter is None:
+            return send()
+        return self.rate_limiter.send(request_kwargs["url"], send)
+
+    def _conditional_request(self, request_kwargs: dict) -> Tuple[dict, Optional[str], Optional[CachedResponse]]:
+        """Adds conditional headers to the request if the response of the same request is cached
+
+        Returns:
+            :tuple of request arguments to send, cache key (None if conditional requests are not used for the request)
+            and cached response to serve on 304 Not Modified
+        """
+        if self.conditional_cache is None or request_kwargs.get("stream") or \
+                request_kwargs.get("method") not in CONDITIONAL_METHODS or \
+                ConditionalCache.has_validators(request_kwargs) or \
+                self.transport.is_cacheable(request_kwargs, self.use_response_cache):
+            return request_kwargs, None, None
+        key = self.conditional_cache.make_key(self.__class__.__name__, request_kwargs, self.auth)
+        cached = self.conditional_cache.get(key)
+        if cached is None:
+            return request_kwargs, key, None
+        return cached.apply(request_kwargs), key, cached
+
+    def _send_request(self, request_kwargs: dict,
+                      metrics: RequestMetrics) -> Tuple[requests.Response, Optional[str], Optional[CachedResponse]]:
+        """Sends the built request with conditional headers if the response is cached and reports its network time
+
+        Returns:
+            :tuple of requests.Response and conditional cache key and cached response for _process_response
+        """
+        start = time.perf_counter()
+        send_kwargs, conditional_key, cached = self._conditional_request(request_kwargs)
+        result = self._send(**send_kwargs)
+        metrics.set_response(result, time.perf_counter() - start, request_kwargs.get("stream", False))
+        return result, conditional_key, cached
+
+    def _convert_response(self, result, conditional_key: Optional[str] = None,
+                          cached: Optional[CachedResponse] = None):
+        """Converts requests.Response to the response model. Body of 304 Not Modified response of the conditional
+        request is taken from the cached response without decoding, other responses are saved to the cache
+        with their decoded body for the next requests
+        """
+        body, entry = NOT_DECODED, None
+        if conditional_key is not None:
+            if cached is not None and result.status_code == NOT_MODIFIED:
+                self.conditional_cache.count(hit=True)
+                result = cached.restore(result)
+                body = cached.decoded_body()
+            else:
+                self.conditional_cache.count(hit=False)
+                entry = self.conditional_cache.put(conditional_key, result)
+        response = self.response_model.convert_raw_response(result, body)
+        # streamed body is pruned by the current model, so it is decoded again for the next models
+        if entry is not None and not response._stream_body:
+            entry.keep_body(getattr(response, response._body_field(result)))
+        return response
+
+    def _process_response(self, result, base_validation=True, metrics: Optional[RequestMetrics] = None,
+                          conditional_key: Optional[str] = None, cached: Optional[CachedResponse] = None):
+        """Converts requests.Response to the response model and validates it"""
+        response = self._measured_convert(result, metrics, conditional_key, cached)
+        return self._validate_response(response, base_validation, metrics)
+
+    def _measured_convert(self, result, metrics: Optional[RequestMetrics] = None,
+                          conditional_key: Optional[str] = None, cached: Optional[CachedResponse] = None):
+        """Converts requests.Response to the response model and saves the conversion time to the metrics"""
+        start = time.perf_counter()
+        response = self._convert_response(result, conditional_key, cached)
+        if metrics is not None:
+            metrics.convert = (time.perf_counter() - start) * 1000
+        return response
+
+    def _validate_response(self, response, base_validation=True, metrics: Optional[RequestMetrics] = None):
+        """Validates the converted response with the response model and saves the result to the metrics"""
+        start = time.perf_counter()
+        passed = not base_validation or response == self.response_model
+        if metrics is not None:
+            metrics.validate = (time.perf_counter() - start) * 1000
+            metrics.passed = passed if base_validation else None
+        if not passed:
+            raise RestResponseValidationError(response)
+        return response
+
+    def _start_metrics(self, method: str) -> RequestMetrics:
+        metrics = RequestMetrics(self.__class__.__name__, method, timestamp=time.time())
+        if self.auth is not None:
+            metrics.secret_names = self.auth.secret_names()
+        return metrics
+
     def execute(self, method: str, base_validation=True):
-        """Main method to send the request and perform response conversion and validation
+        """Main method to send the request and perform response conversion and validation.
+        Timings and sizes of the call are reported to Instrumentation hooks
 
         Args:
             method (str): HTTP method to use. E.x: post, get, etc
@@ -531,18 +685,120 @@ class BaseEndpoint:
         Raises:
             :RestResponseValidationError if __eq__ returns false
         """
-        dict_to_obj(self._request, method=method, base_url=self.base_url, **obj_to_dict(self.request_model))
-        self.make_url_method(self._request)
-        result = requests.request(**self.__request_builder(method))
-        response = self.response_model.convert_raw_response(result)
-        if base_validation and not response == self.response_model:
-            raise RestResponseValidationError(response)
-        return response
+        metrics = self._start_metrics(method)
+        try:
+            start = time.perf_counter()
+            request_kwargs = self._prepare_request(method)
+            metrics.set_request(request_kwargs, time.perf_counter() - start)
+            result, conditional_key, cached = self._send_request(request_kwargs, metrics)
+            return self._process_response(result, base_validation, metrics, conditional_key, cached)
+        except Exception as err:
+            metrics.error = err.__class__.__name__
+            raise
+        finally:
+            Instrumentation().record(metrics)
+
+    async def execute_async(self, method: str, base_validation=True):
+        """Async counterpart of execute. Request is sent via AsyncHTTPClient without blocking the event loop.
+
+        Use common._rest_qa_api.async_executor.gather_endpoints to execute multiple endpoints concurrently.
+
+        Args:
+            method (str): HTTP method to use. E.x: post, get, etc
+            base_validation (bool): If True - performs validation, otherwise skip it
+
+        Returns:
+            :BaseResponseModel object with response data
+
+        Raises:
+            :RestResponseValidationError if __eq__ returns false
+        """
+        metrics = self._start_metrics(method)
+        try:
+            start = time.perf_counter()
+            request_kwargs = self._prepare_request(method)
+            metrics.set_request(request_kwargs, time.perf_counter() - start)
+            async_client = AsyncHTTPClient(self.session_manager.api_settings.pool_maxsize)
+            start = time.perf_counter()
+            send_kwargs, conditional_key, cached = self._conditional_request(request_kwargs)
+            result = await async_client.request(self._send, send_kwargs)
+            # includes the time the request waited for the free worker
+            metrics.set_response(result, time.perf_counter() - start, request_kwargs.get("stream", False))
+            return self._process_response(result, base_validation, metrics, conditional_key, cached)
+        except Exception as err:
+            metrics.error = err.__class__.__name__
+            raise
+        finally:
+            Instrumentation().record(metrics)
+
+
+# endpoint classes created by endpoint_factory. Endpoint declared in many modules is created once
+_endpoint_classes: Dict[tuple, type] = dict()
+_endpoint_classes_lock = threading.Lock()
+
+
+def _endpoint_class(class_name: str, superclass: type, use_response_cache: bool,
+                    use_conditional_requests: Optional[bool]) -> type:
+    key = (class_name, superclass, use_response_cache, use_conditional_requests)
+    endpoint_class = _endpoint_classes.get(key)
+    if endpoint_class is None:
+        with _endpoint_classes_lock:
+            if key not in _endpoint_classes:
+                _endpoint_classes[key] = type(class_name, (superclass,), dict(
+                    request_model=None, response_model=None, base_url=None, make_url_method=None,
+                    session_manager=None, transport=None, auth=None, use_response_cache=use_response_cache,
+                    use_conditional_requests=use_conditional_requests))
+            endpoint_class = _endpoint_classes[key]
+    return endpoint_class
+
+
+class _EndpointFactory:
+    """Creates endpoint instances for endpoint_factory.
+
+    Config, session manager, transport and endpoint class are bound on the first create call,
+    so the endpoint declared on import of the test module costs nothing till it is used
+    """
+
+    def __init__(self, base_url: str, class_name: str, request_model: Type[BaseRequestModel],
+                 response_model: Type[BaseResponseModel], superclass: type, make_url_method, config,
+                 use_response_cache: bool, auth: Optional[AuthProvider], use_conditional_requests: Optional[bool]):
+        self.base_url = base_url
+        self.class_name = class_name
+        self.request_model = request_model
+        self.response_model = response_model
+        self.superclass = superclass
+        self.make_url_method = make_url_method
+        self.config = config
+        self.use_response_cache = use_response_cache
+        self.auth = auth
+        self.use_conditional_requests = use_conditional_requests
+        self._bound = None
+        self._lock = threading.Lock()
+
+    def _bind(self) -> tuple:
+        with self._lock:
+            if self._bound is None:
+                config = self.config or ConfigManager()
+                session_manager = SessionManager(config.get_api_settings())
+                endpoint_class = _endpoint_class(self.class_name, self.superclass, self.use_response_cache,
+                                                 self.use_conditional_requests)
+                self._bound = (config, session_manager, Transport(session_manager), endpoint_class)
+        return self._bound
+
+    def create(self) -> BaseEndpoint:
+        config, session_manager, transport, endpoint_class = self._bound or self._bind()
+        # models share mutable defaults till the test changes them (see CopyOnAccess), so instantiation is cheap
+        # and endpoint instances still do not share expected values
+        return endpoint_class(self.base_url, request_model=self.request_model(),
+                              response_model=self.response_model(config=config),
+                              make_url_method=self.make_url_method, session_manager=session_manager,
+                              transport=transport, auth=self.auth)
 
 
 def endpoint_factory(base_url: str, class_name: str, request_model: Type[BaseRequestModel],
                      response_model: Type[BaseResponseModel], superclass=BaseEndpoint,
-                     make_url_method=make_request_url, config=None) \
+                     make_url_method=make_request_url, config=None, use_response_cache=True,
+                     auth: AuthProvider = None, use_conditional_requests: Optional[bool] = None) \
         -> Union[Callable[[], BaseEndpoint], BaseEndpoint]:
     """Factory to create class based on BaseEndpoint
 
@@ -554,14 +810,17 @@ def endpoint_factory(base_url: str, class_name: str, request_model: Type[BaseReq
         superclass (BaseEndpoint): Base class for inheritance. BaseEndpoint by default
         make_url_method (object): collable object for format the URL based on the base_url and
                 resource from BaseRequestModel.resource
+        config (ConfigManager): Config to take api validation and transport settings from.
+                ConfigManager is used by default. Config is read on the first call of the returned lambda
+        use_response_cache (bool): If False - responses of the endpoint are never cached by transport
+        auth (AuthProvider): Provider to add auth token or signature to each request. Shared by all endpoint instances
+        use_conditional_requests (bool): If True/False - GET and HEAD requests are sent with/without conditional
+                headers. conditional_requests option of [api] config section by default
 
     Returns:
         :obj lambda with class which 'class_name' is inherited from 'superclass'
     """
-    if not config:
-        config = ConfigManager()
-    dummy_class = type(class_name, (superclass,), dict(request_model=None, response_model=None, base_url=None,
-                                                       make_url_method=None))
-    return lambda: dummy_class(base_url, request_model=copy.deepcopy(request_model()),
-                               response_model=copy.deepcopy(response_model(config=config)),
-                               make_url_method=make_url_method)
+    factory = _EndpointFactory(base_url, class_name, request_model, response_model, superclass, make_url_method,
+                               config, use_response_cache, auth, use_conditional_requests)
+    # lambda is kept: pycats_dataclass treats lambda class values as default factories of the fields
+    return lambda: factory.create()
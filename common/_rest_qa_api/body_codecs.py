@@ -0,0 +1,179 @@
+import json
+from abc import ABCMeta, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+# the fastest available JSON backend. orjson decodes UTF-8 bytes only
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+_UTF8 = ("utf-8", "utf8")
+
+
+def json_loads(content: Any) -> Any:
+    """Decodes JSON document from str or bytes with the fastest available backend
+
+    Raises:
+        :ValueError if document is incorrect
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except ValueError:
+            # json detects UTF-16 and UTF-32 bytes, so the document is incorrect if it fails too
+            pass
+    return json.loads(content)
+
+
+def parse_content_type(content_type: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Returns media type in lower case and charset of Content-Type header value.
+    E.x.: 'application/json; charset=UTF-8' -> ('application/json', 'utf-8')
+    """
+    if not content_type:
+        return "", None
+    media_type, _, parameters = content_type.partition(";")
+    charset = None
+    for parameter in parameters.split(";"):
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset":
+            charset = value.strip().strip('"').lower() or None
+    return media_type.strip().lower(), charset
+
+
+def _decode_text(content: bytes, charset: Optional[str]) -> Any:
+    # bytes are passed to the JSON backend as is: it detects UTF-8/16/32 itself without str decoding
+    if charset is None or charset in _UTF8:
+        return content
+    return content.decode(charset)
+
+
+class BodyCodec(metaclass=ABCMeta):
+    """Base class of the response body codecs. Codec decodes response body from bytes.
+    Compressed bodies (gzip, deflate and br if brotli package is installed) are decompressed by urllib3,
+    so codec gets the decompressed bytes.
+
+    Attributes:
+        name (str): Codec name used in error messages
+    """
+
+    name = ""
+
+    @abstractmethod
+    def decode(self, content: bytes, charset: Optional[str]) -> Any:
+        """Returns decoded body
+
+        Args:
+            content (bytes): Response body
+            charset (str): Charset from Content-Type header. None if it is not set
+
+        Raises:
+            :ValueError if body is incorrect
+        """
+
+
+class JSONCodec(BodyCodec):
+    name = "json"
+
+    def decode(self, content: bytes, charset: Optional[str]) -> Any:
+        return json_loads(_decode_text(content, charset))
+
+
+class NDJSONCodec(BodyCodec):
+    """Newline delimited JSON. Body is decoded to the list of documents, empty lines are skipped"""
+
+    name = "ndjson"
+
+    def decode(self, content: bytes, charset: Optional[str]) -> Any:
+        if charset is not None and charset not in _UTF8:
+            content = content.decode(charset).encode()
+        return [json_loads(line) for line in content.splitlines() if line.strip()]
+
+
+class _OptionalPackageCodec(BodyCodec):
+    """Codec which requires the optional package"""
+
+    package = ""
+
+    def __init__(self, loads: Optional[Callable[[bytes], Any]]):
+        self._loads = loads
+
+    def decode(self, content: bytes, charset: Optional[str]) -> Any:
+        if self._loads is None:
+            raise ImportError(f"{self.package} package is required to decode {self.name} response body. "
+                              f"Install it with: pip install {self.package}")
+        try:
+            return self._loads(content)
+        except ValueError:
+            raise
+        except Exception as err:
+            # msgpack and cbor2 raise own exceptions on incorrect data
+            raise ValueError(str(err)) from err
+
+
+class MsgPackCodec(_OptionalPackageCodec):
+    name = "msgpack"
+    package = "msgpack"
+
+    def __init__(self):
+        super().__init__((lambda content: msgpack.unpackb(content, raw=False)) if msgpack is not None else None)
+
+
+class CBORCodec(_OptionalPackageCodec):
+    name = "cbor"
+    package = "cbor2"
+
+    def __init__(self):
+        super().__init__(cbor2.loads if cbor2 is not None else None)
+
+
+_codecs: Dict[str, BodyCodec] = dict()
+
+
+def register_codec(codec: BodyCodec, content_types: Iterable[str]):
+    """Registers codec for the media types. Codec of the media type with structured syntax suffix
+    (E.x.: application/problem+json) is the codec of application/<suffix> if the media type is not registered itself
+
+    Examples:
+        register_codec(YAMLCodec(), ["application/yaml", "application/x-yaml"])
+
+    Args:
+        codec (BodyCodec): Codec instance
+        content_types (Iterable[str]): Media types without parameters. E.x.: application/json
+    """
+    for content_type in content_types:
+        _codecs[content_type.lower()] = codec
+
+
+def unregister_codec(content_type: str):
+    _codecs.pop(content_type.lower(), None)
+
+
+def get_codec(media_type: str) -> Optional[BodyCodec]:
+    """Returns codec of the media type or None if body of the media type is decoded as text"""
+    codec = _codecs.get(media_type)
+    if codec is None and "+" in media_type:
+        codec = _codecs.get(f"application/{media_type.rsplit('+', 1)[1]}")
+    return codec
+
+
+def get_response_codec(raw_response) -> Tuple[Optional[BodyCodec], Optional[str]]:
+    """Returns codec and charset of requests.Response body by its Content-Type header"""
+    media_type, charset = parse_content_type(raw_response.headers.get("Content-Type"))
+    return get_codec(media_type), charset
+
+
+register_codec(JSONCodec(), ["application/json"])
+register_codec(NDJSONCodec(), ["application/x-ndjson", "application/ndjson", "application/jsonl",
+                               "application/x-jsonlines", "application/jsonlines"])
+register_codec(MsgPackCodec(), ["application/msgpack", "application/x-msgpack", "application/vnd.msgpack"])
+register_codec(CBORCodec(), ["application/cbor"])
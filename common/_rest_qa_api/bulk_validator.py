@@ -0,0 +1,236 @@
+import logging
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from requests import Response
+
+from common._rest_qa_api.response_converter import decode_body
+from common._rest_qa_api.rest_utils import SKIP, peek_field
+from common._rest_qa_api.schema import Schema
+from common._rest_qa_api.validation_plan import ValidationPlan
+
+if TYPE_CHECKING:
+    # to avoid import loop only for annotations
+    from common._rest_qa_api.base_endpoint import BaseResponseModel  # noqa
+
+logger = logging.getLogger(__name__)
+
+DEFAULT, CUSTOM, CONVERSION = "default", "custom", "conversion"
+
+
+@dataclass
+class BulkValidationReport:
+    """Columnar report of the bulk validation: one row per error, columns are kept in separate lists.
+
+    Attributes:
+        total (int): Number of validated responses
+        failed (int): Number of responses failed validation
+        index (list): Position of the failed response in the validated sequence
+        source (list): Error source: default - model validation, custom - custom checker,
+            conversion - response could not be converted to the model
+        path (list): Path of the failed field joined by '->' for default errors, checker name for custom errors
+        expected (list): Expected value for default errors, None for others
+        actual (list): Actual value for default errors, error message for others
+    """
+    total: int = 0
+    failed: int = 0
+    index: List[int] = field(default_factory=list)
+    source: List[str] = field(default_factory=list)
+    path: List[str] = field(default_factory=list)
+    expected: List[Any] = field(default_factory=list)
+    actual: List[Any] = field(default_factory=list)
+
+    @property
+    def passed(self) -> int:
+        return self.total - self.failed
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def failed_indexes(self) -> List[int]:
+        return sorted(set(self.index))
+
+    def add_error(self, index: int, source: str, path: str, expected: Any, actual: Any):
+        self.index.append(index)
+        self.source.append(source)
+        self.path.append(path)
+        self.expected.append(expected)
+        self.actual.append(actual)
+
+    def add_response_errors(self, index: int, response: 'BaseResponseModel'):
+        """Adds errors collected by response validation"""
+        for path, expected, actual in response.errors["default"]:
+            self.add_error(index, DEFAULT, "->".join(str(item) for item in path), expected, actual)
+        for checker, error in response.errors["custom"]:
+            self.add_error(index, CUSTOM, checker if isinstance(checker, str) else checker.__name__, None, str(error))
+
+    def extend(self, report: 'BulkValidationReport'):
+        """Adds rows and counters of the report of the next part of responses"""
+        self.total += report.total
+        self.failed += report.failed
+        for column in ("index", "source", "path", "expected", "actual"):
+            getattr(self, column).extend(getattr(report, column))
+
+    def rows(self) -> Iterator[Tuple[int, str, str, Any, Any]]:
+        return zip(self.index, self.source, self.path, self.expected, self.actual)
+
+    def errors_by_path(self) -> Counter:
+        """Returns number of errors per field path"""
+        return Counter(self.path)
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__, passed=self.passed)
+
+    def __str__(self):
+        summary = f"validated: {self.total}, passed: {self.passed}, failed: {self.failed}"
+        if self.failed:
+            summary += "\nerrors by field:\n" + "\n".join(f"\t{path}: {count}"
+                                                         for path, count in self.errors_by_path().most_common())
+        return summary
+
+
+class BulkValidator:
+    """Validates many raw responses against one response model.
+
+    Validation plans of the model fields are compiled once per validate call and shared by all responses, so the model
+    tree is not verified against the compiled plan for each response. Model should not be changed during
+    the validation. A response which passes the plans is validated without creating the response model object,
+    only failed responses are converted and validated with the model == to collect the errors in the usual format.
+    Responses of the models with custom checkers or streaming body parsing are always converted.
+
+    Responses may be validated in the process pool for the CPU bound validation of large bodies.
+    Responses and the model are pickled in this case, so the model class should be importable and class level
+    configuration (configure_validator, etc) should be done at import time.
+
+    Examples:
+        weather = DailyWeatherEndpointBuilder()
+        responses = [weather.endpoint._send(**request) for request in requests]
+        report = BulkValidator(weather.endpoint.response_model).validate(responses)
+        assert report.ok, report
+
+    Args:
+        model (BaseResponseModel): model to validate responses against
+        processes (int): Number of worker processes. Responses are validated in the current process if not set
+        chunk_size (int): Number of responses sent to the worker process at once
+    """
+
+    def __init__(self, model: 'BaseResponseModel', processes: Optional[int] = None, chunk_size: int = 64):
+        self.model = model
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self._plans = {}
+
+    def _check(self, field_name: str, value: Any) -> bool:
+        expected = peek_field(self.model, field_name)
+        if isinstance(expected, Schema):
+            # expected value of the schema is verified by the model ==
+            return expected.expected is SKIP and expected.is_valid(value)
+        plan = self._plans.get(field_name)
+        if plan is None:
+            plan = self._plans[field_name] = ValidationPlan(expected)
+        return plan.check(value, None, verify_expected=False) is True
+
+    def _passes(self, raw_response: Response) -> bool:
+        """Fast path: returns True if response matches the model without any errors and warnings"""
+        model = self.model
+        if model.custom_checkers or model._stream_body:
+            return False
+        if model._check_status_code and not self._check("status_code", raw_response.status_code):
+            return False
+        if model._check_headers and not self._check("headers", dict(raw_response.headers)):
+            return False
+        if model._check_body:
+            property_name = f"{raw_response.request.method.lower()}_data" if raw_response.ok else "error_data"
+            try:
+                body = decode_body(raw_response)
+            except TypeError:
+                return False
+            if not self._check(property_name, body):
+                return False
+        return True
+
+    def _validate_one(self, index: int, raw_response: Response, report: BulkValidationReport):
+        report.total += 1
+        if self._passes(raw_response):
+            return
+        model = self.model
+        try:
+            response = model.convert_raw_response(raw_response)
+        except TypeError as err:
+            report.failed += 1
+            report.add_error(index, CONVERSION, "body", None, str(err))
+            return
+        if not response == model:
+            report.failed += 1
+            report.add_response_errors(index, response)
+
+    def validate_chunk(self, start: int, responses: Iterable[Response]) -> BulkValidationReport:
+        """Validates responses in the current process
+
+        Args:
+            start (int): index of the first response
+            responses (Iterable[Response]): raw responses
+
+        Returns:
+            :BulkValidationReport object
+        """
+        self._plans = {}
+        report = BulkValidationReport()
+        for index, raw_response in enumerate(responses, start):
+            self._validate_one(index, raw_response, report)
+        return report
+
+    def _validate_in_pool(self, responses: Iterable[Response]) -> BulkValidationReport:
+        reports = {}
+        iterator = iter(responses)
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            pending = set()
+            start = 0
+            while True:
+                # number of submitted chunks is limited, so responses are not all pickled at once
+                while len(pending) < 2 * self.processes:
+                    chunk = list(islice(iterator, self.chunk_size))
+                    if not chunk:
+                        break
+                    future = executor.submit(_validate_chunk, self.model, start, chunk)
+                    reports[future] = start
+                    pending.add(future)
+                    start += len(chunk)
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    reports[future] = (reports[future], future.result())
+        report = BulkValidationReport()
+        for _, chunk_report in sorted(reports.values(), key=lambda item: item[0]):
+            report.extend(chunk_report)
+        return report
+
+    def validate(self, responses: Iterable[Response]) -> BulkValidationReport:
+        """Validates responses against the model
+
+        Args:
+            responses (Iterable[Response]): raw responses. E.x.: list of requests.Response objects
+
+        Returns:
+            :BulkValidationReport object
+        """
+        report = self._validate_in_pool(responses) if self.processes else self.validate_chunk(0, responses)
+        logger.info(f"Bulk validation of {self.model.__class__.__qualname__} finished: {report}")
+        return report
+
+
+def _validate_chunk(model: 'BaseResponseModel', start: int, responses: List[Response]) -> BulkValidationReport:
+    """Entry point of the worker process"""
+    return BulkValidator(model).validate_chunk(start, responses)
+
+
+def validate_responses(model: 'BaseResponseModel', responses: Iterable[Response], processes: Optional[int] = None,
+                       chunk_size: int = 64) -> BulkValidationReport:
+    """Shortcut for BulkValidator(...).validate(responses). See BulkValidator for arguments description"""
+    return BulkValidator(model, processes, chunk_size).validate(responses)
@@ -0,0 +1,86 @@
+import inspect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from common._libs.helpers.singleton import Singleton
+from common._rest_qa_api.rest_checkers import BaseRESTCheckers
+
+logger = logging.getLogger(__name__)
+logger.setLevel("INFO")
+
+
+class CheckerExecutor(metaclass=Singleton):
+    """Runs custom checkers of the response one by one or concurrently in the shared thread pool.
+
+    Supports 2 types of checkers - class inherited from BaseRESTCheckers class and functions.
+    Wall time of each checker is measured. For BaseRESTCheckers classes the time of each check method
+    is measured additionally by 'Class.method' key.
+
+    Args:
+        max_workers (int): Max number of checkers executed at the same time
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pycats_checker")
+
+    @staticmethod
+    def _run_checker(checker: Callable, response) -> Tuple[List[tuple], Dict[str, float]]:
+        logger.info(f"run checker: {checker.__name__}: ")
+        errors, timings = [], {}
+        start = time.perf_counter()
+        try:
+            if inspect.isfunction(checker):
+                checker(response)
+            elif isinstance(checker(), BaseRESTCheckers):
+                errors = checker.execute(response, timings)
+            else:
+                raise TypeError(f'{checker} has unsupported type. Supported are functions and '
+                                f'BaseRESTCheckers instances')
+        except AssertionError as err:
+            errors.append((checker, err))
+        except Exception as err:
+            logger.info("fail")
+            logger.exception(err)
+            raise
+        else:
+            if not errors:
+                logger.info(f"{checker.__name__} validation passed")
+        finally:
+            timings[checker.__name__] = time.perf_counter() - start
+        return errors, timings
+
+    def run(self, response, checkers: Iterable[Callable], parallel=False) -> Tuple[List[tuple], Dict[str, float]]:
+        """Executes checkers for the response
+
+        Args:
+            response (BaseResponseModel): response to check
+            checkers (Iterable[Callable]): functions and BaseRESTCheckers classes
+            parallel (bool): If True - checkers are executed concurrently in the thread pool
+
+        Returns:
+            :tuple of errors list in the checkers order and dict with wall time of each checker in seconds
+
+        Raises:
+            :the first not AssertionError exception raised by checkers (after all checkers are completed)
+        """
+        checkers = list(checkers)
+        if parallel and len(checkers) > 1:
+            futures = [self._executor.submit(self._run_checker, checker, response) for checker in checkers]
+            # wait for all checkers before raising the error, so no checker is running after validation
+            exceptions = [future.exception() for future in futures]
+            for exception in exceptions:
+                if exception is not None:
+                    raise exception
+            results = [future.result() for future in futures]
+        else:
+            results = [self._run_checker(checker, response) for checker in checkers]
+        errors, timings = [], {}
+        for checker_errors, checker_timings in results:
+            errors.extend(checker_errors)
+            timings.update(checker_timings)
+        return errors, timings
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,194 @@
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from copy import copy
+from http import HTTPStatus
+from typing import Any, Dict, Optional
+
+import requests
+
+from common._libs.helpers.singleton import Singleton
+from common._rest_qa_api.response_converter import NOT_DECODED
+from common._rest_qa_api.rest_utils import copy_value
+from common._rest_qa_api.transport import ResponseCache
+
+CONDITIONAL_METHODS = ("get", "head")
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+NOT_MODIFIED = 304
+
+# ids of the auth providers for the cache keys. Unlike id() they are never reused by other providers
+_auth_ids = weakref.WeakKeyDictionary()
+_auth_counter = itertools.count(1)
+_auth_lock = threading.Lock()
+
+
+def _auth_id(auth: Any) -> Optional[int]:
+    if auth is None:
+        return None
+    with _auth_lock:
+        auth_id = _auth_ids.get(auth)
+        if auth_id is None:
+            auth_id = _auth_ids[auth] = next(_auth_counter)
+        return auth_id
+
+
+class CachedResponse:
+    """Validators, status, headers, body bytes and decoded body of the response kept for the conditional requests.
+    Decoded body is kept after the first conversion of the response, so 304 Not Modified response
+    is converted without decoding the body again
+
+    Args:
+        etag (str): ETag header of the response
+        last_modified (str): Last-Modified header of the response
+        status_code (int): Status code of the response
+        headers (dict): Headers of the response
+        content (bytes): Body of the response
+    """
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], status_code: int, headers: Dict[str, str],
+                 content: bytes):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self._body = NOT_DECODED
+        # approximate number of bytes kept for the response
+        self.size = len(content) + sum(len(name) + len(value) for name, value in headers.items())
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = dict()
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def apply(self, request_kwargs: dict) -> dict:
+        """Returns copy of the request arguments with If-None-Match and If-Modified-Since headers"""
+        request_kwargs = dict(request_kwargs)
+        request_kwargs["headers"] = dict(request_kwargs.get("headers") or {}, **self.conditional_headers())
+        return request_kwargs
+
+    def keep_body(self, body: Any):
+        """Keeps copy of the decoded body, so changes of the converted response do not affect the cache"""
+        self._body = copy_value(body)
+
+    def decoded_body(self) -> Any:
+        """Returns copy of the kept decoded body or NOT_DECODED if the body is not kept"""
+        return NOT_DECODED if self._body is NOT_DECODED else copy_value(self._body)
+
+    def restore(self, not_modified: requests.Response) -> requests.Response:
+        """Returns 304 Not Modified response with the status and body of the cached response. Request, url and
+        elapsed time are of the 304 response, its headers update the cached ones as RFC 7232 requires
+        """
+        response = copy(not_modified)
+        response.status_code = self.status_code
+        response.reason = HTTPStatus(self.status_code).phrase
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response.headers.update(not_modified.headers)
+        response._content = self.content
+        response._content_consumed = True
+        return response
+
+
+class ConditionalCache(metaclass=Singleton):
+    """In-memory cache of the responses with ETag or Last-Modified headers shared by all endpoints.
+
+    BaseEndpoint with conditional requests enabled sends If-None-Match and If-Modified-Since headers for GET
+    and HEAD requests which responses are in the cache. If server answers 304 Not Modified, the cached body is
+    converted and validated against the current model, so repeated polling of the unchanged resource
+    does not download the body again. Only validators, status, headers and body bytes are kept.
+
+    Args:
+        max_bytes (int): Max number of bytes of the cached responses. Least recently used responses are removed
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint_name: str, request_kwargs: dict, auth: Any = None) -> str:
+        """Returns key of the request. Responses are not shared between endpoints and auth providers,
+        as auth data is not a part of the request arguments
+
+        Args:
+            endpoint_name (str): Endpoint class name
+            request_kwargs (dict): Arguments for requests.Session.request built by BaseEndpoint
+            auth (AuthProvider): Provider to add auth data to the request
+
+        Returns:
+            :str key
+        """
+        return f"{endpoint_name}:{_auth_id(auth)}:{ResponseCache.make_key(request_kwargs)}"
+
+    @staticmethod
+    def has_validators(request_kwargs: dict) -> bool:
+        """Returns True if the request has its own If-None-Match or If-Modified-Since header"""
+        return any(name.lower() in CONDITIONAL_HEADERS for name in (request_kwargs.get("headers") or {}))
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # mark as recently used
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, response: requests.Response) -> Optional[CachedResponse]:
+        """Saves 200 OK response with ETag or Last-Modified header. Response without the validators
+        removes previously cached response of the key, response larger than max_bytes is not cached
+
+        Args:
+            key (str): Request key, see make_key
+            response (requests.Response): Received response with the read body
+
+        Returns:
+            :CachedResponse or None if response is not cached
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        content = response.content if response.status_code == 200 and (etag or last_modified) else None
+        if not isinstance(content, bytes):
+            self.remove(key)
+            return None
+        entry = CachedResponse(etag, last_modified, response.status_code, dict(response.headers), content)
+        with self._lock:
+            self._pop(key)
+            if entry.size > self.max_bytes:
+                return None
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                self.size -= self._entries.popitem(last=False)[1].size
+        return entry
+
+    def count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def remove(self, key: str):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.size}
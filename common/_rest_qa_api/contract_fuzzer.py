@@ -0,0 +1,414 @@
+import heapq
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union, get_args, get_origin, \
+    get_type_hints
+from urllib.parse import parse_qsl
+
+from common._rest_qa_api.rest_utils import percentile
+from common._rest_qa_api.rest_utils import copy_value
+
+if TYPE_CHECKING:
+    # to avoid import loop only for annotations
+    from common._rest_qa_api.base_endpoint import BaseEndpoint  # noqa
+
+logger = logging.getLogger(__name__)
+
+# path to the mutated value inside the request field: dict keys and list indexes
+Path = Tuple[Union[str, int], ...]
+
+# replaces numbers and hex ids in error bodies, so the errors of different values have the same signature
+_VOLATILE = re.compile(r"0x[0-9a-f]+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+", re.I)
+_SPACES = re.compile(r"\s+")
+
+STRING_VALUES = ("", " ", "a" * 10000, "null", "-1", "0", "1e309", "' OR '1'='1", "<script>alert(1)</script>",
+                 "../../../../etc/passwd", "%s%s%n", "{{7*7}}", "\u0000", "\u202e\U0001f600\u00e9", "true")
+INT_VALUES = (0, -1, 1, 2 ** 31, -2 ** 31 - 1, 2 ** 63, 10 ** 30, 1.5, "1", True)
+FLOAT_VALUES = (0.0, -0.0, 1e308, -1e308, 5e-324, 1, "1.0")
+# header values must be latin-1 strings without line breaks, otherwise requests rejects them before sending
+HEADER_VALUES = ("", " ", "a" * 8192, "null", "-1", "\u00e9", "*/*", "' OR '1'='1", "../../../../etc/passwd")
+# query parameter values: lists are sent as repeated parameters
+PARAM_VALUES = ("", "a" * 10000, "null", "-1", "1e309", "' OR '1'='1", "../../../../etc/passwd", "%s%s%n",
+                "\u202e\U0001f600\u00e9", -1, 2 ** 63, ["1", "2"])
+FUZZ_KEY = "__fuzz__"
+
+
+@dataclass
+class FuzzCase:
+    """One mutated request
+
+    Attributes:
+        index (int): Number of the case. The same seed and index always give the same case
+        field (str): Mutated argument of requests.Session.request: params, headers, json or data
+        path (tuple): Keys and indexes of the mutated value inside the field. Empty for the whole field
+        strategy (str): Mutation applied. E.x.: "int -> 2147483648", "drop key", "dict -> None"
+        request_kwargs (dict): Arguments of requests.Session.request
+    """
+    index: int
+    field: str
+    path: Path
+    strategy: str
+    request_kwargs: dict = field(repr=False, default_factory=dict)
+
+    def __str__(self):
+        path = "->".join(str(item) for item in (self.field,) + self.path)
+        return f"#{self.index} {path}: {self.strategy}"
+
+
+@dataclass
+class FuzzBucket:
+    """Responses with the same status code and error signature. Latencies are in milliseconds
+
+    Attributes:
+        signature (str): Status code and normalized error body or exception name. E.x.: '500 {"error":"internal"}'
+        status_code (int): Response status code. None if the request failed without the response
+        examples (list): First cases of the bucket to reproduce the error
+    """
+    signature: str
+    status_code: Optional[int] = None
+    count: int = 0
+    max: float = 0.0
+    latencies: List[float] = field(default_factory=list, repr=False)
+    examples: List[FuzzCase] = field(default_factory=list, repr=False)
+
+    @property
+    def p95(self) -> float:
+        return percentile(sorted(self.latencies), 95)
+
+    @property
+    def is_crash(self) -> bool:
+        """Server error or failed request: connection reset, timeout, etc."""
+        return self.status_code is None or self.status_code >= 500
+
+    def __str__(self):
+        examples = "; ".join(str(case) for case in self.examples)
+        return f"{self.count} x {self.signature} (p95 {self.p95:.1f} ms, max {self.max:.1f} ms) e.x.: {examples}"
+
+
+@dataclass
+class FuzzReport:
+    """Results of the fuzz run
+
+    Attributes:
+        requests (int): Number of sent requests
+        duration (float): Run duration in seconds
+        buckets (dict): Buckets of the responses by signature
+        slowest (list): Slowest cases with their latencies in milliseconds, the slowest first
+    """
+    requests: int = 0
+    duration: float = 0.0
+    buckets: Dict[str, FuzzBucket] = field(default_factory=dict)
+    slowest: List[Tuple[float, FuzzCase]] = field(default_factory=list)
+
+    @property
+    def crashes(self) -> List[FuzzBucket]:
+        return [bucket for bucket in self.buckets.values() if bucket.is_crash]
+
+    def __str__(self):
+        lines = [f"requests: {self.requests}, duration: {self.duration:.2f} s, buckets: {len(self.buckets)}, "
+                 f"crash buckets: {len(self.crashes)}"]
+        lines += [f"\t{bucket}" for bucket in sorted(self.buckets.values(), key=lambda item: -item.count)]
+        lines += [f"\tslow: {latency:.1f} ms {case}" for latency, case in self.slowest]
+        return "\n".join(lines)
+
+
+def error_signature(response=None, error: Optional[Exception] = None) -> str:
+    """Returns signature of the result to bucket the same errors together: status code for successful responses,
+    status code and normalized start of the body for error responses, exception name for failed requests
+    """
+    if response is None:
+        return error.__class__.__name__
+    if response.ok:
+        return str(response.status_code)
+    body = _VOLATILE.sub("#", _SPACES.sub(" ", response.text[:200]).strip())
+    return f"{response.status_code} {body}".strip()
+
+
+def _unwrap_optional(hint):
+    if get_origin(hint) is Union:
+        args = [arg for arg in get_args(hint) if arg is not type(None)]
+        return args[0] if len(args) == 1 else Any
+    return hint
+
+
+def _kind(value: Any, hint) -> Any:
+    """Returns type to mutate the value as: type of the value or base type of the hint if value is None"""
+    if value is not None:
+        return type(value)
+    hint = _unwrap_optional(hint)
+    return get_origin(hint) or (hint if isinstance(hint, type) else type(None))
+
+
+def _child_hint(hint):
+    hint = _unwrap_optional(hint)
+    args = get_args(hint)
+    origin = get_origin(hint)
+    if origin is dict and len(args) == 2:
+        return args[1]
+    if origin is list and args:
+        return args[0]
+    return Any
+
+
+def _sample(hint) -> Any:
+    """Returns valid looking value of the hint type to add to the collections"""
+    return {str: "fuzz", int: 1, float: 1.0, bool: True, dict: {}, list: []}.get(_kind(None, hint), "fuzz")
+
+
+def _values(kind: Any, field_name: str) -> Tuple[Any, ...]:
+    if field_name == "headers":
+        return HEADER_VALUES
+    if field_name == "params":
+        return PARAM_VALUES
+    if kind is bool:
+        return (False, True, "true", 0, None)
+    if kind is int:
+        return INT_VALUES + (None,)
+    if kind is float:
+        return FLOAT_VALUES + (None,)
+    if kind is str:
+        return STRING_VALUES + (123, None)
+    return STRING_VALUES[:4] + (0, None)
+
+
+def _set(value: Any, path: Path, new_value: Any) -> Any:
+    """Returns copy of the value with the new value by the path"""
+    if not path:
+        return new_value
+    value = copy_value(value)
+    parent = value
+    for key in path[:-1]:
+        parent = parent[key]
+    parent[path[-1]] = new_value
+    return value
+
+
+class RequestMutator:
+    """Generates mutated requests from the endpoint request model: one mutation of params, headers or body per request.
+
+    Value to mutate is selected randomly from all nested values of the field. Mutation depends on the value type:
+    boundary numbers, empty, huge and special strings, wrong types, None, dropped and unknown dict keys,
+    empty and huge lists. If the field is None, its type hint on the request model is used. E.x.:
+        post_data: Optional[Dict[str, int]] = None
+
+    Cases are reproducible: the same seed and index always give the same case.
+
+    Args:
+        endpoint (BaseEndpoint): Endpoint to build the base request with
+        method (str): HTTP method. E.x: post, get, etc
+        seed (int): Seed of the mutations
+        fields (tuple): Arguments of requests.Session.request to mutate: params, headers, json or data.
+            All of them present in the request by default
+    """
+
+    def __init__(self, endpoint: 'BaseEndpoint', method: str = "get", seed: int = 0, fields: Optional[tuple] = None):
+        self.method = method
+        self.seed = seed
+        self.base_kwargs = endpoint._prepare_request(method)
+        if isinstance(self.base_kwargs.get("params"), (str, list)):
+            # query string is mutated as dict of parameters
+            params = self.base_kwargs["params"]
+            self.base_kwargs["params"] = dict(parse_qsl(params.lstrip("?"), keep_blank_values=True)
+                                              if isinstance(params, str) else params)
+        try:
+            hints = get_type_hints(type(endpoint.request_model))
+        except Exception:
+            hints = {}
+        body_hint = hints.get(f"{method}_data", Any)
+        if "data" in self.base_kwargs and self.base_kwargs["data"] is None and \
+                _kind(None, body_hint) in (dict, list):
+            # body is sent as JSON if the model field is dict or list
+            self.base_kwargs["json"] = self.base_kwargs.pop("data")
+        self.hints = {"params": hints.get("params", Any), "headers": hints.get("headers", Any),
+                      "json": body_hint, "data": body_hint}
+        self.fields = tuple(name for name in (fields or ("params", "headers", "json", "data"))
+                            if name in self.base_kwargs)
+        if not self.fields:
+            raise ValueError(f"{method.upper()} request of {type(endpoint).__name__} has none of the fields to mutate")
+        self._paths = {name: self._collect_paths(self.base_kwargs[name], self.hints[name]) for name in self.fields}
+
+    @staticmethod
+    def _collect_paths(value: Any, hint, limit: int = 1000) -> List[Tuple[Path, Any]]:
+        """Returns paths of the nested values with their type hints: breadth first, at most limit paths"""
+        paths, queue = [], [((), value, hint)]
+        while queue and len(paths) < limit:
+            path, item, item_hint = queue.pop(0)
+            paths.append((path, item_hint))
+            if isinstance(item, dict):
+                queue.extend((path + (key,), child, _child_hint(item_hint)) for key, child in item.items())
+            elif isinstance(item, list):
+                queue.extend((path + (index,), child, _child_hint(item_hint)) for index, child in enumerate(item))
+        return paths
+
+    @staticmethod
+    def _get(value: Any, path: Path) -> Any:
+        for key in path:
+            value = value[key]
+        return value
+
+    def _strategies(self, field_name: str, value: Any, hint, path: Path) -> List[Tuple[str, Any]]:
+        kind = _kind(value, hint)
+        if kind is dict or (value is None and field_name in ("params", "headers") and not path):
+            value = value or {}
+            sample = "fuzz" if field_name in ("params", "headers") else _sample(_child_hint(hint))
+            strategies = [("add unknown key", dict(value, **{FUZZ_KEY: sample}))]
+            strategies += [(f"drop key {key}", {name: item for name, item in value.items() if name != key})
+                           for key in value]
+            if field_name not in ("params", "headers"):
+                strategies += [("dict -> {}", {}), ("dict -> None", None), ("dict -> []", []),
+                               ("deeply nested dict", _nested(value, 64))]
+            return strategies
+        if kind is list:
+            value = value or []
+            item = value[0] if value else _sample(_child_hint(hint))
+            return [("list -> []", []), ("list -> None", None), ("list -> {}", {}),
+                    ("huge list", [copy_value(item) for _ in range(10000)]),
+                    ("None item", value + [None]), ("duplicated items", value + copy_value(value))]
+        return [(f"{kind.__name__} -> {_short(new_value)}", new_value) for new_value in _values(kind, field_name)
+                if new_value != value or type(new_value) is not type(value)]
+
+    def case(self, index: int) -> FuzzCase:
+        """Returns the mutated request by its index"""
+        rnd = random.Random(f"{self.seed}:{index}")
+        field_name = rnd.choice(self.fields)
+        path, hint = rnd.choice(self._paths[field_name])
+        base = self.base_kwargs[field_name]
+        strategy, new_value = rnd.choice(self._strategies(field_name, self._get(base, path), hint, path))
+        request_kwargs = dict(self.base_kwargs)
+        request_kwargs[field_name] = _set(base, path, new_value)
+        return FuzzCase(index, field_name, path, strategy, request_kwargs)
+
+    def cases(self, count: int) -> Iterator[FuzzCase]:
+        return (self.case(index) for index in range(count))
+
+
+def _nested(value: dict, depth: int) -> dict:
+    for _ in range(depth):
+        value = {FUZZ_KEY: value}
+    return value
+
+
+def _short(value: Any) -> str:
+    text = repr(value)
+    return text if len(text) <= 30 else f"{text[:20]}...({len(text)} chars)"
+
+
+class ContractFuzzer:
+    """Sends mutated requests of the endpoint concurrently and buckets the results by status code and error
+    signature to find crashing and slow paths of the service.
+
+    Requests are sent once via the endpoint transport without response caching and retries (neither max_retries
+    of the transport nor 429 retries of the rate limiter), so the report shows the status codes the service returned.
+    Requests wait for the rate limit if it is set, latency is the time of the transport call only.
+    Response bodies are not kept: bucket keeps the counts, latencies and first examples only.
+
+    Examples:
+        report = ContractFuzzer(users.endpoint, "post", count=5000, concurrency=20, seed=1).run()
+        assert not report.crashes, report
+
+    Args:
+        endpoint (BaseEndpoint): Endpoint to fuzz
+        method (str): HTTP method. E.x: post, get, etc
+        count (int): Number of requests to send
+        concurrency (int): Max number of requests in flight. Should not exceed [api] pool_maxsize
+        seed (int): Seed of the mutations. Run with the same seed sends the same requests
+        fields (tuple): Arguments of requests.Session.request to mutate: params, headers, json or data
+        max_examples (int): Number of example cases kept per bucket
+        slowest (int): Number of the slowest cases kept in the report
+    """
+
+    def __init__(self, endpoint: 'BaseEndpoint', method: str = "get", count: int = 1000, concurrency: int = 10,
+                 seed: int = 0, fields: Optional[tuple] = None, max_examples: int = 3, slowest: int = 10):
+        self.endpoint = endpoint
+        self.method = method
+        self.count = count
+        self.concurrency = concurrency
+        self.max_examples = max_examples
+        self.slowest = slowest
+        self.mutator = RequestMutator(endpoint, method, seed, fields)
+        self._lock = threading.Lock()
+        self._cases: Iterator[FuzzCase] = iter(())
+        self._slowest: List[Tuple[float, int, FuzzCase]] = []
+        self._report = FuzzReport()
+
+    def _wait_rate_limit(self, case: FuzzCase):
+        if self.endpoint.rate_limiter is not None:
+            self.endpoint.rate_limiter.acquire(case.request_kwargs["url"])
+
+    def _update_rate_limit(self, case: FuzzCase, response):
+        if self.endpoint.rate_limiter is not None:
+            self.endpoint.rate_limiter.update(case.request_kwargs["url"], response)
+
+    def _send(self, case: FuzzCase):
+        endpoint = self.endpoint
+        return endpoint.transport.send(endpoint.base_url, use_cache=False, auth=endpoint.auth, retries=False,
+                                       **case.request_kwargs)
+
+    def _record(self, case: FuzzCase, latency: float, status_code: Optional[int], signature: str):
+        with self._lock:
+            self._report.requests += 1
+            bucket = self._report.buckets.get(signature)
+            if bucket is None:
+                bucket = self._report.buckets[signature] = FuzzBucket(signature, status_code)
+            bucket.count += 1
+            bucket.max = max(bucket.max, latency)
+            bucket.latencies.append(latency)
+            if len(bucket.examples) < self.max_examples:
+                bucket.examples.append(case)
+            if self.slowest:
+                item = (latency, case.index, case)
+                if len(self._slowest) < self.slowest:
+                    heapq.heappush(self._slowest, item)
+                elif latency > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, item)
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                case = next(self._cases, None)
+            if case is None:
+                return
+            start = None
+            try:
+                self._wait_rate_limit(case)
+                start = time.perf_counter()
+                response = self._send(case)
+            except Exception as err:
+                logger.debug(f"Fuzz request {case} failed: {err}")
+                # request which timed out waiting for the rate limit is not sent
+                latency = (time.perf_counter() - start) * 1000 if start is not None else 0.0
+                self._record(case, latency, None, error_signature(error=err))
+                continue
+            latency = (time.perf_counter() - start) * 1000
+            self._update_rate_limit(case, response)
+            self._record(case, latency, response.status_code, error_signature(response))
+
+    def run(self) -> FuzzReport:
+        """Sends the mutated requests and returns the report
+
+        Returns:
+            :FuzzReport object
+        """
+        self._cases = self.mutator.cases(self.count)
+        self._slowest = []
+        self._report = FuzzReport()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="pycats_fuzz") as executor:
+            for future in [executor.submit(self._worker) for _ in range(self.concurrency)]:
+                future.result()
+        report = self._report
+        report.duration = time.perf_counter() - start
+        report.slowest = [(latency, case) for latency, _, case in sorted(self._slowest, reverse=True)]
+        logger.info(f"Fuzz run of {self.method.upper()} {self.endpoint.base_url} finished: {report}")
+        return report
+
+
+def run_fuzz(endpoint: 'BaseEndpoint', method: str = "get", count: int = 1000, concurrency: int = 10,
+             seed: int = 0) -> FuzzReport:
+    """Shortcut for ContractFuzzer(...).run(). See ContractFuzzer for arguments description"""
+    return ContractFuzzer(endpoint, method, count, concurrency, seed).run()
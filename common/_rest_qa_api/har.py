@@ -0,0 +1,244 @@
+import base64
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, quote, unquote_plus, urlsplit, urlunsplit
+
+import requests
+
+from common._rest_qa_api.instrumentation import InstrumentationHook, RequestMetrics
+
+logger = logging.getLogger(__name__)
+
+HAR_VERSION = "1.2"
+_CREATOR = {"name": "pycats", "version": "1.0"}
+_HTTP_VERSIONS = {10: "HTTP/1.0", 11: "HTTP/1.1", 20: "HTTP/2"}
+# headers with credentials which are never written to HAR files
+SENSITIVE_HEADERS = ("authorization", "proxy-authorization", "cookie", "set-cookie")
+REDACTED = "[REDACTED]"
+
+
+def _headers(headers, redacted: Set[str]) -> List[dict]:
+    return [{"name": name, "value": REDACTED if name.lower() in redacted else str(value)}
+            for name, value in (headers or {}).items()]
+
+
+def _query(url: str, redacted: Set[str]) -> List[tuple]:
+    return [(name, REDACTED if name.lower() in redacted else value)
+            for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)]
+
+
+def _redact_url(url: str, redacted: Set[str]) -> str:
+    """Returns URL with the values of the redacted query params replaced, other params are kept as is"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = []
+    for param in parts.query.split("&"):
+        name = param.split("=", 1)[0]
+        if unquote_plus(name).lower() in redacted:
+            param = f"{name}={quote(REDACTED)}"
+        query.append(param)
+    return urlunsplit(parts._replace(query="&".join(query)))
+
+
+def _body(content, mime_type: str, max_size: int) -> dict:
+    """Returns HAR content of the body: text of the body or base64 of the binary body cut to max_size bytes"""
+    if content is None:
+        return {"mimeType": mime_type, "size": -1}
+    if isinstance(content, str):
+        content = content.encode()
+    result = {"mimeType": mime_type, "size": len(content)}
+    cut = content[:max_size]
+    try:
+        result["text"] = cut.decode()
+    except UnicodeDecodeError:
+        result["text"] = base64.b64encode(cut).decode()
+        result["encoding"] = "base64"
+    if len(cut) < len(content):
+        result["comment"] = f"body is cut to {max_size} bytes"
+    return result
+
+
+def _received_content(response: requests.Response) -> Optional[bytes]:
+    # body of the streamed response is read by chunks and is not kept by requests, so it is not available
+    content = getattr(response, "_content", None)
+    return content if isinstance(content, bytes) else None
+
+
+def har_entry(metrics: RequestMetrics, max_body_size: int = 65536, redact: Iterable[str] = ()) -> dict:
+    """Returns HAR 1.2 entry of the endpoint call. Request and response are taken from metrics.response,
+    call failed without the response (E.x.: connection error) has response status 0 and _error field.
+    Phases of the call not covered by HAR timings are kept in the custom fields: _build, _convert and _validate.
+
+    Values of the SENSITIVE_HEADERS, of the headers and query params of the auth provider (metrics.secret_names)
+    and of the redact names are replaced with [REDACTED] in the headers, URL and query string
+    """
+    redacted = {name.lower() for name in (*SENSITIVE_HEADERS, *metrics.secret_names, *redact)}
+    response = metrics.response
+    request = getattr(response, "request", None)
+    url = _redact_url(getattr(request, "url", None) or metrics.url, redacted)
+    request_headers = getattr(request, "headers", None) or {}
+    http_version = _HTTP_VERSIONS.get(getattr(getattr(response, "raw", None), "version", None), "HTTP/1.1")
+    har_request = {
+        "method": metrics.method.upper(),
+        "url": url,
+        "httpVersion": http_version,
+        "cookies": [],
+        "headers": _headers(request_headers, redacted),
+        "queryString": [{"name": name, "value": value} for name, value in _query(url, redacted)],
+        "headersSize": -1,
+        "bodySize": metrics.request_size,
+    }
+    body = getattr(request, "body", None)
+    if body is not None:
+        post_data = _body(body, request_headers.get("Content-Type", ""), max_body_size)
+        har_request["postData"] = {"mimeType": post_data["mimeType"], "text": post_data.get("text", "")}
+    if response is not None:
+        content = _received_content(response)
+        har_response = {
+            "status": response.status_code,
+            "statusText": response.reason or "",
+            "httpVersion": http_version,
+            "cookies": [],
+            "headers": _headers(response.headers, redacted),
+            "content": _body(content, response.headers.get("Content-Type", ""), max_body_size),
+            "redirectURL": response.headers.get("Location", ""),
+            "headersSize": -1,
+            "bodySize": metrics.response_size if metrics.response_size is not None else -1,
+        }
+    else:
+        har_response = {"status": 0, "statusText": "", "httpVersion": http_version, "cookies": [], "headers": [],
+                        "content": {"mimeType": "", "size": 0}, "redirectURL": "", "headersSize": -1,
+                        "bodySize": -1, "_error": metrics.error}
+    return {
+        "startedDateTime": datetime.fromtimestamp(metrics.timestamp, timezone.utc).isoformat(),
+        "time": metrics.network,
+        "request": har_request,
+        "response": har_response,
+        "cache": {},
+        "timings": {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0,
+                    "wait": metrics.ttfb, "receive": metrics.download},
+        "_endpoint": metrics.endpoint,
+        "_test": metrics.test,
+        "_build": metrics.build,
+        "_convert": metrics.convert,
+        "_validate": metrics.validate,
+        "_passed": metrics.passed,
+    }
+
+
+class HarWriter:
+    """Streams HAR 1.2 entries to the file. Entries are serialized on write and kept in the buffer
+    till buffer_size entries are collected, so memory use does not grow with the number of requests.
+    File is a valid HAR document after close.
+
+    Examples:
+        with HarWriter("test_login.har") as writer:
+            writer.write(har_entry(metrics))
+
+    Args:
+        path (str): HAR file path. Folder is created if it does not exist
+        buffer_size (int): Max number of entries kept in memory before they are written to the file
+    """
+
+    def __init__(self, path: str, buffer_size: int = 50):
+        self.path = path
+        self.buffer_size = max(buffer_size, 1)
+        self.entries = 0
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        header = json.dumps({"log": {"version": HAR_VERSION, "creator": _CREATOR, "pages": []}})
+        # entries are streamed into the end of the log object
+        self._file.write(header[:-2] + ', "entries": [\n')
+
+    def write(self, entry: dict):
+        serialized = json.dumps(entry, default=str)
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f"HAR file {self.path} is closed")
+            self._buffer.append(serialized)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write((",\n" if self.entries else "") + ",\n".join(self._buffer))
+            self.entries += len(self._buffer)
+            self._buffer.clear()
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush()
+            self._file.write("\n]}}\n")
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class HarRecorder(InstrumentationHook):
+    """Writes HTTP exchanges of the endpoint calls to HAR file of the current test.
+    Calls made outside of the tests are not written.
+
+    Examples:
+        recorder = HarRecorder()
+        Instrumentation().add_hook(recorder)
+        recorder.start_test("logs/test_login.har")
+        ...
+        recorder.finish_test()
+
+    Args:
+        buffer_size (int): Max number of entries kept in memory before they are written to the file
+        max_body_size (int): Max number of bytes of request and response body written to the file
+        redact (list): Names of the headers and query params with secrets which are not sent by the auth provider
+            (E.x.: API key in the request model params). Their values are not written to the file
+    """
+
+    def __init__(self, buffer_size: int = 50, max_body_size: int = 65536, redact: Iterable[str] = ()):
+        self.buffer_size = buffer_size
+        self.max_body_size = max_body_size
+        self.redact = tuple(redact)
+        self._writer: Optional[HarWriter] = None
+        self._lock = threading.Lock()
+
+    def start_test(self, path: str):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = HarWriter(path, self.buffer_size)
+
+    def finish_test(self) -> Optional[str]:
+        """Closes HAR file of the test
+
+        Returns:
+            :path of HAR file or None if there were no API calls in the test
+        """
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is None:
+            return None
+        writer.close()
+        if not writer.entries:
+            os.remove(writer.path)
+            return None
+        return writer.path
+
+    def on_request(self, metrics: RequestMetrics):
+        writer = self._writer
+        if writer is not None:
+            writer.write(har_entry(metrics, self.max_body_size, self.redact))
@@ -0,0 +1,225 @@
+import csv
+import json
+import logging
+import threading
+from abc import ABCMeta, abstractmethod
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from common._libs.helpers.singleton import Singleton
+from common._rest_qa_api.rest_utils import percentile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestMetrics:
+    """Timings and sizes of one endpoint call. Timings are in milliseconds, sizes are in bytes.
+
+    Network time is split by requests.Response.elapsed: ttfb is the time from sending the request till the response
+    headers are parsed (it includes DNS lookup and connection setup of the new connections, which requests does not
+    report separately), download is the rest of the network time. Body of the streamed response is downloaded
+    during the conversion.
+
+    Attributes:
+        endpoint (str): Endpoint class name
+        method (str): HTTP method
+        url (str): Request URL
+        test (str): Test the call was made in
+        status_code (int): Response status code. None if the request failed
+        passed (bool): Validation result. None if response was not validated
+        error (str): Exception raised by the call
+        request_size (int): Size of the request body
+        response_size (int): Size of the response body. None if it is unknown for the streamed response
+    """
+    endpoint: str
+    method: str
+    url: str = ""
+    test: Optional[str] = None
+    timestamp: float = 0.0
+    status_code: Optional[int] = None
+    passed: Optional[bool] = None
+    error: Optional[str] = None
+    build: float = 0.0
+    network: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    convert: float = 0.0
+    validate: float = 0.0
+    request_size: int = 0
+    response_size: Optional[int] = None
+    # received response of the call for the hooks (E.x.: HAR recorder). It is not a report field
+    # and it is released after the hooks are called, so collected metrics do not keep the responses
+    response = None
+    # names of the headers and query params with auth data of the call, redacted by the hooks which record requests
+    secret_names = ()
+
+    @property
+    def total(self) -> float:
+        return self.build + self.network + self.convert + self.validate
+
+    def set_request(self, request_kwargs: dict, build_time: float):
+        self.build = build_time * 1000
+        self.url = request_kwargs.get("url", "")
+
+    def set_response(self, response: requests.Response, network_time: float, stream: bool = False):
+        self.network = network_time * 1000
+        self.ttfb = min(response.elapsed.total_seconds() * 1000, self.network)
+        self.download = self.network - self.ttfb
+        self.status_code = response.status_code
+        self.response = response
+        # body of the sent prepared request
+        body = getattr(response.request, "body", None)
+        self.request_size = len(body) if isinstance(body, (str, bytes)) else 0
+        if not stream:
+            self.response_size = len(response.content or b"")
+        elif response.headers.get("Content-Length", "").isdigit():
+            self.response_size = int(response.headers["Content-Length"])
+
+    def to_dict(self) -> dict:
+        return dict(asdict(self), total=self.total)
+
+
+class InstrumentationHook(metaclass=ABCMeta):
+    """Base class of the instrumentation hooks. Hook gets metrics of each endpoint call"""
+
+    @abstractmethod
+    def on_request(self, metrics: RequestMetrics):
+        """Called with metrics of each endpoint call. Exceptions of the hook are logged and do not fail the call"""
+
+
+class Instrumentation(metaclass=Singleton):
+    """Registry of the instrumentation hooks. BaseEndpoint.execute and execute_async report metrics of each call here.
+    Metrics are passed to the hooks only, nothing is kept if there are no hooks.
+
+    Examples:
+        collector = MetricsCollector()
+        Instrumentation().add_hook(collector)
+    """
+
+    def __init__(self):
+        self.hooks: List[InstrumentationHook] = []
+        self.current_test: Optional[str] = None
+
+    def add_hook(self, hook: InstrumentationHook):
+        if hook not in self.hooks:
+            self.hooks.append(hook)
+
+    def remove_hook(self, hook: InstrumentationHook):
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def record(self, metrics: RequestMetrics):
+        if not self.hooks:
+            return
+        metrics.test = self.current_test
+        for hook in self.hooks:
+            try:
+                hook.on_request(metrics)
+            except Exception as err:
+                logger.warning(f"Instrumentation hook {hook.__class__.__name__} failed: {err}")
+        metrics.response = None
+
+
+@dataclass
+class EndpointStats:
+    """Aggregated metrics of the endpoint calls. Timings are in milliseconds: mean values of the phases
+    and percentiles of the total time"""
+    endpoint: str
+    method: str
+    calls: int = 0
+    errors: int = 0
+    validation_failures: int = 0
+    build: float = 0.0
+    network: float = 0.0
+    ttfb: float = 0.0
+    convert: float = 0.0
+    validate: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    max: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+    def __str__(self):
+        return (f"{self.endpoint} {self.method.upper()}: calls {self.calls}, errors {self.errors}, "
+                f"validation failures {self.validation_failures}, total ms p50 {self.p50:.1f} p95 {self.p95:.1f} "
+                f"max {self.max:.1f}, mean ms build {self.build:.2f} network {self.network:.1f} "
+                f"(ttfb {self.ttfb:.1f}) convert {self.convert:.2f} validate {self.validate:.2f}, "
+                f"bytes sent {self.request_bytes} received {self.response_bytes}")
+
+
+def aggregate(records: List[RequestMetrics]) -> List[EndpointStats]:
+    """Aggregates metrics by endpoint and method"""
+    groups: Dict[Tuple[str, str], List[RequestMetrics]] = dict()
+    for metrics in records:
+        groups.setdefault((metrics.endpoint, metrics.method), []).append(metrics)
+    result = []
+    for (endpoint, method), group in groups.items():
+        count = len(group)
+        totals = sorted(metrics.total for metrics in group)
+        result.append(EndpointStats(
+            endpoint, method, count,
+            errors=sum(metrics.error is not None or not 0 < (metrics.status_code or 0) < 400 for metrics in group),
+            validation_failures=sum(metrics.passed is False for metrics in group),
+            build=sum(metrics.build for metrics in group) / count,
+            network=sum(metrics.network for metrics in group) / count,
+            ttfb=sum(metrics.ttfb for metrics in group) / count,
+            convert=sum(metrics.convert for metrics in group) / count,
+            validate=sum(metrics.validate for metrics in group) / count,
+            p50=percentile(totals, 50), p95=percentile(totals, 95), max=totals[-1],
+            request_bytes=sum(metrics.request_size for metrics in group),
+            response_bytes=sum(metrics.response_size or 0 for metrics in group)))
+    return result
+
+
+class MetricsCollector(InstrumentationHook):
+    """Collects metrics of the endpoint calls per test and for the whole run and writes them to JSON or CSV report.
+
+    Examples:
+        collector = MetricsCollector()
+        Instrumentation().add_hook(collector)
+        ...
+        for stats in collector.finish_test():
+            print(stats)
+        collector.write_report("api_metrics.csv")
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._test_records: List[RequestMetrics] = []
+        self.records: List[RequestMetrics] = []
+
+    def on_request(self, metrics: RequestMetrics):
+        with self._lock:
+            self._test_records.append(metrics)
+            self.records.append(metrics)
+
+    def finish_test(self) -> List[EndpointStats]:
+        """Returns aggregated metrics of the calls made since the previous call and starts the new test"""
+        with self._lock:
+            records, self._test_records = self._test_records, []
+        return aggregate(records)
+
+    def summary(self) -> List[EndpointStats]:
+        """Returns aggregated metrics of all calls"""
+        return aggregate(self.records)
+
+    def write_report(self, path: str):
+        """Writes metrics of all calls to the report. CSV report is written for .csv file, JSON report otherwise.
+        JSON report contains the calls and the summary by endpoint
+        """
+        rows = [metrics.to_dict() for metrics in self.records]
+        if path.lower().endswith(".csv"):
+            columns = [item.name for item in fields(RequestMetrics)] + ["total"]
+            with open(path, "w", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as file:
+                json.dump({"calls": rows, "summary": [asdict(stats) for stats in self.summary()]}, file, indent=2)
+        logger.info(f"API metrics report of {len(rows)} calls is saved to {path}")
+
@@ -0,0 +1,204 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from common._rest_qa_api.rest_utils import percentile
+
+if TYPE_CHECKING:
+    # to avoid import loop only for annotations
+    from common._rest_qa_api.base_endpoint import BaseEndpoint  # noqa
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadReport:
+    """Results of the load run. Latencies are in milliseconds
+
+    Attributes:
+        requests (int): Number of completed requests
+        errors (int): Number of failed requests: connection errors and responses with not ok status
+        validated (int): Number of responses validated with response model
+        validation_failures (int): Number of validated responses which did not match the model
+        duration (float): Run duration in seconds
+        status_codes (dict): Number of responses by status code
+    """
+    requests: int = 0
+    errors: int = 0
+    validated: int = 0
+    validation_failures: int = 0
+    duration: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+    mean: float = 0.0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second"""
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def validation_failure_rate(self) -> float:
+        return self.validation_failures / self.validated if self.validated else 0.0
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__, throughput=self.throughput, error_rate=self.error_rate,
+                    validation_failure_rate=self.validation_failure_rate)
+
+    def __str__(self):
+        return (f"requests: {self.requests}, duration: {self.duration:.2f} s, throughput: {self.throughput:.1f} rps, "
+                f"errors: {self.error_rate:.2%}, validation failures: {self.validation_failures}/{self.validated}, "
+                f"latency ms: p50 {self.p50:.1f}, p95 {self.p95:.1f}, p99 {self.p99:.1f}, max {self.max:.1f}")
+
+
+class LoadGenerator:
+    """Runs the endpoint with the target number of requests per second or concurrency for the duration.
+
+    Requests are built from the endpoint request model and sent via the endpoint transport without response caching.
+    Only the sampled fraction of responses is converted and validated with the endpoint response model,
+    other responses are only timed and counted. Latency is the time till the response is received,
+    conversion and validation of the sampled responses are not included, so it does not depend on sample_rate.
+
+    In rate mode requests are scheduled at fixed intervals and latency is measured from the scheduled send time,
+    so delays of the queued requests are included into latency when the endpoint can not keep the rate.
+    Concurrency limits the number of requests in flight in both modes.
+
+    Examples:
+        weather = DailyWeatherEndpointBuilder()
+        report = LoadGenerator(weather.endpoint, "get", duration=30, rps=50, concurrency=10).run()
+        assert report.p95 < 500 and report.error_rate < 0.01, report
+
+    Args:
+        endpoint (BaseEndpoint): endpoint to run. E.x.: endpoint created by endpoint_factory
+        method (str): HTTP method to use. E.x: post, get, etc
+        duration (float): Run duration in seconds
+        concurrency (int): Max number of requests in flight. Should not exceed [api] pool_maxsize
+        rps (float): Target number of requests per second. Requests are sent as fast as possible if not set
+        sample_rate (float): Fraction of responses to validate with response model: from 0 to 1
+        seed (int): Seed for responses sampling
+    """
+
+    def __init__(self, endpoint: 'BaseEndpoint', method: str = "get", duration: float = 10, concurrency: int = 10,
+                 rps: Optional[float] = None, sample_rate: float = 0.1, seed: Optional[int] = None):
+        self.endpoint = endpoint
+        self.method = method
+        self.duration = duration
+        self.concurrency = concurrency
+        self.rps = rps
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._scheduled = 0
+        self._latencies: List[float] = []
+        self._report = LoadReport()
+
+    def _next_send_time(self, start: float, deadline: float) -> Optional[float]:
+        """Returns time to send the next request at or None if the run is over"""
+        if self.rps is None:
+            now = time.perf_counter()
+            return now if now < deadline else None
+        with self._lock:
+            send_time = start + self._scheduled / self.rps
+            self._scheduled += 1
+        return send_time if send_time < deadline else None
+
+    def _send(self, send_time: float) -> tuple:
+        """Sends one request. Latency is measured from send_time till the response is received,
+        so conversion and validation of the sampled responses do not affect it
+
+        Returns:
+            :tuple of requests.Response (None on connection error) and latency in milliseconds
+        """
+        endpoint = self.endpoint
+        try:
+            request_kwargs = endpoint._prepare_request(self.method)
+            result = endpoint.transport.send(endpoint.base_url, use_cache=False, auth=endpoint.auth, **request_kwargs)
+        except Exception as err:
+            logger.debug(f"Load request failed: {err!r}")
+            result = None
+        return result, (time.perf_counter() - send_time) * 1000
+
+    def _validate(self, result) -> bool:
+        """Converts and validates the sampled response
+
+        Returns:
+            :True if validation failed
+        """
+        try:
+            self.endpoint._process_response(result)
+            return False
+        except Exception as err:
+            # conversion errors of the unexpected body (E.x.: ValueError of invalid JSON) are failures too
+            logger.debug(f"Load response validation failed: {err!r}")
+            return True
+
+    def _record(self, latency: float, result, validation_failed: Optional[bool]):
+        with self._lock:
+            report = self._report
+            report.requests += 1
+            self._latencies.append(latency)
+            if result is None or not result.ok:
+                report.errors += 1
+            if result is not None:
+                report.status_codes[result.status_code] = report.status_codes.get(result.status_code, 0) + 1
+            if validation_failed is not None:
+                report.validated += 1
+                report.validation_failures += validation_failed
+
+    def _worker(self, start: float, deadline: float):
+        while True:
+            send_time = self._next_send_time(start, deadline)
+            if send_time is None:
+                return
+            delay = send_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            sampled = self._random.random() < self.sample_rate
+            result, latency = self._send(send_time)
+            validation_failed = self._validate(result) if sampled and result is not None else None
+            self._record(latency, result, validation_failed)
+
+    def run(self) -> LoadReport:
+        """Runs the load and returns the report
+
+        Returns:
+            :LoadReport object
+        """
+        pool_maxsize = self.endpoint.session_manager.api_settings.pool_maxsize
+        if self.concurrency > pool_maxsize:
+            logger.warning(f"Concurrency {self.concurrency} exceeds [api] pool_maxsize {pool_maxsize}, "
+                           f"extra connections will not be reused")
+        self._scheduled = 0
+        self._latencies = []
+        self._report = LoadReport()
+        start = time.perf_counter()
+        deadline = start + self.duration
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="pycats_load") as executor:
+            for future in [executor.submit(self._worker, start, deadline) for _ in range(self.concurrency)]:
+                future.result()
+        report = self._report
+        report.duration = time.perf_counter() - start
+        latencies = sorted(self._latencies)
+        if latencies:
+            report.p50, report.p95, report.p99 = (percentile(latencies, percent) for percent in (50, 95, 99))
+            report.max = latencies[-1]
+            report.mean = sum(latencies) / len(latencies)
+        logger.info(f"Load run of {self.method.upper()} {self.endpoint.base_url} finished: {report}")
+        return report
+
+
+def run_load(endpoint: 'BaseEndpoint', method: str = "get", duration: float = 10, concurrency: int = 10,
+             rps: Optional[float] = None, sample_rate: float = 0.1) -> LoadReport:
+    """Shortcut for LoadGenerator(...).run(). See LoadGenerator for arguments description"""
+    return LoadGenerator(endpoint, method, duration, concurrency, rps, sample_rate).run()
@@ -0,0 +1,244 @@
+import logging
+import time
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence, Union, TYPE_CHECKING
+
+from common._rest_qa_api.instrumentation import Instrumentation, RequestMetrics
+from common._rest_qa_api.rest_utils import merge_params
+
+if TYPE_CHECKING:
+    # to avoid import loop only for annotations
+    from common._rest_qa_api.base_endpoint import BaseEndpoint, BaseResponseModel  # noqa
+
+logger = logging.getLogger(__name__)
+
+
+def get_by_path(body: Any, path: Union[str, Sequence, None]) -> Any:
+    """Returns value from the nested body by path. E.x.: 'meta.next_cursor' or ('data', 0, 'id').
+    Returns body if path is empty and None if any key is absent
+    """
+    if not path:
+        return body
+    for key in path.split(".") if isinstance(path, str) else path:
+        try:
+            body = body[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return body
+
+
+class PaginationStrategy(metaclass=ABCMeta):
+    """Base class of the pagination strategies. Strategy provides request params for the first page
+    and reads params of the next page from the response body of the current one.
+    """
+
+    @abstractmethod
+    def first_params(self) -> dict:
+        """Returns pagination params of the first page"""
+
+    @abstractmethod
+    def next_params(self, body: Any, params: dict) -> Optional[dict]:
+        """Returns pagination params of the next page or None if the current page is the last one
+
+        Args:
+            body (Any): converted response body of the current page
+            params (dict): pagination params of the current page
+        """
+
+
+class PagePagination(PaginationStrategy):
+    """Page number pagination: ?page=1&per_page=100. Iteration stops on the empty or not full page
+
+    Args:
+        page_param (str): name of the page number param
+        items_path (str|Sequence): path to the list of page items in body. Body is the list if not set
+        start (int): number of the first page
+        size_param (str): name of the page size param. Not sent if not set
+        size (int): page size. If set - page with less items is the last one
+    """
+
+    def __init__(self, page_param: str = "page", items_path: Union[str, Sequence, None] = None, start: int = 1,
+                 size_param: Optional[str] = None, size: Optional[int] = None):
+        self.page_param = page_param
+        self.items_path = items_path
+        self.start = start
+        self.size_param = size_param
+        self.size = size
+
+    def first_params(self) -> dict:
+        params = {self.page_param: self.start}
+        if self.size_param and self.size:
+            params[self.size_param] = self.size
+        return params
+
+    def next_params(self, body: Any, params: dict) -> Optional[dict]:
+        items = get_by_path(body, self.items_path)
+        if not items or (self.size and len(items) < self.size):
+            return None
+        return dict(params, **{self.page_param: params[self.page_param] + 1})
+
+
+class OffsetPagination(PaginationStrategy):
+    """Offset pagination: ?offset=0&limit=100. Iteration stops on the page with less than limit items
+
+    Args:
+        offset_param (str): name of the offset param
+        limit_param (str): name of the limit param
+        limit (int): number of items requested per page
+        items_path (str|Sequence): path to the list of page items in body. Body is the list if not set
+        start (int): offset of the first page
+    """
+
+    def __init__(self, offset_param: str = "offset", limit_param: str = "limit", limit: int = 100,
+                 items_path: Union[str, Sequence, None] = None, start: int = 0):
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.limit = limit
+        self.items_path = items_path
+        self.start = start
+
+    def first_params(self) -> dict:
+        return {self.offset_param: self.start, self.limit_param: self.limit}
+
+    def next_params(self, body: Any, params: dict) -> Optional[dict]:
+        items = get_by_path(body, self.items_path)
+        if not items or len(items) < self.limit:
+            return None
+        return dict(params, **{self.offset_param: params[self.offset_param] + len(items)})
+
+
+class CursorPagination(PaginationStrategy):
+    """Cursor pagination: next page token is taken from the body. Iteration stops when token is empty
+
+    Args:
+        cursor_param (str): name of the cursor param
+        cursor_path (str|Sequence): path to the next page token in body. E.x.: 'meta.next_cursor'
+        first_cursor (str): token of the first page. Cursor param is not sent for the first page if not set
+    """
+
+    def __init__(self, cursor_param: str = "cursor", cursor_path: Union[str, Sequence] = "next_cursor",
+                 first_cursor: Optional[str] = None):
+        self.cursor_param = cursor_param
+        self.cursor_path = cursor_path
+        self.first_cursor = first_cursor
+
+    def first_params(self) -> dict:
+        return {self.cursor_param: self.first_cursor} if self.first_cursor else {}
+
+    def next_params(self, body: Any, params: dict) -> Optional[dict]:
+        cursor = get_by_path(body, self.cursor_path)
+        return {self.cursor_param: cursor} if cursor else None
+
+
+class Paginator:
+    """Iterates over pages of the paginated endpoint and lazily yields converted response models.
+
+    Request is built from the endpoint request model once, pagination params are added to its params for each page.
+    Pages are sent and converted as endpoint.execute does: with rate limit, conditional requests and metrics
+    reported to Instrumentation hooks (E.x.: HAR recorder).
+    The next page is requested in the background as soon as the current page is converted and its params are read
+    from the body, so the network time of the next page overlaps with validation of the current page
+    and with its processing in the loop.
+    Only the current and the prefetched pages are kept, so memory usage does not depend on the number of pages.
+
+    Pagination fields of the body (E.x.: the next cursor) should not be marked as SKIP in the response model
+    if the streaming body parsing is used, because SKIP subtrees are not built in that mode.
+
+    Examples:
+        users = UsersEndpointBuilder()
+        for page in Paginator(users.endpoint, CursorPagination(cursor_path="meta.next")):
+            process(page.get_data)
+
+    Args:
+        endpoint (BaseEndpoint): endpoint to iterate over
+        strategy (PaginationStrategy): pagination strategy
+        method (str): HTTP method to use. E.x: post, get, etc
+        base_validation (bool): If True - each page is validated with the endpoint response model
+        prefetch (bool): If True - the next page is requested while the current one is processed
+        max_pages (int): Max number of pages to request. Unlimited if not set
+
+    Raises:
+        :RestResponseValidationError if any page validation fails
+    """
+
+    def __init__(self, endpoint: 'BaseEndpoint', strategy: PaginationStrategy, method: str = "get",
+                 base_validation=True, prefetch=True, max_pages: Optional[int] = None):
+        self.endpoint = endpoint
+        self.strategy = strategy
+        self.method = method
+        self.base_validation = base_validation
+        self.prefetch = prefetch
+        self.max_pages = max_pages
+
+    def _body(self, response: 'BaseResponseModel') -> Any:
+        if not response.raw_response.ok:
+            return None
+        return getattr(response, f"{self.method.lower()}_data")
+
+    def _send(self, request_kwargs: dict, page_params: dict, build_time: float = 0.0) -> tuple:
+        """Sends the page request the same way as endpoint.execute does: with rate limit and conditional requests.
+        Metrics of the failed request are reported to Instrumentation hooks
+
+        Returns:
+            :tuple of RequestMetrics and the arguments of endpoint._measured_convert
+        """
+        endpoint = self.endpoint
+        metrics = endpoint._start_metrics(self.method)
+        page_kwargs = dict(request_kwargs, params=merge_params(request_kwargs.get("params"), page_params))
+        metrics.set_request(page_kwargs, build_time)
+        try:
+            return (metrics,) + endpoint._send_request(page_kwargs, metrics)
+        except Exception as err:
+            metrics.error = err.__class__.__name__
+            Instrumentation().record(metrics)
+            raise
+
+    @contextmanager
+    def _recorded(self, metrics: RequestMetrics):
+        """Reports metrics of the page to Instrumentation hooks after the page is processed or failed"""
+        try:
+            yield
+        except Exception as err:
+            metrics.error = err.__class__.__name__
+            raise
+        finally:
+            Instrumentation().record(metrics)
+
+    def __iter__(self) -> Iterator['BaseResponseModel']:
+        start = time.perf_counter()
+        request_kwargs = self.endpoint._prepare_request(self.method)
+        build_time = time.perf_counter() - start
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pycats_prefetch") if self.prefetch \
+            else None
+        try:
+            params = self.strategy.first_params()
+            page = self._send(request_kwargs, params, build_time)
+            pages = 0
+            while True:
+                pages += 1
+                metrics, result, conditional_key, cached = page
+                with self._recorded(metrics):
+                    response = self.endpoint._measured_convert(result, metrics, conditional_key, cached)
+                    params = self.strategy.next_params(self._body(response), params)
+                    if self.max_pages and pages >= self.max_pages:
+                        params = None
+                    # the next page is requested while the current one is validated
+                    next_page = executor.submit(self._send, request_kwargs, params) \
+                        if executor and params is not None else None
+                    self.endpoint._validate_response(response, self.base_validation, metrics)
+                yield response
+                if params is None:
+                    return
+                logger.debug(f"Request next page with params {params}")
+                page = next_page.result() if next_page else self._send(request_kwargs, params)
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+
+
+def paginate(endpoint: 'BaseEndpoint', strategy: PaginationStrategy, method: str = "get", base_validation=True,
+             prefetch=True, max_pages: Optional[int] = None) -> Paginator:
+    """Shortcut for Paginator. See Paginator for arguments description"""
+    return Paginator(endpoint, strategy, method, base_validation, prefetch, max_pages)
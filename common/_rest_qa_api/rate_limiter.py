@@ -0,0 +1,263 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from common._libs.helpers.file_lock import FileLock, lock_path
+from common._libs.helpers.singleton import Singleton, get_singleton_instance
+from common.config_parser.section.api_section import RATE_LIMIT_BACKENDS
+
+logger = logging.getLogger(__name__)
+
+TOO_MANY_REQUESTS = 429
+SERVICE_UNAVAILABLE = 503
+# X-RateLimit-Reset greater than this value is unix timestamp, otherwise number of seconds till the reset
+_TIMESTAMP_THRESHOLD = 10 ** 9
+
+# state of the host bucket: tokens - available tokens (negative if the tokens are reserved by the waiting requests),
+# updated - time the tokens are calculated for. It is in the future if the server asked to wait (Retry-After)
+State = Dict[str, float]
+
+
+class MemoryBackend:
+    """Keeps bucket states in memory of the process. Shared by the threads of the process"""
+
+    def __init__(self):
+        self._states: Dict[str, State] = dict()
+        self._lock = threading.Lock()
+
+    def update(self, host: str, func: Callable[[State], float]) -> float:
+        """Calls func with the bucket state of the host under the lock. func changes the state in place
+
+        Returns:
+            :func result
+        """
+        with self._lock:
+            return func(self._states.setdefault(host, dict()))
+
+
+class FileBackend:
+    """Keeps bucket states in JSON files, one file per host. File is updated under the file lock,
+    so all processes of the test run (E.x.: pytest-xdist workers) share the same buckets
+
+    Args:
+        directory (str): Folder to keep the state files. Created if it does not exist
+        lock_timeout (float): Max time in seconds to wait for the file lock
+    """
+
+    def __init__(self, directory: str, lock_timeout: float = 60):
+        self.directory = directory
+        self.lock_timeout = lock_timeout
+        self._locks: Dict[str, FileLock] = dict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, host: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(host.encode()).hexdigest() + ".json")
+
+    def _file_lock(self, path: str) -> FileLock:
+        # FileLock is exclusive between threads only if they use the same instance
+        with self._lock:
+            if path not in self._locks:
+                self._locks[path] = FileLock(lock_path(path), self.lock_timeout)
+            return self._locks[path]
+
+    def update(self, host: str, func: Callable[[State], float]) -> float:
+        path = self._path(host)
+        with self._file_lock(path):
+            try:
+                with open(path) as file:
+                    state = json.load(file)
+            except (OSError, ValueError):
+                state = dict()
+            result = func(state)
+            # write to the temporary file first, so a killed worker never leaves a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as file:
+                json.dump(state, file)
+            os.replace(temp_path, path)
+        return result
+
+
+def parse_retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """Returns time the request may be sent at by Retry-After header: number of seconds or HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return now + int(value)
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_reset(value: Optional[str], now: float) -> Optional[float]:
+    """Returns time of the rate limit window reset by X-RateLimit-Reset header: unix timestamp or number of seconds"""
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    return reset if reset > _TIMESTAMP_THRESHOLD else now + reset
+
+
+class RateLimiter(metaclass=Singleton):
+    """Client-side token bucket per host shared by all endpoints.
+
+    Each request takes a token from the bucket of its host, tokens are refilled with rate tokens per second
+    up to burst tokens. If there is no token, the request waits for its turn: the token is reserved in advance,
+    so concurrent requests are spread evenly and the throughput stays just under the limit.
+
+    Rate limit headers of the responses adjust the bucket:
+        Retry-After of 429 and 503 responses - no requests are sent to the host till the time;
+        X-RateLimit-Remaining - tokens are never above the remaining number of requests;
+        X-RateLimit-Reset - if no requests remain, no requests are sent to the host till the reset time.
+    429 responses are retried up to retries times.
+
+    Buckets are kept in memory of the process (memory backend) or in the files shared by all processes
+    of the run (file backend), so pytest-xdist workers share the limit.
+
+    Examples:
+        limiter = RateLimiter(rate=5, burst=10, backend=FileBackend("/tmp/pycats_rate_limits"))
+        response = limiter.send("https://example.com/api/v1/users", lambda: session.get(url))
+
+    Args:
+        rate (float): Number of requests per second per host
+        burst (int): Max number of requests sent at once after the idle time
+        backend (MemoryBackend | FileBackend): Storage of the bucket states. MemoryBackend by default
+        retries (int): Max number of retries of 429 responses
+        max_wait (float): Max time in seconds the request waits for its turn or Retry-After time
+    """
+
+    def __init__(self, rate: float, burst: int = 1, backend=None, retries: int = 3, max_wait: float = 300):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.backend = backend or MemoryBackend()
+        self.retries = retries
+        self.max_wait = max_wait
+        self._limits: Dict[str, Tuple[float, int]] = dict()
+
+    @classmethod
+    def from_settings(cls, api_settings) -> 'RateLimiter':
+        """Returns shared RateLimiter configured by rate_limit options of [api] config section"""
+        limiter = get_singleton_instance(cls)
+        if limiter is not None:
+            return limiter
+        backend = None
+        if api_settings.rate_limit_backend == RATE_LIMIT_BACKENDS[1]:
+            backend = FileBackend(api_settings.rate_limit_dir or
+                                  os.path.join(tempfile.gettempdir(), "pycats_rate_limits"))
+        return cls(api_settings.rate_limit, api_settings.rate_limit_burst, backend, api_settings.rate_limit_retries)
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def set_limit(self, host: str, rate: float, burst: int = 1):
+        """Sets the limit of the host different from the default one. E.x.: set_limit("api.example.com", 2)"""
+        self._limits[host.lower()] = (rate, max(burst, 1))
+
+    def _limit(self, host: str) -> Tuple[float, int]:
+        return self._limits.get(host, (self.rate, self.burst))
+
+    def _reserve(self, host: str) -> float:
+        """Takes the token and returns number of seconds to wait for it. The token is not taken if the wait
+        is longer than max_wait, so the request which is not sent does not delay the next ones
+        """
+        rate, burst = self._limit(host)
+
+        def reserve(state: State) -> float:
+            now = time.time()
+            tokens = self._tokens(state, now, rate, burst)
+            wait = max(0.0, (1 - tokens) / rate)
+            if wait <= self.max_wait:
+                state["tokens"] = tokens - 1
+                state["updated"] = now
+            return wait
+        return self.backend.update(host, reserve)
+
+    @staticmethod
+    def _tokens(state: State, at: float, rate: float, burst: int) -> float:
+        """Returns tokens of the bucket at the time"""
+        return min(burst, state.get("tokens", burst) + (at - state.get("updated", at)) * rate)
+
+    def acquire(self, url: str):
+        """Waits till the request to the host of the URL may be sent
+
+        Raises:
+            :TimeoutError if the wait is longer than max_wait
+        """
+        host = self.host(url)
+        wait = self._reserve(host)
+        if wait > self.max_wait:
+            raise TimeoutError(f"Request to {host} should wait {wait:.1f} seconds for the rate limit, "
+                               f"max wait is {self.max_wait} seconds")
+        if wait > 0:
+            logger.debug(f"Wait {wait:.3f} seconds for the rate limit of {host}")
+            time.sleep(wait)
+
+    def update(self, url: str, response: requests.Response):
+        """Adjusts the bucket of the host by the rate limit headers of the response"""
+        headers = response.headers
+        retry_after = headers.get("Retry-After") if response.status_code in (TOO_MANY_REQUESTS, SERVICE_UNAVAILABLE) \
+            else None
+        remaining = headers.get("X-RateLimit-Remaining")
+        if retry_after is None and remaining is None and response.status_code != TOO_MANY_REQUESTS:
+            return
+        now = time.time()
+        blocked_until = parse_retry_after(retry_after, now)
+        try:
+            remaining = int(float(remaining)) if remaining is not None else None
+        except ValueError:
+            remaining = None
+        if remaining == 0 and blocked_until is None:
+            blocked_until = parse_rate_limit_reset(headers.get("X-RateLimit-Reset"), now)
+        rate, burst = self._limit(self.host(url))
+
+        def adjust(state: State) -> float:
+            if blocked_until is not None and blocked_until > max(now, state.get("updated", now)):
+                # the bucket is calculated for the time the requests are allowed again with one token at most,
+                # so the waiting requests are sent one by one after it instead of all at once
+                state["tokens"] = min(1, self._tokens(state, blocked_until, rate, burst))
+                state["updated"] = blocked_until
+                return state["tokens"]
+            tokens = self._tokens(state, now, rate, burst)
+            if remaining is not None:
+                tokens = min(tokens, remaining)
+            if response.status_code == TOO_MANY_REQUESTS:
+                # the server limit is exceeded, the next request waits for the full token
+                tokens = min(tokens, 0)
+            state["tokens"] = tokens
+            state["updated"] = now
+            return tokens
+        self.backend.update(self.host(url), adjust)
+
+    def send(self, url: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """Sends the request when the rate limit allows it and retries 429 responses
+
+        Args:
+            url (str): Request URL
+            send (Callable): Function which sends the request and returns requests.Response
+
+        Returns:
+            :requests.Response - the last response if all retries are failed with 429
+        """
+        for attempt in range(self.retries + 1):
+            self.acquire(url)
+            response = send()
+            self.update(url, response)
+            if response.status_code != TOO_MANY_REQUESTS or attempt == self.retries:
+                return response
+            # returns connection of the streamed response to the pool
+            response.close()
+            logger.info(f"Retry request to {self.host(url)} rate limited with 429 status code, "
+                        f"attempt {attempt + 1} of {self.retries}")
+        return response
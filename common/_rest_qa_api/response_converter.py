@@ -1,50 +1,124 @@
-import json
-from copy import deepcopy
-from typing import Union, TYPE_CHECKING
+from copy import copy
+from typing import Any, Union, TYPE_CHECKING
+
+from common._rest_qa_api.body_codecs import JSONCodec, get_response_codec
+from common._rest_qa_api.rest_utils import peek_field
+from common._rest_qa_api.stream_parser import parse_json_stream
 
 if TYPE_CHECKING:
     # to avoid import loop only for annotations
     from common._rest_qa_api.base_endpoint import BaseResponseModel  # noqa
     from common._rest_qa_api.response_validator import ResponseValidatorMixin  # noqa
 
+# body argument of convert_raw_response if the body should be decoded from the response
+NOT_DECODED = object()
+
+
+def is_json_response(raw_response) -> bool:
+    return isinstance(get_response_codec(raw_response)[0], JSONCodec)
+
+
+def decode_body(raw_response) -> Any:
+    """Returns response body decoded by the codec of its Content-Type (see body_codecs) and raw text for the media
+    types without codec. Body is decoded straight from the bytes, without str decoding and charset detection
+
+    Raises:
+        :TypeError if body is incorrect
+    """
+    codec, charset = get_response_codec(raw_response)
+    if codec is None:
+        # get response body (text field)
+        return raw_response.text
+    content = raw_response.content or b""
+    try:
+        return codec.decode(content, charset)
+    except ValueError as err:
+        if isinstance(codec, JSONCodec):
+            raise TypeError(f'Incorrect json format: {content.decode(charset or "utf-8", errors="replace")}')
+        raise TypeError(f'Incorrect {codec.name} format: {err}')
+
 
 class ResponseConverterMixin:
     """Mixin to convert :requests.Response() object to PyCats response model
     Converts status_code, headers, body to the model format
     Assigns response object to self.raw_response field
     If HTTP response status is not ok - populates error_data field by response data
+
+    Response container is a shallow copy of the model: it references expected values, checkers and settings
+    of the model and keeps only the actual status_code, headers, body and raw_response,
+    so conversion allocates memory for the response only, not for the whole model
+
+    JSON body may be parsed in streaming mode, see configure_converter
     """
 
+    _stream_body = False
+    _stream_chunk_size = 65536
+
+    @classmethod
+    def configure_converter(cls, stream_body=False, chunk_size=65536):
+        """Performs converter setup for endpoint if JSON body should be parsed in streaming mode.
+
+        In streaming mode the response is requested with stream=True and JSON body is parsed chunk by chunk
+        by the incremental parser. Only the parts of the body covered by the model are built:
+        subtrees marked as SKIP are replaced by SKIP, keys absent in the model and list elements after
+        the last model element are dropped. So memory usage does not depend on the size of skipped parts.
+        Validation results are the same as in the default mode.
+        Body text is not available in raw_response in this mode, custom checkers should use model fields.
+
+        Args:
+            stream_body (bool): Parses JSON body in streaming mode if True
+            chunk_size (int): Size of the chunk read from the response stream
+        """
+        cls._stream_body = stream_body
+        cls._stream_chunk_size = chunk_size
+
     def convert_raw_response(self: Union['BaseResponseModel', 'ResponseConverterMixin', 'ResponseValidatorMixin'],
-                             response):
-        response_container = deepcopy(self)
+                             response, body: Any = NOT_DECODED):
+        """Converts the response to the response container.
+        body is the already decoded body of the response (E.x.: cached body of 304 Not Modified response),
+        it is set to the body field as is without decoding of the response content
+        """
+        response_container = copy(self)
         response_container.raw_response = response
         self._convert_status(response_container)
         self._convert_header(response_container)
-        self._convert_body(response_container)
+        self._convert_body(response_container, body)
         return response_container
 
-    def _convert_body(self, response_container):
-        if not response_container.raw_response.ok:
+    @staticmethod
+    def _body_field(raw_response) -> str:
+        if not raw_response.ok:
             # set model body to model.error_data
-            self._set_body_value('error_data', response_container)
-        else:
-            # set model body based on the request method
-            self._set_body_value(f'{response_container.raw_response.request.method.lower()}_data', response_container)
+            return 'error_data'
+        # set model body based on the request method
+        return f'{raw_response.request.method.lower()}_data'
+
+    def _convert_body(self, response_container, body: Any = NOT_DECODED):
+        field = self._body_field(response_container.raw_response)
+        if body is not NOT_DECODED:
+            setattr(response_container, field, body)
+            return
+        self._set_body_value(field, response_container)
 
     @staticmethod
     def _set_body_value(field, response_container):
-        # get response body (text field)
-        response_body = response_container.raw_response.text
-        # determine data format in response to convert it to dict ot use raw text
-        response_content_type = response_container.raw_response.headers.get('Content-Type')
-        if response_content_type and 'application/json' in response_content_type:
-            try:
-                setattr(response_container, field, json.loads(response_body))
-            except json.JSONDecodeError:
-                raise TypeError(f'Incorrect json format: {response_body}')
-        else:
-            setattr(response_container, field, response_body)
+        if response_container._stream_body and is_json_response(response_container.raw_response):
+            # model value of the field is used to prune the body
+            setattr(response_container, field,
+                    response_container._parse_body_stream(peek_field(response_container, field)))
+            return
+        setattr(response_container, field, decode_body(response_container.raw_response))
+
+    def _parse_body_stream(self, model_value: Any):
+        raw_response = self.raw_response
+        try:
+            return parse_json_stream(raw_response.iter_content(chunk_size=self._stream_chunk_size), model_value,
+                                     raw_response.encoding or "utf-8")
+        except ValueError as err:
+            raise TypeError(f'Incorrect json format: {err}')
+        finally:
+            # returns connection to the pool
+            raw_response.close()
 
     @staticmethod
     def _convert_header(response_container):
@@ -1,11 +1,12 @@
-import inspect
 import logging
 from copy import copy
 from typing import TYPE_CHECKING, Union
 
 from common.config_parser.config_dto import APIValidationDTO
-from common._rest_qa_api.rest_checkers import BaseRESTCheckers
-from common._rest_qa_api.rest_utils import SKIP
+from common._rest_qa_api.checker_executor import CheckerExecutor
+from common._rest_qa_api.rest_utils import SKIP, peek_field
+from common._rest_qa_api.schema import Schema
+from common._rest_qa_api.validation_plan import get_validation_plan, invalidate_validation_plan
 
 if TYPE_CHECKING:
     # to avoid import loop only for annotations
@@ -28,12 +29,14 @@ class ResponseValidatorMixin:
     The default validation rules are initialized based on the config values. It is possible to override them for each
     endpoint separately.
     It is also possible to provide additional custom checkers by adding them to the custom_checkers list.
+    Wall time of each custom checker is saved to self.checker_timings during the validation.
     """
 
     _check_status_code = None
     _check_headers = None
     _check_body = None
     _check_is_field_missing = None
+    _parallel_checkers = False
 
     def __init__(self, api_validation_section: APIValidationDTO):
         self._check_status_code = self._check_status_code if self._check_status_code is not None \
@@ -61,6 +64,15 @@ class ResponseValidatorMixin:
         cls._check_body = validate_body
         cls._check_is_field_missing = validate_is_field_missing
 
+    @classmethod
+    def configure_checkers(cls, parallel=False):
+        """Performs custom checkers execution setup for endpoint.
+        Args:
+            parallel (bool): Executes custom checkers concurrently in the thread pool if True.
+            Checkers should not depend on each other in this case.
+        """
+        cls._parallel_checkers = parallel
+
     def __eq__(self: Union['BaseResponseModel', 'ResponseConverterMixin', 'ResponseValidatorMixin'], model):
         """Performs object fields comparison.
 
@@ -70,7 +82,8 @@ class ResponseValidatorMixin:
             3) body
 
         Method extracts HTTP method used in Request and use the appropriate field from response and model for validation
-        Recursively validates all fields in JSON structure.
+        Validates all fields in JSON structure using the compiled validation plan of the model field.
+        If the plan finds any mismatch, recursive validation is executed to collect the errors.
         Calls functions/objects from the custom_checker list if provided.
         For each fail case appends error in self.errors list.
 
@@ -82,6 +95,7 @@ class ResponseValidatorMixin:
 
         """
         self.errors = {"default": [], "custom": []}
+        self.checker_timings = {}
         # Need to keep recursion depth and store the json fields
         self.field_nesting = []
 
@@ -93,25 +107,49 @@ class ResponseValidatorMixin:
         else:
             property_name = f'{self.raw_response.request.method.lower()}_data'
         body_to_verify = getattr(self, f'{property_name}')
-        model_data = getattr(model, property_name)
+        # model fields are read without copying the shared defaults, so the validation plan is compiled once
+        model_data = peek_field(model, property_name)
 
         # Verify basic validation rules and perform response validation
         if self._check_status_code:
-            self._validate_structure('status_code', self.status_code, model.status_code)
+            self._validate_field(model, 'status_code', self.status_code, peek_field(model, 'status_code'))
         if self._check_headers:
-            self._validate_structure('headers', self.headers, model.headers)
+            self._validate_field(model, 'headers', self.headers, peek_field(model, 'headers'))
         if self._check_body:
-            self._validate_structure(property_name, body_to_verify, model_data)
+            self._validate_field(model, property_name, body_to_verify, model_data)
         if self.custom_checkers:
             self._run_checkers()
         if self.errors["default"] or self.errors["custom"]:
             return False
         return True
 
+    def _validate_field(self, model, field_name, data_to_verify, model_to_verify):
+        """Validates data_to_verify with the compiled plan of model field and falls back to the recursive
+        _validate_structure to report errors if the plan check does not pass.
+        If the model field is Schema - data is validated with the compiled schema and then with its expected value
+
+        Args:
+            model (BaseResponseModel): BaseResponseModel instance with model for validation
+            field_name (str): Field name to validated
+            data_to_verify (Any): Data to verify
+            model_to_verify (Any): Model to verify the data
+        """
+        if isinstance(model_to_verify, Schema):
+            self._validate_schema(field_name, data_to_verify, model_to_verify)
+            return
+        plan = get_validation_plan(model.__class__, field_name, model_to_verify)
+        result = plan.check(data_to_verify, model_to_verify)
+        if result is None:
+            # expected tree was changed in place after plan compilation
+            invalidate_validation_plan(model.__class__, field_name, model_to_verify)
+        if not result:
+            self._validate_structure(field_name, data_to_verify, model_to_verify)
+
     def _validate_structure(self, field_name, data_to_verify, model_to_verify, list_position=None):
         """Recursively validates provided data_to_verify based on the model_to_verify
 
         If value is SKIP - exits from function
+        If value is Schema - validates data with the schema
         If value is instance of dict - calls itself for each key
         If value is instance of list - calls itself for each element in list
         If value is custom object or primitive data type - asserts data with model using native __eq__
@@ -123,6 +161,10 @@ class ResponseValidatorMixin:
             data_to_verify (Any): Data to verify
             model_to_verify (Any): Model to verify the data
         """
+        if isinstance(model_to_verify, Schema):
+            self._validate_schema(field_name, data_to_verify, model_to_verify, list_position)
+            return
+
         if list_position is None:
             self.field_nesting.append(field_name)
 
@@ -176,29 +218,24 @@ class ResponseValidatorMixin:
         if list_position is None:
             self.field_nesting.pop()
 
+    def _validate_schema(self, field_name, data_to_verify, schema: Schema, list_position=None):
+        """Validates data_to_verify with the compiled schema and then with the schema expected value.
+        Errors are added to self.errors["default"] with the same field path as _validate_structure errors
+        """
+        errors = self.errors["default"]
+        errors_count = len(errors)
+        path = self.field_nesting + [field_name] if list_position is None else copy(self.field_nesting)
+        schema.validate(data_to_verify, path, errors)
+        if len(errors) == errors_count and schema.expected is not SKIP:
+            self._validate_structure(field_name, data_to_verify, schema.expected, list_position)
+
     def _run_checkers(self: Union['BaseResponseModel', 'ResponseValidatorMixin']):
-        """Executes all provided checkers in loop
+        """Executes all provided checkers with CheckerExecutor
 
         Supports 2 types of checkers - class inherited from BaseRESTCheckers class and functions.
         In case of custom check errors adds them to self.errors["custom"]
+        Wall time of each checker is saved to self.checker_timings
         """
-        for checker in self.custom_checkers:
-            logger.info(f"run checker: {checker.__name__}: ")
-            try:
-                if inspect.isfunction(checker):
-                    checker(self)
-                elif isinstance(checker(), BaseRESTCheckers):
-                    errors = checker.execute(self)
-                    self.errors["custom"] = errors
-                else:
-                    raise TypeError(f'{checker} has unsupported type. Supported are functions and '
-                                    f'BaseRESTCheckers instances')
-            except AssertionError as err:
-                self.errors["custom"].append((checker, err))
-            except Exception as err:
-                logger.info("fail")
-                logger.exception(err)
-                raise
-            else:
-                if not self.errors["default"] and not self.errors["custom"]:
-                    logger.info(f"{checker.__name__} validation passed")
+        errors, self.checker_timings = CheckerExecutor().run(self, self.custom_checkers,
+                                                             parallel=self._parallel_checkers)
+        self.errors["custom"].extend(errors)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
+import time
 from functools import wraps
-from typing import TYPE_CHECKING
+from typing import Dict, Optional, Tuple, Type, TYPE_CHECKING
 
 if TYPE_CHECKING:
     # to avoid import loop only for annotations
@@ -11,6 +12,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 logger.setLevel("INFO")
 
+# check methods discovered for each BaseRESTCheckers subclass
+_discovered_checks: Dict[Type['BaseRESTCheckers'], Tuple[str, ...]] = {}
+
 
 class BaseRESTCheckers:
     """Base class to organize checkers in one class and call them automatically during response validation.
@@ -43,18 +47,42 @@ class BaseRESTCheckers:
             cls._deactivated_checks.append(method.__name__)
 
     @classmethod
-    def execute(cls, response):
+    def get_checks(cls) -> Tuple[str, ...]:
+        """Returns names of the active check methods. Methods are discovered once per class
+
+        Returns:
+            :tuple of method names
+        """
+        checks = _discovered_checks.get(cls)
+        if checks is None:
+            checks = _discovered_checks[cls] = tuple(
+                method for method in dir(cls) if not method.startswith("_") and callable(getattr(cls, method))
+                and method not in ["activate", "deactivate", "execute", "get_checks"])
+        return tuple(method for method in checks if method not in cls._deactivated_checks)
+
+    @classmethod
+    def execute(cls, response, timings: Optional[Dict[str, float]] = None):
+        """Runs all active check methods
+
+        Args:
+            response (BaseResponseModel): response to check
+            timings (dict): If provided - wall time in seconds of each check is saved to it by 'Class.method' key
+
+        Returns:
+            :list of (method name, AssertionError) tuples for failed checks
+        """
         errors = []
-        for method in dir(cls):
-            if not method.startswith("_") and callable(getattr(cls, method)) and \
-                    method not in cls._deactivated_checks\
-                    and method not in ["activate", "deactivate", "execute"]:
-                try:
-                    getattr(cls, method)(response)
-                except AssertionError as err:
-                    errors.append((method, err))
-                else:
-                    logger.info(f"{method} validation passed")
+        for method in cls.get_checks():
+            start = time.perf_counter()
+            try:
+                getattr(cls, method)(response)
+            except AssertionError as err:
+                errors.append((method, err))
+            else:
+                logger.info(f"{method} validation passed")
+            finally:
+                if timings is not None:
+                    timings[f"{cls.__name__}.{method}"] = time.perf_counter() - start
         return errors
 
 
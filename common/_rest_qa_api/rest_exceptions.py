@@ -28,6 +28,7 @@ class MissingDecoratorError(Exception):
 class RestResponseValidationError(Exception):
     def __init__(self, response):
         self.message = ""
+        self.response = response
         self.default_errors = response.errors["default"]
         self.custom_errors = response.errors["custom"]
         if self.default_errors:
@@ -1,7 +1,11 @@
+import inspect
 import logging
+import math
 import copy
-from typing import Any
-from dataclasses import field, dataclass
+from types import FunctionType
+from typing import Any, Dict, FrozenSet, List, Tuple, Union
+from urllib.parse import parse_qsl
+from dataclasses import field, dataclass, fields, is_dataclass
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,72 @@ class SKIP:
         pass
 
 
+# default of the copy on access field passed to the dataclass __init__. Instance reads the class default then
+_SHARED_DEFAULT = type("_SharedDefault", (), {"__repr__": lambda self: "<shared default>"})()
+
+
+def copy_value(value: Any) -> Any:
+    """Returns deep copy of JSON like value. dicts, lists, tuples and sets are copied recursively without
+    deepcopy overhead, immutable values are shared, other objects are copied with deepcopy
+    """
+    cls = value.__class__
+    if cls is dict:
+        return {key: copy_value(item) for key, item in value.items()}
+    if cls is list:
+        return [copy_value(item) for item in value]
+    if cls in (str, int, float, bool, type(None), type, FunctionType):
+        return value
+    if cls is tuple:
+        return tuple(copy_value(item) for item in value)
+    if cls in (set, frozenset):
+        return cls(value)
+    return copy.deepcopy(value)
+
+
+class CopyOnAccess:
+    """Data descriptor of mutable model field (dict, set or non empty list).
+
+    Instances of the model share the class default till the field is accessed, on the first access instance
+    gets its own copy of the default. So models are created without copying the defaults,
+    and changes of the field in the test never affect other instances.
+    Framework reads fields with peek_field to use the shared default without copying.
+
+    Note: the default is copied on the first access, not on the instance creation. Changes of the class level
+    default (E.x.: Model.headers["X-Id"] = "1") are seen by the existing instances which have not read the field
+    yet, so change the defaults before creating the models.
+    """
+
+    def __init__(self, name: str, default: Any):
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.default
+        value = instance.__dict__.get(self.name, _SHARED_DEFAULT)
+        if value is _SHARED_DEFAULT:
+            # setdefault keeps the copy made by the first of the concurrent readers
+            value = instance.__dict__.setdefault(self.name, copy_value(self.default))
+        return value
+
+    def __set__(self, instance, value):
+        if value is not _SHARED_DEFAULT:
+            instance.__dict__[self.name] = value
+
+
+def peek_field(obj, name: str) -> Any:
+    """Returns field value without copying the shared default of CopyOnAccess field.
+    Returned value must not be changed
+    """
+    for cls in obj.__class__.__mro__:
+        attribute = cls.__dict__.get(name, _SHARED_DEFAULT)
+        if attribute is not _SHARED_DEFAULT:
+            if isinstance(attribute, CopyOnAccess):
+                return obj.__dict__.get(name, attribute.default)
+            break
+    return getattr(obj, name)
+
+
 def pycats_dataclass(_cls=None, *, init=True, repr=False, eq=False, order=False, unsafe_hash=None, frozen=False):
     """Wrapper for dataclass decorator. Used to simplify syntax and usage
     by disable __repr__ and  __eq__ methods generation, adds the ability to skip key's type annotations by default
@@ -29,6 +99,7 @@ def pycats_dataclass(_cls=None, *, init=True, repr=False, eq=False, order=False,
     if _cls:
         if not _cls.__dict__.get("__annotations__"):
             setattr(_cls, "__annotations__", {})
+        copy_on_access = {}
 
         for key, value in _cls.__dict__.items():
             # check if value is dataclass method or private
@@ -40,19 +111,22 @@ def pycats_dataclass(_cls=None, *, init=True, repr=False, eq=False, order=False,
                 _cls.__dict__.get("__annotations__")[key] = Any
 
             # for mutable data types dataclass protocol requires this data as field.
-            # because of iteration we need to create deepcopy of object
-            if isinstance(value, (dict, set)):
-                setattr(_cls, key, field(default_factory=lambda value=value: value))
+            # instances share the value till the first access, then copy it (see CopyOnAccess)
+            if isinstance(value, (dict, set)) or (value and isinstance(value, list)):
+                copy_on_access[key] = value
+                setattr(_cls, key, field(default=_SHARED_DEFAULT))
             # for empty lists we need to pass list as a callable without arguments
             elif not value and isinstance(value, list):
                 setattr(_cls, key, field(default_factory=list))
-            # if we have some values in list we need to make it's copy before
-            elif value and isinstance(value, list):
-                setattr(_cls, key, field(default_factory=lambda value=value: copy.deepcopy(value)))
-            # if the value if lambda function - do the same as for list - just call it
+            # if the value if lambda function - just call it
             elif callable(value) and 'lambda' in value.__name__:
                 setattr(_cls, key, field(default_factory=value))
 
+        _cls = dataclass(_cls, init=init, repr=repr, eq=eq, order=order, unsafe_hash=unsafe_hash, frozen=frozen)
+        for key, value in copy_on_access.items():
+            setattr(_cls, key, CopyOnAccess(key, value))
+        return _cls
+
     return dataclass(_cls, init=init, repr=repr, eq=eq, order=order, unsafe_hash=unsafe_hash, frozen=frozen)
 
 
@@ -68,14 +142,44 @@ def make_request_url(model):
     return model
 
 
+_class_fields: Dict[type, Tuple[Tuple[str, ...], FrozenSet[str]]] = {}
+
+
+def class_fields(cls) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """Returns public attribute names of the class: dataclass fields, class level values and properties.
+    Names are collected once per class and cached
+
+    Returns:
+        :tuple of sorted names and frozenset of the same names
+    """
+    cached = _class_fields.get(cls)
+    if cached is None:
+        names = {item.name for item in fields(cls)} if is_dataclass(cls) else set()
+        names.update(name for name in dir(cls)
+                     if not isinstance(inspect.getattr_static(cls, name), (FunctionType, classmethod, staticmethod)))
+        names = tuple(sorted(name for name in names if not name.startswith('_')))
+        cached = _class_fields[cls] = (names, frozenset(names))
+    return cached
+
+
 def obj_to_dict(obj, exclude_params=None):
     """Non recursively transformer object to dict
+
+    Takes public not callable attributes of the object: cached class fields and attributes set on the instance
     """
     if not exclude_params:
-        exclude_params = []
-    return dict(
-        (key, obj.__getattribute__(key)) for key in dir(obj)
-        if not callable(obj.__getattribute__(key)) and not key.startswith('_') and key not in exclude_params)
+        exclude_params = ()
+    names, names_set = class_fields(obj.__class__)
+    result = {}
+    for key in names:
+        if key not in exclude_params:
+            value = getattr(obj, key)
+            if not callable(value):
+                result[key] = value
+    for key, value in getattr(obj, '__dict__', {}).items():
+        if key not in names_set and not key.startswith('_') and key not in exclude_params and not callable(value):
+            result[key] = value
+    return result
 
 
 def dict_to_obj(obj, **kwargs):
@@ -86,3 +190,30 @@ def dict_to_obj(obj, **kwargs):
             setattr(obj, a, [x for x in b])
         else:
             setattr(obj, a, b)
+
+
+def merge_params(params: Union[str, dict, list, None], new_params: dict) -> List[Tuple[str, Any]]:
+    """Adds parameters to request params of any format supported by requests. Existing parameters are replaced
+
+    Args:
+        params (str|dict|list): request params. E.x.: 'q=Minsk&units=metric'
+        new_params (dict): parameters to add. E.x.: pagination or auth params
+
+    Returns:
+        :list of (key, value) pairs
+    """
+    if not params:
+        params = []
+    elif isinstance(params, str):
+        params = parse_qsl(params.lstrip("?"), keep_blank_values=True)
+    elif isinstance(params, dict):
+        params = list(params.items())
+    return [(key, value) for key, value in params if key not in new_params] + list(new_params.items())
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Returns nearest-rank percentile of the sorted values. 0 for empty list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
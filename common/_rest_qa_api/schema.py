@@ -0,0 +1,362 @@
+import re
+from typing import Any, Callable, List, Optional, Tuple
+
+from common._rest_qa_api.rest_utils import SKIP
+
+# check(value) returns True if value is valid
+Check = Callable[[Any], bool]
+# collect(value, path, errors) appends (path, expected, actual) error tuples
+Collect = Callable[[Any, list, list], None]
+
+_MISSING = object()
+MISSING_FIELD_MESSAGE = "field does not present in response"
+
+JSON_TYPES = {
+    "string": lambda value: value.__class__ is str,
+    "integer": lambda value: value.__class__ is int or value.__class__ is float and value.is_integer(),
+    "number": lambda value: value.__class__ is int or value.__class__ is float,
+    "boolean": lambda value: value.__class__ is bool,
+    "null": lambda value: value is None,
+    "object": lambda value: value.__class__ is dict,
+    "array": lambda value: value.__class__ is list,
+}
+PYTHON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean", type(None): "null", dict: "object",
+                list: "array"}
+# keywords which do not affect validation
+ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples", "format", "definitions"}
+
+
+def _is_number(value: Any) -> bool:
+    return value.__class__ is int or value.__class__ is float
+
+
+def _canonical(value: Any) -> Any:
+    """Returns hashable form of the JSON value, equal for the equal JSON values: 1 and 1.0 are the same number,
+    order of the object keys is ignored, booleans differ from the numbers
+    """
+    if value.__class__ is bool:
+        return bool, value
+    if _is_number(value):
+        return float, value
+    if value.__class__ is list:
+        return list, tuple(_canonical(item) for item in value)
+    if value.__class__ is dict:
+        return dict, frozenset((key, _canonical(item)) for key, item in value.items())
+    return value.__class__, value
+
+
+def _all(checks: List[Check]) -> Check:
+    if not checks:
+        return lambda value: True
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(value):
+        for item in checks:
+            if not item(value):
+                return False
+        return True
+    return check
+
+
+class Schema:
+    """JSON Schema of the response model field compiled once into a fast validator.
+
+    Schema is used as the model field value instead of the expected value tree:
+        get_data = Schema({"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}})
+
+    or built from the typed structure, where types and SKIP are used instead of the values:
+        get_data = Schema.from_structure({"name": str, "coord": {"lon": float, "lat": float}, "base": "stations",
+                                          "weather": [{"id": int, "main": SKIP}]})
+
+    Supported keywords: type, enum, const, properties, required, additionalProperties, items (schema or list),
+    minItems, maxItems, uniqueItems, minProperties, maxProperties, minimum, maximum, exclusiveMinimum,
+    exclusiveMaximum, multipleOf, minLength, maxLength, pattern, allOf, anyOf, oneOf, not.
+    Annotations (title, description, format, etc) are ignored, other keywords raise ValueError on compilation.
+
+    Validation errors have the same format as errors of the value-based validation: (field path, expected, actual).
+    Expected value is the failed keyword, E.x.: "type: integer". Fields from 'required' are always verified,
+    validate_is_field_missing option is not applied to them.
+
+    Args:
+        schema (dict): JSON Schema
+        expected (Any): Expected value tree validated by the value-based validation if the schema passes.
+            E.x.: to verify some exact values additionally to the schema
+    """
+
+    def __init__(self, schema: dict, expected: Any = SKIP):
+        self.schema = schema
+        self.expected = expected
+        self._check, self._collect = self._compile(schema)
+
+    @classmethod
+    def from_structure(cls, structure: Any, additional_properties: bool = True) -> 'Schema':
+        """Builds schema from the typed structure: dict - object with all keys required, list - array of the elements
+        matching the first list element, type - value of the type, SKIP - any value, other values - the exact value
+
+        Args:
+            structure (Any): typed structure
+            additional_properties (bool): If False - objects may not have keys absent in the structure
+        """
+        return cls(structure_to_schema(structure, additional_properties))
+
+    def is_valid(self, value: Any) -> bool:
+        return self._check(value)
+
+    def validate(self, value: Any, path: list, errors: list):
+        """Appends (path, expected, actual) tuples of the validation errors to errors list
+
+        Args:
+            value (Any): data to verify
+            path (list): path of the value. E.x.: ['get_data']
+            errors (list): list to append errors to
+        """
+        if not self._check(value):
+            self._collect(value, path, errors)
+
+    def __repr__(self):
+        return f"Schema({self.schema})"
+
+    def _compile(self, schema: Any) -> Tuple[Check, Collect]:
+        if schema is True or schema == {}:
+            return lambda value: True, lambda value, path, errors: None
+        if schema is False:
+            return lambda value: False, lambda value, path, errors: errors.append((list(path), "no value", value))
+        if not isinstance(schema, dict):
+            raise ValueError(f"Invalid JSON Schema: {schema}")
+        unsupported = set(schema) - set(self._KEYWORDS) - ANNOTATIONS - {"required", "additionalProperties",
+                                                                           "additionalItems"}
+        if unsupported:
+            raise ValueError(f"Unsupported JSON Schema keywords: {', '.join(sorted(unsupported))}")
+        if ("required" in schema or "additionalProperties" in schema) and "properties" not in schema:
+            schema = dict(schema, properties={})
+
+        parts = [self._KEYWORDS[keyword](self, schema[keyword], schema) for keyword in self._KEYWORDS
+                 if keyword in schema]
+        check = _all([part[0] for part in parts])
+        collectors = [part[1] for part in parts]
+
+        def collect(value, path, errors):
+            for item in collectors:
+                item(value, path, errors)
+        return check, collect
+
+    @staticmethod
+    def _keyword(name: str, condition: Callable[[Any], bool], applies: Optional[Callable[[Any], bool]],
+                 description: str) -> Tuple[Check, Collect]:
+        """Compiles a keyword without subschemas. Keyword is verified only for values it applies to,
+        E.x.: minimum - for numbers only. Keyword applies to all values if applies is None
+        """
+        if applies is None:
+            check = condition
+        else:
+            def check(value):
+                return not applies(value) or condition(value)
+
+        def collect(value, path, errors):
+            if not check(value):
+                errors.append((list(path), f"{name}: {description}", value))
+        return check, collect
+
+    def _type(self, types: Any, schema: dict) -> Tuple[Check, Collect]:
+        names = [types] if isinstance(types, str) else list(types)
+        unknown = [name for name in names if name not in JSON_TYPES]
+        if unknown:
+            raise ValueError(f"Unknown JSON Schema types: {unknown}")
+        checks = [JSON_TYPES[name] for name in names]
+        if len(checks) == 1:
+            condition = checks[0]
+        else:
+            def condition(value):
+                return any(item(value) for item in checks)
+        return self._keyword("type", condition, None, " | ".join(names))
+
+    def _equals(self, name: str, values: list, description: str) -> Tuple[Check, Collect]:
+        def condition(value):
+            for item in values:
+                # bool is not equal to the number in JSON
+                if value == item and (value.__class__ is item.__class__ or _is_number(value) and _is_number(item)):
+                    return True
+            return False
+        return self._keyword(name, condition, None, description)
+
+    def _enum(self, values: list, schema: dict) -> Tuple[Check, Collect]:
+        return self._equals("enum", values, str(values))
+
+    def _const(self, constant: Any, schema: dict) -> Tuple[Check, Collect]:
+        return self._equals("const", [constant], str(constant))
+
+    def _number(name: str, compare: Callable[[Any, Any], bool]):
+        def compile_keyword(self, limit, schema):
+            return self._keyword(name, lambda value: compare(value, limit), _is_number, str(limit))
+        return compile_keyword
+
+    def _length(name: str, compare: Callable[[int, int], bool], applies: Callable[[Any], bool]):
+        def compile_keyword(self, limit, schema):
+            return self._keyword(name, lambda value: compare(len(value), limit), applies, str(limit))
+        return compile_keyword
+
+    def _multiple_of(self, divisor: float, schema: dict) -> Tuple[Check, Collect]:
+        return self._keyword("multipleOf", lambda value: (value / divisor).is_integer(), _is_number, str(divisor))
+
+    def _pattern(self, pattern: str, schema: dict) -> Tuple[Check, Collect]:
+        regex = re.compile(pattern)
+        return self._keyword("pattern", lambda value: regex.search(value) is not None,
+                             lambda value: value.__class__ is str, pattern)
+
+    def _unique_items(self, unique: bool, schema: dict) -> Tuple[Check, Collect]:
+        def condition(value):
+            seen = set()
+            for item in value:
+                item = _canonical(item)
+                if item in seen:
+                    return False
+                seen.add(item)
+            return True
+        return self._keyword("uniqueItems", condition if unique else lambda value: True,
+                             lambda value: value.__class__ is list, str(unique))
+
+    def _properties(self, properties: dict, schema: dict) -> Tuple[Check, Collect]:
+        children = [(key, *self._compile(value)) for key, value in properties.items()]
+        required = tuple(schema.get("required", ()))
+        additional = schema.get("additionalProperties", True)
+        known = frozenset(properties)
+        # required fields absent in properties are reported after the properties
+        not_described = tuple(key for key in required if key not in known)
+        additional_check, additional_collect = self._compile(additional)
+
+        def check(value):
+            if value.__class__ is not dict:
+                return True
+            for key in required:
+                if key not in value:
+                    return False
+            for key, child_check, _ in children:
+                child = value.get(key, _MISSING)
+                if child is not _MISSING and not child_check(child):
+                    return False
+            if additional is not True:
+                for key, child in value.items():
+                    if key not in known and not additional_check(child):
+                        return False
+            return True
+
+        def collect(value, path, errors):
+            if value.__class__ is not dict:
+                return
+            for key, child_check, child_collect in children:
+                child = value.get(key, _MISSING)
+                if child is _MISSING:
+                    if key in required:
+                        errors.append((path + [key], "required", MISSING_FIELD_MESSAGE))
+                elif not child_check(child):
+                    child_collect(child, path + [key], errors)
+            for key in not_described:
+                if key not in value:
+                    errors.append((path + [key], "required", MISSING_FIELD_MESSAGE))
+            if additional is not True:
+                for key, child in value.items():
+                    if key not in known and not additional_check(child):
+                        additional_collect(child, path + [key], errors)
+        return check, collect
+
+    def _items(self, items: Any, schema: dict) -> Tuple[Check, Collect]:
+        if isinstance(items, list):
+            positions = [self._compile(item) for item in items]
+            additional_check, additional_collect = self._compile(schema.get("additionalItems", True))
+
+            def compiled_item(position):
+                return positions[position] if position < len(positions) else (additional_check, additional_collect)
+        else:
+            item_check, item_collect = self._compile(items)
+
+            def compiled_item(position):
+                return item_check, item_collect
+
+        def check(value):
+            if value.__class__ is not list:
+                return True
+            for position, item in enumerate(value):
+                if not compiled_item(position)[0](item):
+                    return False
+            return True
+
+        def collect(value, path, errors):
+            if value.__class__ is not list:
+                return
+            for position, item in enumerate(value):
+                item_check_, item_collect_ = compiled_item(position)
+                if not item_check_(item):
+                    item_collect_(item, path + [position], errors)
+        return check, collect
+
+    def _combination(name: str, passed: Callable[[int, int], bool]):
+        def compile_keyword(self, schemas, schema):
+            checks = [self._compile(item)[0] for item in ([schemas] if name == "not" else schemas)]
+            return self._keyword(name, lambda value: passed(sum(item(value) for item in checks), len(checks)),
+                                 None, "schema" if name == "not" else f"{len(checks)} schemas")
+        return compile_keyword
+
+    def _all_of(self, schemas: list, schema: dict) -> Tuple[Check, Collect]:
+        # errors of the nested schemas are reported with their paths
+        compiled = [self._compile(item) for item in schemas]
+        check = _all([item[0] for item in compiled])
+
+        def collect(value, path, errors):
+            for item_check, item_collect in compiled:
+                if not item_check(value):
+                    item_collect(value, path, errors)
+        return check, collect
+
+    # keywords are compiled in this order, so the type is checked first
+    _KEYWORDS = {
+        "type": _type,
+        "enum": _enum,
+        "const": _const,
+        "minimum": _number("minimum", lambda value, limit: value >= limit),
+        "maximum": _number("maximum", lambda value, limit: value <= limit),
+        "exclusiveMinimum": _number("exclusiveMinimum", lambda value, limit: value > limit),
+        "exclusiveMaximum": _number("exclusiveMaximum", lambda value, limit: value < limit),
+        "multipleOf": _multiple_of,
+        "minLength": _length("minLength", lambda length, limit: length >= limit, lambda value: value.__class__ is str),
+        "maxLength": _length("maxLength", lambda length, limit: length <= limit, lambda value: value.__class__ is str),
+        "pattern": _pattern,
+        "minItems": _length("minItems", lambda length, limit: length >= limit, lambda value: value.__class__ is list),
+        "maxItems": _length("maxItems", lambda length, limit: length <= limit, lambda value: value.__class__ is list),
+        "uniqueItems": _unique_items,
+        "minProperties": _length("minProperties", lambda length, limit: length >= limit,
+                                 lambda value: value.__class__ is dict),
+        "maxProperties": _length("maxProperties", lambda length, limit: length <= limit,
+                                 lambda value: value.__class__ is dict),
+        "properties": _properties,
+        "items": _items,
+        "allOf": _all_of,
+        "anyOf": _combination("anyOf", lambda passed, total: passed > 0),
+        "oneOf": _combination("oneOf", lambda passed, total: passed == 1),
+        "not": _combination("not", lambda passed, total: passed == 0),
+    }
+    del _number, _length, _combination
+
+
+def structure_to_schema(structure: Any, additional_properties: bool = True) -> Any:
+    """Converts typed structure to JSON Schema. See Schema.from_structure"""
+    if structure is SKIP:
+        return {}
+    if isinstance(structure, type):
+        if structure not in PYTHON_TYPES:
+            raise ValueError(f"Type {structure.__name__} is not supported in JSON structure")
+        return {"type": PYTHON_TYPES[structure]}
+    if isinstance(structure, dict):
+        schema = {"type": "object", "required": list(structure),
+                  "properties": {key: structure_to_schema(value, additional_properties)
+                                 for key, value in structure.items()}}
+        if not additional_properties:
+            schema["additionalProperties"] = False
+        return schema
+    if isinstance(structure, list):
+        schema = {"type": "array"}
+        if structure:
+            schema["items"] = structure_to_schema(structure[0], additional_properties)
+        return schema
+    return {"const": structure}
+
@@ -0,0 +1,239 @@
+import logging
+import threading
+from dataclasses import astuple
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from common._libs.helpers.singleton import Singleton, get_singleton_instance
+from common.config_parser.config_dto import APISettingsDTO
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionCounters:
+    """Thread-safe counters of requests sent and sockets opened through one pooled session.
+
+    The difference between them is the number of requests which reused an already opened keep-alive connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return self.requests - self.connections_opened
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"requests": self.requests, "connections_opened": self.connections_opened,
+                "reused_connections": self.reused_connections}
+
+
+def _counting_pool_class(pool_class, counters: ConnectionCounters):
+    """Creates urllib3 connection pool class which reports every new socket connection to counters"""
+    def _new_conn(self):
+        counters.count_connection()
+        return pool_class._new_conn(self)
+
+    return type(f"Counting{pool_class.__name__}", (pool_class,), dict(_new_conn=_new_conn))
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with connection reuse accounting.
+
+    Args:
+        counters (ConnectionCounters): Counters object to update on each request and new connection
+    """
+
+    def __init__(self, counters: ConnectionCounters, **kwargs):
+        self.counters = counters
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.counters),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.counters)}
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        # proxy managers are created without init_poolmanager, SOCKS proxy managers have their own pool classes
+        created = proxy not in self.proxy_manager
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if created:
+            manager.pool_classes_by_scheme = {
+                scheme: _counting_pool_class(pool_class, self.counters)
+                for scheme, pool_class in manager.pool_classes_by_scheme.items()}
+        return manager
+
+    def send(self, request, *args, **kwargs):
+        self.counters.count_request()
+        return super().send(request, *args, **kwargs)
+
+    def __setstate__(self, state):
+        # counters are not a part of HTTPAdapter.__attrs__ so need to be restored before pool manager init
+        self.counters = ConnectionCounters()
+        super().__setstate__(state)
+
+
+def _settings_key(api_settings: APISettingsDTO) -> Tuple:
+    return tuple(tuple(value) if isinstance(value, list) else value for value in astuple(api_settings))
+
+
+class _SettingsSingleton(Singleton):
+    """Singleton metaclass with one instance per settings object.
+
+    Call with settings returns the instance created for the equal settings and makes it the current one,
+    call without settings returns the current instance (created with the default settings if there is none).
+    delete_singleton_object removes the current instance together with the instances of all settings.
+    """
+    _by_settings = {}
+    _lock = threading.Lock()
+
+    def __call__(cls, api_settings: Optional[APISettingsDTO] = None):
+        with _SettingsSingleton._lock:
+            current = get_singleton_instance(cls)
+            if current is None:
+                _SettingsSingleton._by_settings.pop(cls.__name__, None)
+            elif api_settings is None:
+                return current
+            instances = _SettingsSingleton._by_settings.setdefault(cls.__name__, dict())
+            api_settings = api_settings or APISettingsDTO()
+            key = _settings_key(api_settings)
+            instance = instances.get(key)
+            if instance is None:
+                instance = instances[key] = type.__call__(cls, api_settings)
+            Singleton._instances[cls.__name__] = instance
+            return instance
+
+
+class SessionManager(metaclass=_SettingsSingleton):
+    """Keeps pooled keep-alive requests.Session objects shared by all endpoints.
+
+    Sessions are keyed by base URL and by the transport settings (TLS verification, client certificate, proxies
+    and default headers), so all endpoints with the same base URL reuse the same connection pool.
+    Pool size and retry/backoff policy are taken from the [api] config section.
+
+    There is one SessionManager for each settings object: SessionManager(settings) returns the manager of these
+    settings and makes it the current one, SessionManager() returns the current manager, so the settings passed
+    by the endpoint factory are not ignored if a manager with other settings was created earlier.
+
+    Examples:
+        session_manager = SessionManager(ConfigManager().get_api_settings())
+        session = session_manager.get_session("https://example.com/api/v1/")
+        session.request("get", "https://example.com/api/v1/users")
+        session_manager.connection_stats()
+        {'requests': 1, 'connections_opened': 1, 'reused_connections': 0}
+
+    Args:
+        api_settings (APISettingsDTO): settings from [api] config section. Defaults are used if not provided
+    """
+
+    def __init__(self, api_settings: Optional[APISettingsDTO] = None):
+        self.api_settings = api_settings or APISettingsDTO()
+        self._sessions: Dict[Tuple, requests.Session] = dict()
+        self._counters: Dict[Tuple, ConnectionCounters] = dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, dict):
+            return tuple(sorted((str(key), str(item)) for key, item in value.items()))
+        return value
+
+    def _make_key(self, base_url, verify, cert, proxies, headers, retries) -> Tuple:
+        return base_url, self._freeze(verify), self._freeze(cert), self._freeze(proxies), self._freeze(headers), \
+            retries
+
+    def _make_retry(self, retries: bool = True) -> Retry:
+        if not retries or not self.api_settings.max_retries:
+            # the same policy as requests uses by default
+            return Retry(0, read=False)
+        return Retry(total=self.api_settings.max_retries, backoff_factor=self.api_settings.backoff_factor,
+                     status_forcelist=self.api_settings.retry_status_codes or None, raise_on_status=False)
+
+    def _create_session(self, counters: ConnectionCounters, verify, cert, proxies, headers,
+                        retries: bool = True) -> requests.Session:
+        session = requests.Session()
+        adapter = CountingHTTPAdapter(counters, pool_connections=self.api_settings.pool_connections,
+                                      pool_maxsize=self.api_settings.pool_maxsize,
+                                      max_retries=self._make_retry(retries))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.verify = verify
+        session.cert = cert
+        # urllib3 adds br if brotli package is installed, compressed bodies are decompressed by urllib3
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        if proxies:
+            session.proxies.update(proxies)
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    def get_session(self, base_url: str, verify=None, cert=None, proxies: Optional[dict] = None,
+                    headers: Optional[dict] = None, retries: bool = True) -> requests.Session:
+        """Returns pooled session for the base URL and transport settings. Creates it on the first call
+
+        Args:
+            base_url (str): Base part of the HTTP URL. E.x: https://google.com/api/v1/
+            verify (bool|str): TLS verification flag or CA bundle path. verify_ssl config value by default
+            cert (str|tuple): Client certificate
+            proxies (dict): Proxies mapping. proxy config value is used for http and https by default
+            headers (dict): Default headers sent with each request of the session
+            retries (bool): If False - requests are sent once even if max_retries config value is set
+
+        Returns:
+            :requests.Session object
+        """
+        verify = self.api_settings.verify_ssl if verify is None else verify
+        if proxies is None and self.api_settings.proxy:
+            proxies = {"http": self.api_settings.proxy, "https": self.api_settings.proxy}
+        key = self._make_key(base_url, verify, cert, proxies, headers, retries)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    logger.debug(f"Create pooled HTTP session for '{base_url}'")
+                    counters = ConnectionCounters()
+                    session = self._create_session(counters, verify, cert, proxies, headers, retries)
+                    self._counters[key] = counters
+                    self._sessions[key] = session
+        return session
+
+    def connection_stats(self, base_url: Optional[str] = None) -> Dict[str, int]:
+        """Returns summary connection reuse counters for all sessions or for the sessions of the base URL
+
+        Args:
+            base_url (str): Base URL to filter sessions by. All sessions are counted if not provided
+
+        Returns:
+            :dict with 'requests', 'connections_opened' and 'reused_connections' values
+        """
+        result = ConnectionCounters()
+        for key, counters in list(self._counters.items()):
+            if base_url is None or key[0] == base_url:
+                result.requests += counters.requests
+                result.connections_opened += counters.connections_opened
+        return result.to_dict()
+
+    def close(self):
+        """Closes all sessions and their connection pools"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._counters.clear()
@@ -0,0 +1,258 @@
+import codecs
+import re
+from json.decoder import JSONDecodeError, JSONDecoder, scanstring
+from typing import Any, Iterable
+
+from common._rest_qa_api.rest_utils import SKIP
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+# text without brackets and complete strings, so brackets inside strings are not matched
+SKIPPED_TEXT = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL)
+LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None),
+            "N": ("NaN", float("nan")), "I": ("Infinity", float("inf")), "-": ("-Infinity", float("-inf"))}
+# the longest literal and a number of a usual length are read without extra buffer refills
+TOKEN_LOOKAHEAD = 32
+
+
+class StreamingJSONParser:
+    """Incremental JSON parser which builds only the parts of the document covered by the expected model.
+
+    Document is read chunk by chunk (E.x.: from requests.Response.iter_content), so the whole body text is never
+    kept in memory. Parsed part of the text buffer is dropped on each refill.
+
+    Pruning rules follow ResponseValidatorMixin validation rules, so validation of the pruned tree reports
+    the same errors as validation of the whole document:
+        subtrees marked as SKIP are not built, SKIP is set instead of them;
+        keys absent in the expected dict are not built;
+        elements of the list after the last element of the expected list are not built;
+        if expected value is not a non empty dict or list - the whole subtree is kept and decoded with json at once.
+
+    Skipped subtrees are not parsed, only brackets and strings are matched to find their end.
+
+    Args:
+        chunks (Iterable[bytes]): document bytes in chunks
+        encoding (str): document encoding
+        buffer_size (int): size of parsed text kept in buffer before it is dropped
+    """
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str = "utf-8", buffer_size: int = 65536):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer_size = buffer_size
+        self._buffer = ""
+        self._position = 0
+        # number of characters dropped from the buffer
+        self._offset = 0
+        self._eof = False
+        self._json_decoder = JSONDecoder()
+
+    def parse(self, model: Any = None) -> Any:
+        """Parses the whole document
+
+        Args:
+            model (Any): expected value the document is pruned by. The whole document is kept by default
+
+        Returns:
+            :parsed document
+
+        Raises:
+            :ValueError if document is not valid JSON
+        """
+        value = self._value(model)
+        if self._peek():
+            self._error("Extra data")
+        return value
+
+    def _error(self, message: str):
+        raise ValueError(f"{message}: char {self._offset + self._position}")
+
+    def _fill(self) -> bool:
+        """Reads next chunk into the buffer. Returns False if there is nothing to read"""
+        if self._eof:
+            return False
+        if self._position > self._buffer_size:
+            self._offset += self._position
+            self._buffer = self._buffer[self._position:]
+            self._position = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._eof = True
+        text = self._decoder.decode(b"", final=True)
+        self._buffer += text
+        return bool(text)
+
+    def _require(self, size: int):
+        while len(self._buffer) - self._position < size and self._fill():
+            pass
+
+    def _peek(self) -> str:
+        """Moves to the next non whitespace character and returns it. Returns empty string at the end of document"""
+        while True:
+            self._position = WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _value(self, model: Any) -> Any:
+        char = self._peek()
+        if model is SKIP:
+            self._skip_value(char)
+            return SKIP
+        if char == "{" and isinstance(model, dict) and model:
+            return self._object(model)
+        if char == "[" and isinstance(model, list) and model:
+            return self._array(model)
+        if char == "{" or char == "[":
+            return self._decode()
+        return self._scalar(char)
+
+    def _decode(self) -> Any:
+        """Decodes the whole container at once. Buffer is extended until the container is complete"""
+        while True:
+            try:
+                value, self._position = self._json_decoder.raw_decode(self._buffer, self._position)
+                return value
+            except JSONDecodeError as err:
+                if self._eof:
+                    self._position = err.pos
+                    self._error(err.msg)
+            # container is not complete in buffer, buffer size is doubled to keep parsing time linear
+            self._require(2 * (len(self._buffer) - self._position))
+
+    def _delimiter(self, closing: str) -> bool:
+        """Consumes ',' or closing bracket. Returns True if container is closed"""
+        char = self._peek()
+        if char == closing:
+            self._position += 1
+            return True
+        if char != ",":
+            self._error(f"Expecting ',' delimiter or '{closing}'")
+        self._position += 1
+        return False
+
+    def _object(self, model: Any) -> dict:
+        self._position += 1
+        result = {}
+        if self._peek() == "}":
+            self._position += 1
+            return result
+        while True:
+            if self._peek() != '"':
+                self._error("Expecting property name enclosed in double quotes")
+            key = self._string()
+            if self._peek() != ":":
+                self._error("Expecting ':' delimiter")
+            self._position += 1
+            if key in model:
+                result[key] = self._value(model[key])
+            else:
+                self._skip_value(self._peek())
+            if self._delimiter("}"):
+                return result
+
+    def _array(self, model: Any) -> list:
+        self._position += 1
+        result = []
+        if self._peek() == "]":
+            self._position += 1
+            return result
+        index = 0
+        while True:
+            if index < len(model):
+                result.append(self._value(model[index]))
+            else:
+                self._skip_value(self._peek())
+            index += 1
+            if self._delimiter("]"):
+                return result
+
+    def _string_end(self) -> int:
+        """Returns buffer index of the closing quote of the string started at the current position"""
+        # scanned length is relative to the string start, because the buffer may be shifted on refill
+        scanned = 1
+        while True:
+            end = STRING_BODY.match(self._buffer, self._position + scanned).end()
+            if end < len(self._buffer) and self._buffer[end] == '"':
+                return end
+            # string is not complete in buffer or it ends with a half of the escape sequence
+            scanned = end - self._position
+            if not self._fill():
+                self._error("Unterminated string")
+
+    def _string(self) -> str:
+        end = self._string_end()
+        try:
+            # closing quote is in buffer, so the string is decoded at once
+            value, _ = scanstring(self._buffer, self._position + 1)
+        except JSONDecodeError as err:
+            self._error(err.msg)
+        self._position = end + 1
+        return value
+
+    def _scalar(self, char: str) -> Any:
+        if char == '"':
+            return self._string()
+        self._require(TOKEN_LOOKAHEAD)
+        if char in LITERALS:
+            literal, value = LITERALS[char]
+            if self._buffer.startswith(literal, self._position):
+                self._position += len(literal)
+                return value
+        while True:
+            match = NUMBER.match(self._buffer, self._position)
+            # number may continue in the next chunk
+            if match is None or match.end() < len(self._buffer) or not self._fill():
+                break
+        if match is None:
+            self._error("Expecting value")
+        integer, fraction, exponent = match.groups()
+        self._position = match.end()
+        if fraction or exponent:
+            return float(integer + (fraction or "") + (exponent or ""))
+        return int(integer)
+
+    def _skip_value(self, char: str):
+        if char == '"':
+            self._position = self._string_end() + 1
+        elif char not in ("[", "{"):
+            self._scalar(char)
+        else:
+            depth = 0
+            while True:
+                self._position = SKIPPED_TEXT.match(self._buffer, self._position).end()
+                if self._position == len(self._buffer) or self._buffer[self._position] == '"':
+                    # string is not complete in buffer
+                    if not self._fill():
+                        self._error("Unterminated value")
+                    continue
+                char = self._buffer[self._position]
+                self._position += 1
+                depth += 1 if char in "[{" else -1
+                if depth == 0:
+                    return
+
+
+def parse_json_stream(chunks: Iterable[bytes], model: Any = None, encoding: str = "utf-8") -> Any:
+    """Parses JSON document from chunks and prunes it by the expected model. See StreamingJSONParser for details
+
+    Examples:
+        body = parse_json_stream(response.iter_content(chunk_size=65536), model.get_data)
+
+    Args:
+        chunks (Iterable[bytes]): document bytes in chunks
+        model (Any): expected value the document is pruned by. The whole document is kept by default
+        encoding (str): document encoding
+
+    Returns:
+        :parsed document
+
+    Raises:
+        :ValueError if document is not valid JSON
+    """
+    return StreamingJSONParser(chunks, encoding).parse(model)
@@ -0,0 +1,316 @@
+import base64
+import getpass
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from common._rest_qa_api.session_manager import SessionManager
+from common.config_parser.section.api_section import TRANSPORT_MODES
+
+if TYPE_CHECKING:
+    # to avoid import loop only for annotations
+    from common._rest_qa_api.auth import AuthProvider  # noqa
+
+logger = logging.getLogger(__name__)
+
+PASSTHROUGH, RECORD, REPLAY = TRANSPORT_MODES
+
+
+def _body_to_json(body) -> Optional[dict]:
+    if isinstance(body, str):
+        body = body.encode()
+    return {"base64": base64.b64encode(body).decode()} if isinstance(body, bytes) else None
+
+
+def _body_from_json(body: Optional[dict]) -> Optional[bytes]:
+    return base64.b64decode(body["base64"]) if body else None
+
+
+def default_cache_dir() -> str:
+    """Returns folder of the cached responses in the system temp folder. Folder name has the user id, so users of
+    the shared machine do not read the responses cached by the others
+    """
+    user_id = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(tempfile.gettempdir(), f"pycats_api_cache_{user_id}")
+
+
+def _make_private_dir(path: str):
+    """Creates the folder available to the current user only. Raises PermissionError if the existing folder
+    is owned by another user or is writable by the others
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return
+    folder = os.stat(path)
+    if folder.st_uid != os.getuid() or folder.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"Response cache folder {path} must be owned by the current user "
+                              f"and must not be writable by the others")
+
+
+class ResponseCache:
+    """On-disk cache of requests.Response objects.
+
+    Each response is kept in a separate JSON file named by the request key: status, headers, URL, the sent request
+    and base64 of the body, so the cache does not run any code from the files. File modification time is updated
+    on each read. Files are indexed by the last use time on the cache creation, the index is updated on each read
+    and write, so the least recently used files are removed without listing the folder when the number of entries
+    exceeds max_entries. Response is expired when it is older than ttl seconds.
+
+    Args:
+        cache_dir (str): Folder to keep the cached responses. Created if it does not exist
+        ttl (int): Time in seconds the cached response is valid for. 0 - never expires
+        max_entries (int): Max number of cached responses
+    """
+
+    FILE_EXTENSION = ".json"
+
+    def __init__(self, cache_dir: str, ttl: int = 3600, max_entries: int = 1000):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        self._index: 'OrderedDict[str, None]' = OrderedDict((key, None) for key in self._scan())
+
+    def _scan(self) -> List[str]:
+        """Returns keys of the cached files from the least to the most recently used"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.FILE_EXTENSION):
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.cache_dir, name)),
+                                    name[:-len(self.FILE_EXTENSION)]))
+                except OSError:
+                    continue
+        return [key for _, key in sorted(entries)]
+
+    @staticmethod
+    def make_key(request_kwargs: dict) -> str:
+        """Returns canonical hash of the request arguments built by BaseEndpoint
+
+        Args:
+            request_kwargs (dict): Arguments for requests.Session.request: method, url, params, headers, body, etc
+
+        Returns:
+            :str sha256 hex digest
+        """
+        request = {key: value for key, value in request_kwargs.items() if key != "stream"}
+        request["method"] = str(request.get("method", "")).upper()
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=repr)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.FILE_EXTENSION)
+
+    @staticmethod
+    def _to_json(response: requests.Response) -> dict:
+        request = response.request
+        return {
+            "stored_at": time.time(),
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "url": response.url,
+            "encoding": response.encoding,
+            "headers": dict(response.headers),
+            "content": _body_to_json(response.content),
+            "request": None if request is None else {
+                "method": request.method, "url": request.url, "headers": dict(request.headers),
+                "body": _body_to_json(request.body)},
+        }
+
+    @staticmethod
+    def _from_json(data: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = data["status_code"]
+        response.reason = data["reason"]
+        response.url = data["url"]
+        response.encoding = data["encoding"]
+        response.headers = CaseInsensitiveDict(data["headers"])
+        response._content = _body_from_json(data["content"])
+        response._content_consumed = True
+        if data["request"] is not None:
+            request = response.request = requests.PreparedRequest()
+            request.method = data["request"]["method"]
+            request.url = data["request"]["url"]
+            request.headers = CaseInsensitiveDict(data["request"]["headers"])
+            request.body = _body_from_json(data["request"]["body"])
+        return response
+
+    def get(self, key: str) -> Optional[requests.Response]:
+        """Returns cached response or None if it is absent or expired"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+            response = self._from_json(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            self._count(hit=False)
+            return None
+        if self.ttl and time.time() - data["stored_at"] > self.ttl:
+            self._remove(key)
+            self._count(hit=False)
+            return None
+        # mark as recently used, the file may be written by another process
+        os.utime(path)
+        with self._lock:
+            self._index[key] = None
+            self._index.move_to_end(key)
+        self._count(hit=True)
+        return response
+
+    def put(self, key: str, response: requests.Response) -> bool:
+        """Saves successful (2xx) response to the cache and removes least recently used responses if cache is full.
+        Other responses are not saved, so a server error is not replayed instead of sending the request again
+
+        Returns:
+            :True if the response is saved
+        """
+        if not 200 <= response.status_code < 300:
+            return False
+        path = self._path(key)
+        # write to the temporary file first, so concurrent readers never get a partial file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self._to_json(response), file)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._index[key] = None
+            self._index.move_to_end(key)
+            evicted = [self._index.popitem(last=False)[0] for _ in range(len(self._index) - self.max_entries)]
+        for old_key in evicted:
+            self._remove(old_key)
+        return True
+
+    def clear(self):
+        """Removes all cached responses"""
+        with self._lock:
+            self._index.clear()
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.FILE_EXTENSION):
+                self._remove(name[:-len(self.FILE_EXTENSION)])
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class _SessionManagerSingleton(type):
+    """Metaclass with one instance per SessionManager.
+
+    Call with the session manager returns the instance created for this manager, call without it returns
+    the instance of the current SessionManager, so endpoints of different settings do not share a transport.
+    Instance is removed together with its session manager.
+    """
+    _instances = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    def __call__(cls, session_manager: Optional[SessionManager] = None):
+        session_manager = session_manager or SessionManager()
+        with _SessionManagerSingleton._lock:
+            instances = _SessionManagerSingleton._instances.setdefault(session_manager, dict())
+            instance = instances.get(cls.__name__)
+            if instance is None:
+                instance = instances[cls.__name__] = type.__call__(cls, session_manager)
+            return instance
+
+
+class Transport(metaclass=_SessionManagerSingleton):
+    """Sends requests of all endpoints. Supports 3 modes set by transport_mode option of [api] config section:
+
+        passthrough - all requests are sent via pooled sessions of SessionManager;
+        record - requests are sent and the successful (2xx) responses are saved to the on-disk cache;
+        replay - cached responses are returned without sending the requests, missing responses are recorded.
+
+    Only requests with methods from cache_methods option are cached, streamed responses are never cached.
+    Cache folder is private to the user: pycats_api_cache_<user id> in the system temp folder by default.
+    Cache key is the hash of method, URL, params, headers and body of the request, see ResponseCache.make_key.
+    Auth data is added to the request after the cache key is computed, so cached responses do not depend
+    on the auth token and replayed requests do not need a token at all.
+    Endpoint may opt out of caching by use_response_cache = False attribute.
+    There is one Transport for each SessionManager, it is configured by the settings of the manager.
+
+    Examples:
+        transport = Transport(SessionManager())
+        response = transport.send("https://example.com/api/v1/", method="get",
+                                  url="https://example.com/api/v1/users")
+
+    Args:
+        session_manager (SessionManager): Manager of pooled sessions to send requests with.
+            Its api_settings are used for the transport configuration
+    """
+
+    def __init__(self, session_manager: Optional[SessionManager] = None):
+        self.session_manager = session_manager or SessionManager()
+        settings = self.session_manager.api_settings
+        self.mode = settings.transport_mode
+        self.cache_methods = settings.cache_methods
+        self.cache = None
+        if self.mode != PASSTHROUGH:
+            if not settings.cache_dir:
+                _make_private_dir(default_cache_dir())
+            self.cache = ResponseCache(settings.cache_dir or default_cache_dir(), settings.cache_ttl,
+                                       settings.cache_max_entries)
+
+    def is_cacheable(self, request_kwargs: dict, use_cache: bool) -> bool:
+        """Returns True if response of the request is saved to or returned from the cache in the current mode"""
+        return use_cache and self.cache is not None and not request_kwargs.get("stream") and \
+            str(request_kwargs.get("method", "")).lower() in self.cache_methods
+
+    def _request(self, base_url: str, auth: Optional['AuthProvider'], request_kwargs: dict,
+                 retries: bool = True) -> requests.Response:
+        if auth is not None:
+            request_kwargs = auth.apply(dict(request_kwargs))
+        return self.session_manager.get_session(base_url, retries=retries).request(**request_kwargs)
+
+    def send(self, base_url: str, use_cache: bool = True, auth: Optional['AuthProvider'] = None,
+             retries: bool = True, **request_kwargs) -> requests.Response:
+        """Sends request or returns the cached response according to the transport mode
+
+        Args:
+            base_url (str): Base part of the HTTP URL to select the pooled session
+            use_cache (bool): If False - request is sent without caching in any mode
+            auth (AuthProvider): Provider to add auth data to the sent request
+            retries (bool): If False - request is sent once without retries of max_retries config option
+            request_kwargs: Arguments for requests.Session.request
+
+        Returns:
+            :requests.Response object
+        """
+        if not self.is_cacheable(request_kwargs, use_cache):
+            return self._request(base_url, auth, request_kwargs, retries)
+        key = self.cache.make_key(request_kwargs)
+        if self.mode == REPLAY:
+            response = self.cache.get(key)
+            if response is not None:
+                logger.debug(f"Replay cached response for {request_kwargs.get('method')} {request_kwargs.get('url')}")
+                return response
+        response = self._request(base_url, auth, request_kwargs, retries)
+        self.cache.put(key, response)
+        return response
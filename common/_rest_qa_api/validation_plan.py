@@ -0,0 +1,210 @@
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+from common._rest_qa_api.rest_utils import SKIP
+from common._rest_qa_api.schema import Schema
+
+# Kinds of the plan nodes
+SKIP_NODE = 0
+DICT_NODE = 1
+LIST_NODE = 2
+LEAF_NODE = 3
+
+_PLANS_CACHE_SIZE = 1024
+_MISSING = object()
+
+
+class ValidationPlan:
+    """Flat validation plan compiled from the expected model tree.
+
+    Expected tree is walked only once. Each non empty dict or list of the tree is compiled to a plan step which keeps
+    its expected type and size, precomputed primitive values, keys of SKIP values (pruned from validation)
+    and keys of the nested containers with their step indexes.
+    Validation is performed in a single loop without recursion and without field path bookkeeping,
+    primitive values of a dict are compared with the response dict at once.
+
+    The plan is used as a fast path only: check() returns True when ResponseValidatorMixin._validate_structure would
+    find no errors and print no warnings. For any mismatch False is returned and the recursive validation is
+    executed to report the errors in the usual format.
+
+    The live expected tree is verified against the compiled one, so in place changes of the expected tree
+    are detected: check() returns None in this case and the plan should be recompiled.
+
+    Args:
+        expected (Any): expected model tree. E.x.: model.get_data
+    """
+
+    __slots__ = ("steps", "root_kind", "root")
+
+    def __init__(self, expected: Any):
+        self.steps: List[tuple] = []
+        self.root_kind = self._node_kind(expected)
+        self.root = self._compile(expected) if self.root_kind in (DICT_NODE, LIST_NODE) else expected
+
+    @staticmethod
+    def _node_kind(expected: Any) -> int:
+        if expected == SKIP:
+            return SKIP_NODE
+        if isinstance(expected, dict) and expected:
+            return DICT_NODE
+        if isinstance(expected, list) and expected:
+            return LIST_NODE
+        return LEAF_NODE
+
+    def _compile(self, expected: Any) -> int:
+        index = len(self.steps)
+        self.steps.append(None)
+        kind = self._node_kind(expected)
+        leaves, special_leaves, skipped, children = {}, [], [], []
+        for key, value in (expected.items() if kind == DICT_NODE else enumerate(expected)):
+            child_kind = self._node_kind(value)
+            if child_kind == SKIP_NODE:
+                skipped.append(key)
+            elif child_kind != LEAF_NODE:
+                children.append((key, self._compile(value)))
+            elif isinstance(value, (dict, Schema)):
+                # empty dict is not equal to the empty response dict according to the validation rules
+                special_leaves.append((key, value))
+            else:
+                leaves[key] = value
+        if kind == LIST_NODE:
+            # list of primitives is compared at once, otherwise element by element
+            leaves = list(leaves.values()) if len(leaves) == len(expected) else tuple(leaves.items())
+        self.steps[index] = (expected.__class__, kind, len(expected), leaves, tuple(special_leaves),
+                             tuple(skipped), tuple(children))
+        return index
+
+    @staticmethod
+    def _check_leaf(value: Any, expected: Any) -> bool:
+        if expected.__class__ is Schema:
+            return expected.expected is SKIP and expected.is_valid(value)
+        if isinstance(value, dict):
+            return False
+        if isinstance(value, list):
+            return not expected and not value
+        return expected == value
+
+    def check(self, data: Any, expected: Any, verify_expected: bool = True) -> Optional[bool]:
+        """Validates data against the expected tree
+
+        Args:
+            data (Any): data to verify
+            expected (Any): expected tree the plan was compiled from
+            verify_expected (bool): If False - the live expected tree is not compared with the compiled one.
+                Should be used only if the expected tree is known to be unchanged since the plan compilation,
+                E.x.: to validate many responses at once with the freshly compiled plan
+
+        Returns:
+            True if data matches expected tree, False if any mismatch is found or can not be excluded,
+            None if expected tree structure differs from the compiled one
+        """
+        if self.root_kind == SKIP_NODE:
+            return True if expected is SKIP or not verify_expected else None
+        if self.root_kind == LEAF_NODE:
+            return self._check_leaf(data, self.root) if expected is self.root or not verify_expected else None
+
+        steps = self.steps
+        stack = [(self.root, data, expected)]
+        while stack:
+            index, value, exp = stack.pop()
+            exp_class, kind, size, leaves, special_leaves, skipped, children = steps[index]
+            if verify_expected and (exp.__class__ is not exp_class or len(exp) != size):
+                return None
+
+            if kind == DICT_NODE:
+                if not isinstance(value, dict):
+                    if not verify_expected or isinstance(value, list) or not exp == value:
+                        return False
+                    continue
+                if not value:
+                    return False
+                # verify the live expected tree has the same values as compiled and compare them with response
+                if verify_expected and not leaves.items() <= exp.items():
+                    return None
+                if not leaves.items() <= value.items():
+                    return False
+                for key in skipped:
+                    if verify_expected and exp.get(key) is not SKIP:
+                        return None
+                    if key not in value:
+                        return False
+                for key, leaf in special_leaves:
+                    if verify_expected and exp.get(key) is not leaf:
+                        return None
+                    if key not in value or not self._check_leaf(value[key], leaf):
+                        return False
+                for key, child in children:
+                    child_exp = exp.get(key, _MISSING) if verify_expected else None
+                    if child_exp is _MISSING:
+                        return None
+                    child_value = value.get(key, _MISSING)
+                    if child_value is _MISSING:
+                        return False
+                    stack.append((child, child_value, child_exp))
+            else:
+                if not isinstance(value, list):
+                    if not verify_expected or isinstance(value, dict) or not exp == value:
+                        return False
+                    continue
+                if len(value) < size:
+                    return False
+                # all positions are present in both lists after the size checks
+                if leaves.__class__ is list:
+                    if verify_expected and exp != leaves:
+                        return None
+                    if value[:size] != leaves:
+                        return False
+                else:
+                    for position, leaf in leaves:
+                        if verify_expected and exp[position] != leaf:
+                            return None
+                        if not leaf == value[position]:
+                            return False
+                if verify_expected:
+                    for position in skipped:
+                        if exp[position] is not SKIP:
+                            return None
+                for position, leaf in special_leaves:
+                    if verify_expected and exp[position] is not leaf:
+                        return None
+                    if not self._check_leaf(value[position], leaf):
+                        return False
+                for position, child in children:
+                    stack.append((child, value[position], exp[position] if verify_expected else None))
+        return True
+
+
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def get_validation_plan(model_class: type, field_name: str, expected: Any) -> ValidationPlan:
+    """Returns plan compiled for the expected tree of the model field. Plan is compiled on the first use and cached
+    per model class, field and expected value object
+
+    Args:
+        model_class (type): BaseResponseModel subclass
+        field_name (str): name of the validated field. E.x.: get_data
+        expected (Any): expected value of the field
+
+    Returns:
+        :ValidationPlan object
+    """
+    key = (model_class, field_name, id(expected))
+    cached = _plans.get(key)
+    # cache keeps a reference to the expected object, so its id can not be reused while entry is present
+    if cached is not None and cached[0] is expected:
+        return cached[1]
+    plan = ValidationPlan(expected)
+    with _plans_lock:
+        _plans[key] = (expected, plan)
+        while len(_plans) > _PLANS_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+def invalidate_validation_plan(model_class: type, field_name: str, expected: Any):
+    """Removes cached plan, so it will be recompiled on the next use"""
+    with _plans_lock:
+        _plans.pop((model_class, field_name, id(expected)), None)
@@ -1,10 +1,12 @@
 import time
 import logging
-from typing import Optional, Union, Dict
+from typing import Optional, Union, Dict, List, Sequence
 
 from selenium.webdriver import ActionChains
 from selenium.common.exceptions import NoSuchElementException
 
+from common._libs.helpers.waiters import poll_until
+from common._webdriver_qa_api.core import browser_waits, element_queries
 from common._webdriver_qa_api.core.utils import assert_should_be_equal, assert_should_be_not_equal, \
     assert_should_contain, assert_should_not_contain, assert_should_be_greater_than, get_wait_seconds
 from common._webdriver_qa_api.core.selenium_dynamic_elements import DynamicElement, DynamicElements
@@ -18,18 +20,29 @@ WebDriverType = Optional[Union[WebDriver, MobileDriver]]
 
 class BaseElement:
 
-    def __init__(self, locator_type, locator, web_driver: WebDriverType, name=None, parent=None):
+    def __init__(self, locator_type, locator, web_driver: WebDriverType, name=None, parent=None,
+                 cache_ttl: TimeoutType = None):
+        """
+        :param cache_ttl: seconds to reuse found WebElement handle, 0 - find element on each access.
+            element_cache_ttl option of [web] config section by default
+        """
         self.locator_type = locator_type
         self.locator = locator
+        self.web_driver = web_driver
         self.driver = web_driver.driver
         self.parent = parent
         self.name = locator if name is None else name
         self.ALLOWED_DYNAMIC_METHODS = None
+        self.config = web_driver.config
+        # mobile settings have no element cache and explicit waits options
+        if cache_ttl is None:
+            cache_ttl = getattr(self.config, "element_cache_ttl", 0)
+        self.explicit_waits = getattr(self.config, "explicit_waits", False)
         self.element = DynamicElement(locator_type=locator_type,
                                       locator=locator,
                                       driver=self.driver, name=name,
-                                      parent=parent)
-        self.config = web_driver.config
+                                      parent=parent, cache_ttl=cache_ttl,
+                                      find_timeout=self.config.implicit_wait_time if self.explicit_waits else 0)
 
     def __getattr__(self, item):
         if self.ALLOWED_DYNAMIC_METHODS is not None:
@@ -132,6 +145,8 @@ class BaseElement:
         """
         :return: true if element is present, false if element is absent
         """
+        # presence is always checked with the find command, not with the cached handle
+        self.element.invalidate_cache()
         try:
             self.element()
         except NoSuchElementException:
@@ -142,6 +157,9 @@ class BaseElement:
         """
         :return: true if element is present, false if element is absent
         """
+        if self.explicit_waits:
+            # implicit wait is 0 for the whole session, so find_elements does not wait
+            return bool(self.element.find_without_waiting())
         try:
             self.driver.implicitly_wait(0)
             return self.is_present()
@@ -154,6 +172,8 @@ class BaseElement:
 
         :param timeout: number of seconds after which test will fail if element is absent.
         """
+        if self.explicit_waits:
+            return poll_until(self.element.find_without_waiting, bool, timeout)[0]
         try:
             self.driver.implicitly_wait(timeout)
             return self.is_present()
@@ -189,11 +209,8 @@ class BaseElement:
         second = get_wait_seconds(timeout, self.config)
 
         logger.info("Wait for '{0}' absent in {1} seconds".format(self.name, 0 if not second else second))
-        end_time = time.time() + second
-        present = True
-        while time.time() < end_time and present:
-            present = self.is_present_without_waiting()
-            time.sleep(0.1)
+        self._wait_condition(browser_waits.ABSENT, self.is_present_without_waiting, lambda present: not present,
+                             second)
         self.assert_present(is_present=False)
 
     def wait_element_enabled(self, timeout: TimeoutType = None):
@@ -242,9 +259,8 @@ class BaseElement:
         logger.info(f"Wait for '{self.name}' contains following text: '{expected}' "
                     f"in '{second}' seconds")
 
-        end_time = time.time() + second
-        while time.time() < end_time and expected not in self.element.text:
-            time.sleep(0.2)
+        self._wait_condition(browser_waits.TEXT_CONTAINS, lambda: self.element.text, lambda text: expected in text,
+                             second, expected)
         self.assert_element_contains_text(expected)
 
     def wait_element_does_not_contain_text(self, expected: str, timeout: TimeoutType = None):
@@ -257,11 +273,38 @@ class BaseElement:
         logger.info(f"Wait for '{self.name}' does not contain following text: '{expected}' "
                     f"in '{second}' seconds")
 
-        end_time = time.time() + second
-        while time.time() < end_time and expected in self.element.text:
-            time.sleep(0.2)
+        self._wait_condition(browser_waits.TEXT_NOT_CONTAINS, lambda: self.element.text,
+                             lambda text: expected not in text, second, expected)
         self.assert_element_should_not_contain_text(expected)
 
+    def _switch_to_frame(self):
+        """
+        switch to the frame of the element before the commands sent without the element (E.x.: scripts),
+        the element is on the main page, WebElement switches to its frame
+        """
+
+    def _wait_condition(self, condition: str, getter, predicate, timeout: Union[int, float], expected: str = None):
+        """
+        wait for the condition of the element in the browser (see browser_waits.wait_in_browser) and check it
+        with getter, so the result is the same as WebDriver returns (E.x.: text of hidden element).
+        Getter is polled with the backoff till timeout if the browser wait is not supported (E.x.: mobile driver)
+        :param condition: browser_waits condition
+        :param getter: function to get checked value of the element
+        :param predicate: condition of the getter value
+        """
+        end_time = time.monotonic() + timeout
+        if isinstance(self.web_driver, WebDriver) and browser_waits.browser_locator(self.locator_type,
+                                                                                      self.locator):
+            try:
+                root = self.parent.element() if self.parent is not None else None
+            except NoSuchElementException:
+                root = None
+            self._switch_to_frame()
+            if root is not None or self.parent is None:
+                browser_waits.wait_in_browser(self.driver, self.locator_type, self.locator, condition, timeout,
+                                              root=root, expected=expected)
+        poll_until(getter, predicate, max(end_time - time.monotonic(), 0))
+
     def get_element_text(self) -> str:
         """
         find element and get it's text
@@ -270,6 +313,30 @@ class BaseElement:
         logger.info(f"Get text of element '{self.name}'")
         return self.element.text
 
+    def get_element_state(self, fields: Sequence[str] = (element_queries.DISPLAYED, element_queries.ENABLED),
+                          attributes: Sequence[str] = ()) -> Optional[dict]:
+        """
+        get presence and state of the element in one script call instead of a command for each property
+        (see element_queries.query_locators), mobile driver gets the state with WebDriver commands
+        :param fields: element properties: text | displayed | enabled | rect | tag_name
+        :param attributes: names of the attributes, returned in "attributes" dict of the element state
+        :return: element state, E.x.: {"displayed": True, "enabled": False}, None if element is absent
+        """
+        # WebElement switches to the frame of the element on access
+        dynamic_element = self.element
+        if not isinstance(self.web_driver, WebDriver):
+            try:
+                return element_queries.element_state(dynamic_element(), fields, attributes)
+            except NoSuchElementException:
+                return None
+        if self.parent is None:
+            return element_queries.query_locators(self.driver, {self.name: (self.locator_type, self.locator)},
+                                                  fields, attributes)[self.name]
+        try:
+            return element_queries.query_elements(self.driver, [dynamic_element()], fields, attributes)[0]
+        except NoSuchElementException:
+            return None
+
     def get_element_location(self) -> Dict[int, str]:
         """
         find element and get it's location
@@ -293,24 +360,72 @@ class BaseElements:
     def __init__(self, locator_type, locator, web_driver, name=None, parent=None):
         self.locator_type = locator_type
         self.locator = locator
+        self.web_driver = web_driver
         self.driver = web_driver.driver
+        explicit_waits = getattr(web_driver.config, "explicit_waits", False)
         self.elements = DynamicElements(locator_type=locator_type,
                                         locator=locator,
                                         driver=self.driver,
                                         name=name,
-                                        parent=parent)
+                                        parent=parent,
+                                        find_timeout=web_driver.config.implicit_wait_time if explicit_waits else 0)
 
     def assert_elements_number_greater_than(self, expected):
         actual = len(self.elements())
         assert_should_be_greater_than(actual, expected)
 
-    def get_elements_text(self):
+    def get_elements_state(self, fields: Sequence[str] = (element_queries.TEXT,),
+                           attributes: Sequence[str] = ()) -> List[dict]:
+        """
+        find elements and get their state in one script call (see element_queries.query_elements),
+        mobile driver gets the state of each element with WebDriver commands
+        :param fields: element properties: text | displayed | enabled | rect | tag_name
+        :param attributes: names of the attributes, returned in "attributes" dict of the element state
+        :return: list of the element states, E.x.: [{"text": "Row 1", "attributes": {"class": "row"}}]
+        """
+        elements = self.elements.selenium_element
+        if isinstance(self.web_driver, WebDriver):
+            return element_queries.query_elements(self.driver, elements, fields, attributes)
+        return [element_queries.element_state(element, fields, attributes) for element in elements]
+
+    def get_elements_text(self) -> List[str]:
         """
         find elements and get it's text
         :return: list of the text of element
         """
         return [element.text for element in self.elements.selenium_element]
 
+    def get_elements_rendered_text(self) -> List[str]:
+        """
+        find elements and get their text in one script call instead of a command for each element.
+        Text is innerText of the displayed element computed in the browser (see element_queries.query_elements),
+        it may differ from WebDriver text in whitespace, get_elements_text returns WebDriver text
+        :return: list of the text of element, empty for hidden elements
+        """
+        return [state[element_queries.TEXT] for state in self.get_elements_state((element_queries.TEXT,))]
+
+    def get_elements_attribute(self, attribute: str) -> list:
+        """
+        find elements and get value of the attribute
+        :return: list of the attribute values of the elements
+        """
+        return [state["attributes"][attribute] for state in self.get_elements_state((), (attribute,))]
+
+    def get_elements_visibility(self) -> List[bool]:
+        """
+        find elements and check are they displayed in one script call. Visibility is computed in the browser
+        and may differ from WebElement.is_displayed (see element_queries.query_elements)
+        :return: list of the visibility of the elements
+        """
+        return [state[element_queries.DISPLAYED] for state in self.get_elements_state((element_queries.DISPLAYED,))]
+
+    def get_elements_rects(self) -> List[Dict[str, float]]:
+        """
+        find elements and get their location and size
+        :return: list of the rects in format: {'x': 8, 'y': 40, 'width': 600, 'height': 20}
+        """
+        return [state[element_queries.RECT] for state in self.get_elements_state((element_queries.RECT,))]
+
     def get_elements(self):
         """
         find elements and get it's text
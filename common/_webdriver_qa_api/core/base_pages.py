@@ -1,9 +1,10 @@
-import time
 import logging
 from typing import Union, Optional
 
+from common._libs.helpers.waiters import poll_until
 from common._webdriver_qa_api.core.utils import assert_should_be_equal
 from common._webdriver_qa_api.core.base_elements import BaseElement
+from common._webdriver_qa_api.core.selenium_dynamic_elements import invalidate_element_cache
 from common._webdriver_qa_api.mobile.mobile_driver import MobileDriver
 from common._webdriver_qa_api.web.web_driver import WebDriver
 
@@ -41,15 +42,8 @@ class BasePage:
         Get page initial element and return True if element present
         """
         logger.info(f"Check is page '{self.name}' present in {second} seconds")
-        end_time = time.time() + second
-        present_status = False
-        while time.time() < end_time and not present_status:
-            present_status = BaseElement(self.locator_type,
-                                         self.locator,
-                                         self.web_driver,
-                                         self.name).is_present_without_waiting()
-            time.sleep(0.1)
-        return present_status
+        page_element = BaseElement(self.locator_type, self.locator, self.web_driver, self.name)
+        return poll_until(page_element.is_present_without_waiting, bool, second)[0]
 
     def refresh_page(self):
         """
@@ -57,8 +51,10 @@ class BasePage:
         """
         logger.info("Refresh current page")
         self.driver.refresh()
+        invalidate_element_cache(self.driver)
         self.assert_page_present()
 
     def navigate_to(self, url: str):
         logger.info(f"Going to {url}")
         self.driver.get(url)
+        invalidate_element_cache(self.driver)
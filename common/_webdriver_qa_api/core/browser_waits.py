@@ -0,0 +1,118 @@
+import logging
+import math
+import time
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+PRESENT = "present"
+ABSENT = "absent"
+TEXT_CONTAINS = "text_contains"
+TEXT_NOT_CONTAINS = "text_not_contains"
+
+# browser wait is split into the parts shorter than the default script timeout of WebDriver (30 seconds)
+MAX_SCRIPT_WAIT = 10.0
+
+_WAIT_SCRIPT = """
+var using = arguments[0], locator = arguments[1], root = arguments[2] || document, condition = arguments[3],
+    expected = arguments[4], timeout = arguments[5], done = arguments[arguments.length - 1];
+var finished = false, observer = null, timer = null;
+function find() {
+    if (using === "xpath") {
+        return document.evaluate(locator, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return root.querySelector(locator);
+}
+function text(element) {
+    return element.innerText === undefined ? element.textContent : element.innerText;
+}
+function check() {
+    var element = find();
+    switch (condition) {
+        case "present": return element !== null;
+        case "absent": return element === null;
+        case "text_contains": return element !== null && text(element).indexOf(expected) !== -1;
+        case "text_not_contains": return element === null || text(element).indexOf(expected) === -1;
+    }
+    throw new Error("Unknown condition " + condition);
+}
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer !== null) observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+if (check()) {
+    finish(true);
+} else {
+    observer = new MutationObserver(function () { if (check()) finish(true); });
+    observer.observe(root === document ? document.documentElement : root,
+                     {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setTimeout(function () { finish(check()); }, timeout);
+}
+"""
+
+
+def _css_string(value: str) -> str:
+    return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+
+
+def browser_locator(locator_type: str, locator: str) -> Optional[tuple]:
+    """Returns (using, locator) of the wait script: xpath or css selector, None if locator can not be found by
+    the script (E.x.: link text or mobile locators)
+    """
+    if locator_type == By.XPATH:
+        return "xpath", locator
+    if locator_type == By.CSS_SELECTOR:
+        return "css", locator
+    if locator_type == By.ID:
+        return "css", f"[id={_css_string(locator)}]"
+    if locator_type == By.NAME:
+        return "css", f"[name={_css_string(locator)}]"
+    if locator_type == By.CLASS_NAME:
+        return "css", f".{locator}"
+    if locator_type == By.TAG_NAME:
+        return "css", locator
+    return None
+
+
+def wait_in_browser(driver, locator_type: str, locator: str, condition: str, timeout: float,
+                    root=None, expected: str = None) -> Optional[bool]:
+    """Waits for the condition of the element in the browser: one asynchronous script with MutationObserver
+    resolves as soon as the page changes so that the condition holds, no commands are sent while waiting.
+
+    Examples:
+        wait_in_browser(driver, By.ID, "spinner", ABSENT, timeout=10)
+
+    Args:
+        driver: selenium WebDriver
+        locator_type (str): Type of the locator, selenium By value
+        locator (str): Locator of the element
+        condition (str): PRESENT | ABSENT | TEXT_CONTAINS | TEXT_NOT_CONTAINS
+        timeout (float): Seconds to wait for the condition
+        root: WebElement to look for the element in, the whole document if not set
+        expected (str): Text of the text conditions
+
+    Returns:
+        :condition result after the wait or None if it can not be checked in the browser (E.x.: unsupported
+            locator or the script failed), the caller has to poll the condition then
+    """
+    script_locator = browser_locator(locator_type, locator)
+    if script_locator is None:
+        return None
+    using, selector = script_locator
+    deadline = time.monotonic() + (timeout or 0)
+    while True:
+        wait = min(max(deadline - time.monotonic(), 0), MAX_SCRIPT_WAIT)
+        try:
+            result = driver.execute_async_script(_WAIT_SCRIPT, using, selector, root, condition, expected,
+                                                 math.ceil(wait * 1000))
+        except WebDriverException as error:
+            logger.debug("Wait for %s of %s in the browser failed: %s", condition, locator, error)
+            return None
+        if result or time.monotonic() >= deadline:
+            return bool(result)
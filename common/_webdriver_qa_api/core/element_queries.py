@@ -0,0 +1,169 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from common._webdriver_qa_api.core.browser_waits import browser_locator
+
+TEXT = "text"
+DISPLAYED = "displayed"
+ENABLED = "enabled"
+RECT = "rect"
+TAG_NAME = "tag_name"
+FIELDS = (TEXT, DISPLAYED, ENABLED, RECT, TAG_NAME)
+
+Locator = Tuple[str, str]
+ElementState = Dict[str, object]
+
+_STATE_FUNCTION = """
+function displayed(element) {
+    if (!element.isConnected || element.getClientRects().length === 0) return false;
+    var style = window.getComputedStyle(element);
+    return style.visibility !== "hidden" && style.visibility !== "collapse" && style.opacity !== "0";
+}
+function attribute(element, name) {
+    var property = element[name];
+    var type = typeof property;
+    if (type === "string" || type === "number" || type === "boolean") return property;
+    return element.getAttribute(name);
+}
+function state(element, fields, attributes) {
+    var result = {}, isDisplayed = null;
+    for (var i = 0; i < fields.length; i++) {
+        var field = fields[i];
+        if (field === "displayed" || field === "text") {
+            if (isDisplayed === null) isDisplayed = displayed(element);
+            if (field === "displayed") result.displayed = isDisplayed;
+            else result.text = isDisplayed ? (element.innerText || "").replace(/\\u00a0/g, " ").trim() : "";
+        } else if (field === "enabled") {
+            result.enabled = !element.matches(":disabled");
+        } else if (field === "rect") {
+            var rect = element.getBoundingClientRect();
+            result.rect = {x: rect.left + window.pageXOffset, y: rect.top + window.pageYOffset,
+                           width: rect.width, height: rect.height};
+        } else if (field === "tag_name") {
+            result.tag_name = element.tagName.toLowerCase();
+        }
+    }
+    if (attributes.length) {
+        result.attributes = {};
+        for (var j = 0; j < attributes.length; j++) {
+            result.attributes[attributes[j]] = attribute(element, attributes[j]);
+        }
+    }
+    return result;
+}
+"""
+
+_ELEMENTS_SCRIPT = _STATE_FUNCTION + """
+var elements = arguments[0], fields = arguments[1], attributes = arguments[2];
+return elements.map(function (element) { return state(element, fields, attributes); });
+"""
+
+_LOCATORS_SCRIPT = _STATE_FUNCTION + """
+var locators = arguments[0], fields = arguments[1], attributes = arguments[2], all = arguments[3];
+function find(using, locator) {
+    if (using === "xpath") {
+        var found = document.evaluate(locator, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < (all ? found.snapshotLength : Math.min(found.snapshotLength, 1)); i++) {
+            nodes.push(found.snapshotItem(i));
+        }
+        return nodes;
+    }
+    return all ? Array.prototype.slice.call(document.querySelectorAll(locator))
+               : [document.querySelector(locator)].filter(function (node) { return node !== null; });
+}
+return locators.map(function (locator) {
+    var states = (locator.length === 2 ? find(locator[0], locator[1]) : locator[0]).map(function (element) {
+        return state(element, fields, attributes);
+    });
+    return all ? states : (states.length ? states[0] : null);
+});
+"""
+
+
+def _check_fields(fields: Sequence[str]) -> List[str]:
+    unknown = set(fields) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown element state fields {sorted(unknown)}, possible fields: {FIELDS}")
+    return list(fields)
+
+
+def query_elements(driver, elements: Sequence, fields: Sequence[str] = (TEXT,),
+                   attributes: Sequence[str] = ()) -> List[ElementState]:
+    """Collects state of the found elements in one execute_script call instead of a command for each element
+    and each property. Values are computed in the browser: text is innerText of the displayed element
+    (empty for the hidden one), enabled is false for the controls matching :disabled (including the ones
+    in a disabled fieldset), attribute is DOM property or attribute as WebElement.get_attribute returns.
+    displayed is an approximation of WebDriver is_displayed: the element is displayed if it has a layout box
+    and its own visibility and opacity do not hide it. Opacity of the ancestors and clipping by the overflow
+    of the ancestors are not checked, use WebElement.is_displayed where it matters.
+
+    Examples:
+        query_elements(driver, driver.find_elements(By.CSS_SELECTOR, "tr"), fields=("text", "rect"))
+        # [{"text": "Row 1", "rect": {"x": 8, "y": 40, "width": 600, "height": 20}}, ...]
+
+    Args:
+        driver: selenium WebDriver
+        elements (list): Selenium WebElements
+        fields (list): Element properties: text | displayed | enabled | rect | tag_name
+        attributes (list): Names of the attributes, returned in "attributes" dict of the element state
+
+    Returns:
+        :list of the element states in the order of the elements
+    """
+    if not elements:
+        return []
+    return driver.execute_script(_ELEMENTS_SCRIPT, list(elements), _check_fields(fields), list(attributes))
+
+
+def query_locators(driver, locators: Dict[str, Locator], fields: Sequence[str] = (TEXT,),
+                   attributes: Sequence[str] = (),
+                   all_matches: bool = False) -> Dict[str, Union[Optional[ElementState], List[ElementState]]]:
+    """Finds elements of many locators and collects their state in one execute_script call.
+    Elements of the locators which the script can not resolve (E.x.: link text) are found by WebDriver first.
+    See query_elements for the values of the fields.
+
+    Examples:
+        query_locators(driver, {"title": (By.ID, "title"), "rows": (By.CSS_SELECTOR, "tr")}, fields=("displayed",))
+        # {"title": {"displayed": True}, "rows": {"displayed": False}}
+
+    Args:
+        driver: selenium WebDriver
+        locators (dict): Names and (locator type, locator) of the elements
+        fields (list): Element properties: text | displayed | enabled | rect | tag_name
+        attributes (list): Names of the attributes, returned in "attributes" dict of the element state
+        all_matches (bool): Return states of all matching elements, state of the first element otherwise
+
+    Returns:
+        :name of the locator and the element state (None if the element is absent)
+            or list of the states of all matching elements
+    """
+    names, script_locators = [], []
+    for name, (locator_type, locator) in locators.items():
+        script_locator = browser_locator(locator_type, locator)
+        if script_locator is None:
+            found = driver.find_elements(locator_type, locator)
+            script_locator = [found if all_matches else found[:1]]
+        names.append(name)
+        script_locators.append(list(script_locator))
+    if not names:
+        return {}
+    states = driver.execute_script(_LOCATORS_SCRIPT, script_locators, _check_fields(fields), list(attributes),
+                                   all_matches)
+    return dict(zip(names, states))
+
+
+def element_state(element, fields: Sequence[str] = (TEXT,), attributes: Sequence[str] = ()) -> ElementState:
+    """Returns state of the element with WebDriver commands, the same dict as query_elements returns.
+    Used by the drivers which can not run scripts (E.x.: native mobile application)
+    """
+    getters = {
+        TEXT: lambda: element.text,
+        DISPLAYED: element.is_displayed,
+        ENABLED: element.is_enabled,
+        RECT: lambda: element.rect,
+        TAG_NAME: lambda: element.tag_name,
+    }
+    state = {field: getters[field]() for field in _check_fields(fields)}
+    if attributes:
+        state["attributes"] = {name: element.get_attribute(name) for name in attributes}
+    return state
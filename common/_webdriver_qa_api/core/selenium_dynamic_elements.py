@@ -1,17 +1,120 @@
+import json
 import logging
+import os
+import time
+import weakref
+from functools import wraps
+from typing import Dict, List
 
 from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
 
+from common._libs.helpers.singleton import Singleton
+from common._libs.helpers.waiters import poll_until
+
 logger = logging.getLogger(__name__)
 
+# number of navigations of each driver. Cached element handles found before the navigation are not used
+_navigations = weakref.WeakKeyDictionary()
+
+
+def invalidate_element_cache(driver):
+    """Invalidates cached element handles of all elements of the driver. Called on navigation, refresh and
+    switch to other window, so elements are found again on the new page
+    """
+    _navigations[driver] = _navigations.get(driver, 0) + 1
+
+
+class ElementCacheStats(metaclass=Singleton):
+    """Hits and misses of the cached element handles. Each hit is a find command not sent to WebDriver"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def reset(self) -> Dict[str, int]:
+        """Returns the counters and starts counting from zero. E.x.: at the start of each test"""
+        counters = dict(hits=self.hits, misses=self.misses, stale=self.stale)
+        self.hits = self.misses = self.stale = 0
+        return counters
+
+    def __str__(self):
+        return f"element cache hits {self.hits}, misses {self.misses}, stale handles {self.stale}"
+
+
+class ElementTrace(metaclass=Singleton):
+    """Structured trace of the interactions with the elements in the test: attribute reads and method calls
+    of WebElement with their durations and errors. Trace is disabled by default and element access path
+    does not pay for it, see --web_trace option.
+
+    Examples:
+        ElementTrace().start()
+        login_page.login_button.click()
+        ElementTrace().stop()   # [{"element": "login_button", "action": "click", "kind": "call", ...}]
+
+    Args:
+        max_records (int): Max number of records kept for the test, later records are counted as dropped
+    """
+    enabled = False
+
+    def __init__(self, max_records: int = 10000):
+        self.max_records = max_records
+        self.records: List[dict] = []
+        self.dropped = 0
+
+    def start(self):
+        self.records, self.dropped = [], 0
+        ElementTrace.enabled = True
+
+    def stop(self) -> List[dict]:
+        """Disables the trace and returns its records"""
+        ElementTrace.enabled = False
+        records, self.records = self.records, []
+        return records
+
+    def record(self, element: str, locator: str, action: str, kind: str, start: float, error: Exception = None):
+        duration = (time.perf_counter() - start) * 1000
+        if len(self.records) >= self.max_records:
+            self.dropped += 1
+            return
+        self.records.append(dict(timestamp=time.time(), element=element, locator=locator, action=action, kind=kind,
+                                 duration=round(duration, 3), error=type(error).__name__ if error else None))
+
+    def write(self, path: str, records: List[dict]):
+        """Writes records to the file as JSON lines"""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, default=str) + "\n")
+
 
 class DynamicElement:
-    def __init__(self, locator_type, locator, driver, name=None, parent=None):
+    """Proxy of selenium WebElement found by the locator on each access.
+
+    In cached mode (cache_ttl > 0) found WebElement handle is reused for cache_ttl seconds, so a chain of actions
+    with the element and elements of its parents sends one find command. Handle is found again
+    after cache_ttl seconds, after navigation (see invalidate_element_cache) and if it is stale:
+    the action failed with StaleElementReferenceException is retried once with the new handle.
+    See element_cache_ttl option of [web] config section and ElementCacheStats.
+
+    With find_timeout > 0 element is waited by polling find_elements command for find_timeout seconds,
+    it is used with implicit wait of the driver set to 0 (see explicit_waits option of [web] config section).
+    """
+
+    def __init__(self, locator_type, locator, driver, name=None, parent=None, cache_ttl: float = 0,
+                 find_timeout: float = 0):
         self.__driver = driver
         self.__locator_type = locator_type
         self.__locator = locator
         self.__name = locator if name is None else name
         self.__parent = parent
+        self.__cache_ttl = cache_ttl
+        self.__find_timeout = find_timeout
+        self.__handle = None
+        self.__handle_navigation = 0
+        self.__handle_expires = 0.0
 
     @property
     def name(self):
@@ -19,67 +122,169 @@ class DynamicElement:
 
     @property
     def selenium_element(self):
+        if not self.__cache_ttl:
+            return self.__find()
+        stats = ElementCacheStats()
+        navigation = _navigations.get(self.__driver, 0)
+        now = time.monotonic()
+        if self.__handle is not None and self.__handle_navigation == navigation and now < self.__handle_expires:
+            stats.hits += 1
+            return self.__handle
+        stats.misses += 1
+        self.__handle = self.__find()
+        self.__handle_navigation = navigation
+        self.__handle_expires = now + self.__cache_ttl
+        return self.__handle
+
+    def invalidate_cache(self) -> bool:
+        """Drops cached WebElement handle, so the element is found again on the next access
+
+        Returns:
+            :True if there was the cached handle
+        """
+        cached, self.__handle = self.__handle is not None, None
+        return cached
+
+    def __find(self):
         if self.__parent is None:
             try:
-                logger.debug(f"Looking for element {self.__locator}")
-                return self.__driver.find_element(self.__locator_type, self.__locator)
+                logger.debug("Looking for element %s", self.__locator)
+                return self.__find_in(self.__driver)
             except NoSuchElementException:
                 raise NoSuchElementException("An element '{0}' {1}could not be located on the page.".format(
                     self.__name, "" if self.__locator == self.__name else "with locator '{}' ".format(self.__locator)))
         else:
             try:
-                return self.__parent.element().find_element(self.__locator_type, self.__locator)
+                try:
+                    return self.__find_in(self.__parent.element())
+                except StaleElementReferenceException:
+                    # cached handle of the parent is stale, parent is found again
+                    if not self.__parent.element.invalidate_cache():
+                        raise
+                    ElementCacheStats().stale += 1
+                    return self.__find_in(self.__parent.element())
             except NoSuchElementException:
                 raise NoSuchElementException("An element '{0}' {1}for __parent '{2}' could not be located on the page.".format(
                     self.__name, "" if self.__locator == self.__name else "with locator '{}' ".format(self.__locator),
                     self.__parent.name))
 
-    def __log(self, item, attribute):
-        name = object.__getattribute__(self, "name")
+    def __find_in(self, context):
+        """Finds the element in the driver or in the parent WebElement"""
+        if not self.__find_timeout:
+            return context.find_element(self.__locator_type, self.__locator)
+        found, elements = poll_until(lambda: context.find_elements(self.__locator_type, self.__locator), bool,
+                                     self.__find_timeout)
+        if not found:
+            raise NoSuchElementException(f"Unable to locate element {self.__locator}")
+        return elements[0]
 
-        if callable(attribute):
-            logger.debug(f"Call method {item} in element {name}")
-        else:
-            logger.debug(f"get attribute {item} in element {name}")
+    def find_without_waiting(self) -> list:
+        """Returns WebElements of the locator found with one find_elements command for the element and for each
+        of its parents, without waiting and without the cached handle. Empty list if the element or its parent
+        is absent
+        """
+        if self.__parent is None:
+            return self.__driver.find_elements(self.__locator_type, self.__locator)
+        parents = self.__parent.element.find_without_waiting()
+        return parents[0].find_elements(self.__locator_type, self.__locator) if parents else []
+
+    def __retry_stale(self, item, method):
+        """Wraps method of the cached handle to retry it with the new handle if the cached one is stale"""
+        @wraps(method)
+        def call(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            except StaleElementReferenceException:
+                self.__invalidate_stale()
+                return getattr(self.selenium_element, item)(*args, **kwargs)
+        return call
+
+    def __invalidate_stale(self):
+        ElementCacheStats().stale += 1
+        self.__handle = None
 
     def __call__(self):
         return self.selenium_element
 
-    def __getattribute__(self, item):
-        attribute = object.__getattribute__(self, item)
-
-        if "_DynamicElement__" not in item:
-            object.__getattribute__(self, "_DynamicElement__log")(
-                item, attribute)
-            logger.debug(f"attribute getattribute {attribute} {item}")
+    def __getattr__(self, item):
+        # called only for attributes of WebElement, attributes of the proxy are looked up without any overhead
+        if ElementTrace.enabled:
+            return self.__traced_attribute(item)
+        attribute = self.__selenium_attribute(item)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s in element %s", "Call method" if callable(attribute) else "Get attribute",
+                         item, self.__name)
         return attribute
 
-    def __getattr__(self, item):
+    def __selenium_attribute(self, item):
         try:
             attribute = getattr(self.selenium_element, item)
         except StaleElementReferenceException:
+            if self.__cache_ttl:
+                self.__invalidate_stale()
             attribute = getattr(self.selenium_element, item)
-        object.__getattribute__(self, "_DynamicElement__log")(item, attribute)
-        logger.debug(f"attribute getattr {attribute}")
+        if self.__cache_ttl and callable(attribute):
+            attribute = self.__retry_stale(item, attribute)
         return attribute
 
+    def __traced_attribute(self, item):
+        """Returns WebElement attribute and records the access into ElementTrace. Method call is recorded
+        when it is made, with its own duration and error
+        """
+        trace = ElementTrace()
+        start = time.perf_counter()
+        try:
+            attribute = self.__selenium_attribute(item)
+        except Exception as error:
+            trace.record(self.__name, self.__locator, item, "get", start, error)
+            raise
+        if not callable(attribute):
+            trace.record(self.__name, self.__locator, item, "get", start)
+            return attribute
+
+        @wraps(attribute)
+        def call(*args, **kwargs):
+            call_start = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception as error:
+                trace.record(self.__name, self.__locator, item, "call", call_start, error)
+                raise
+            trace.record(self.__name, self.__locator, item, "call", call_start)
+            return result
+        return call
+
 
 class DynamicElements(DynamicElement):
     def __init__(self, locator_type, locator, driver, name=None,
-                 parent=None):
+                 parent=None, find_timeout: float = 0):
         self.parent = parent
         self.driver = driver
         self.locator_type = locator_type
         self.locator = locator
+        self.find_timeout = find_timeout
         super().__init__(locator_type, locator, driver, name=name,
-                         parent=parent)
+                         parent=parent, find_timeout=find_timeout)
 
     @property
     def selenium_element(self):
+        if not self.find_timeout:
+            return self.__find_all()
+        # waits for at least one element as find_elements does with implicit wait
+        return poll_until(self.__find_all, bool, self.find_timeout)[1]
+
+    def __find_all(self):
         if self.parent is None:
             return self.driver.find_elements(self.locator_type, self.locator)
         else:
-            return self.parent.element().find_elements(self.locator_type, self.locator)
+            try:
+                return self.parent.element().find_elements(self.locator_type, self.locator)
+            except StaleElementReferenceException:
+                # cached handle of the parent is stale, parent is found again
+                if not self.parent.element.invalidate_cache():
+                    raise
+                ElementCacheStats().stale += 1
+                return self.parent.element().find_elements(self.locator_type, self.locator)
 
     def __call__(self):
         return self.selenium_element
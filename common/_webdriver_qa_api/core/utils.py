@@ -5,6 +5,7 @@ from datetime import timedelta
 from operator import gt, lt, eq, ne, le, ge
 from typing import Union
 
+from common._libs.helpers.waiters import POLL_INITIAL_INTERVAL, POLL_MAX_INTERVAL, poll_until
 from common.config_parser.config_dto import WebDriverSettingsDTO, MobileDriverSettingsDTO
 
 logger = logging.getLogger(__name__)
@@ -19,9 +20,8 @@ def _smart_assert(actual, expected, comp_operator, msg=None, timeout=None, repea
     :param comp_operator: One of Comparison Operations function from operator package: [eq, ne, gt, lt, ge, le]
     :param msg: message that will be logged.
     :param timeout: time or value may change
-    :param repeats: number of repetitions to check,
-        used for calculate sleep time between attempts: where sleep_time = {timeout} / {repeats},
-         if not set - sleep time = 1 second
+    :param repeats: number of repetitions to check, used for calculate sleep time between attempts:
+        {timeout} / {repeats}. If not set - attempts start in milliseconds and sleep time grows to 0.25 seconds
     """
     operator_str = {
         eq: {"positive": "equal with", "negative": "not equal with"},
@@ -34,26 +34,21 @@ def _smart_assert(actual, expected, comp_operator, msg=None, timeout=None, repea
     op = operator_str[comp_operator]["positive"]
     nop = operator_str[comp_operator]["negative"]
 
-    start_time = time.time()
-    end_time = start_time + timeout if timeout else time.time() + 0.5
-    sleep_time = (end_time - start_time) / repeats if repeats else 1
-
     logger.info(msg if msg else "Assert: '{act}' {op} '{exp}'".format(
         act=f"result of '{actual.__name__}' execution" if callable(actual) else actual,
         op=op, exp=expected))
 
-    while time.time() < end_time:
-        act = actual() if callable(actual) else actual
-        if comp_operator(act, expected):
-            logger.info("\tAssertion passed in {s} seconds: {act} {op} {exp}".format(
-                s=int(time.time() - start_time), act=act, op=op, exp=expected))
-            break
-        elif time.time() + sleep_time + 0.5 < end_time:
-            logger.info("'{act}' {op} '{exp}', try again in {time} seconds".format(
-                act=act, op=nop, exp=expected, time=sleep_time))
-            time.sleep(sleep_time)
-        else:
-            fail_test("Assertion failed: '{act}' {op} '{exp}'".format(act=act, op=nop, exp=expected))
+    start_time = time.monotonic()
+    interval = timeout / repeats if timeout and repeats else None
+    passed, act = poll_until(lambda: actual() if callable(actual) else actual,
+                             lambda value: comp_operator(value, expected), timeout,
+                             initial_interval=interval or POLL_INITIAL_INTERVAL,
+                             max_interval=interval or POLL_MAX_INTERVAL)
+    if passed:
+        logger.info("\tAssertion passed in {s:.2f} seconds: {act} {op} {exp}".format(
+            s=time.monotonic() - start_time, act=act, op=op, exp=expected))
+    else:
+        fail_test("Assertion failed: '{act}' {op} '{exp}'".format(act=act, op=nop, exp=expected))
 
 
 def assert_should_be_equal(actual_value, expected_value, message=None, timeout=None, repeats=None):
@@ -98,24 +93,17 @@ def assert_should_contain(actual_value, expected_value, message=None, timeout=No
     """
     logger.info(message or f"Assert: '{actual_value}' contains in '{expected_value}'")
 
-    start_time = time.time()
-    end_time = start_time + timeout if timeout else time.time() + 0.5
-    sleep_time = (end_time - start_time) / 10
-
-    while time.time() < end_time:
-        act = actual_value() if callable(actual_value) else actual_value
-        exp = expected_value() if callable(expected_value) else expected_value
-        if act in exp:
-            logger.info(f"Assertion Passed: '{act}' in '{exp}'")
-            break
-        elif time.time() + sleep_time + 0.5 < end_time:
-            logger.info(f"There is no Actual value in expected: '{act}' not in '{exp}',"
-                        f" try again in {sleep_time} seconds")
-            time.sleep(sleep_time)
-        else:
-            fail_test(
-                "Assertion Failed: There is no Actual value in expected: '{0}' not in '{1}'".format(
-                    act, exp))
+    def _values():
+        return (actual_value() if callable(actual_value) else actual_value,
+                expected_value() if callable(expected_value) else expected_value)
+
+    passed, (act, exp) = poll_until(_values, lambda values: values[0] in values[1], timeout)
+    if passed:
+        logger.info(f"Assertion Passed: '{act}' in '{exp}'")
+    else:
+        fail_test(
+            "Assertion Failed: There is no Actual value in expected: '{0}' not in '{1}'".format(
+                act, exp))
 
 
 def assert_should_not_contain(actual_value, expected_value, message=None):
@@ -194,21 +182,14 @@ def assert_dict_should_contains(actual_value, expected_value, message=None, time
         # assume that subset is a plain value if none of the above match
         return subset == superset
 
-    start_time = time.time()
-    end_time = start_time + timeout if timeout else time.time() + 0.5
-    sleep_time = (end_time - start_time) / 10
-
     logger.info(message or f"Assert: '{actual_value}' in '{expected_value}'")
-    while time.time() < end_time:
-        act = actual_value() if callable(actual_value) else actual_value
-        if act and _is_subset(subset=expected_value, superset=act) is True:
-            logger.info(f"Assertion Passed: '{expected_value}' in '{act}'")
-            break
-        elif time.time() + sleep_time + 0.5 < end_time:
-            logger.info(f"Assertion failed: {act} not contain {expected_value}, try again in {sleep_time} seconds")
-            time.sleep(sleep_time)
-        else:
-            fail_test(f"Assertion Failed: '{expected_value}' not in '{actual_value}'")
+    passed, act = poll_until(lambda: actual_value() if callable(actual_value) else actual_value,
+                             lambda value: value and _is_subset(subset=expected_value, superset=value) is True,
+                             timeout)
+    if passed:
+        logger.info(f"Assertion Passed: '{expected_value}' in '{act}'")
+    else:
+        fail_test(f"Assertion Failed: '{expected_value}' not in '{actual_value}'")
 
 
 def fail_test(message):
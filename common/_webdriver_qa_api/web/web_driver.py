@@ -7,6 +7,7 @@ from selenium.webdriver import Remote, ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from common.config_parser.config_dto import WebDriverSettingsDTO
+from common._webdriver_qa_api.core.selenium_dynamic_elements import invalidate_element_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,8 @@ class WebDriver(metaclass=Singleton):
     def __init__(self, config: WebDriverSettingsDTO, driver=Remote):
         self.config = config
         self.driver = driver(**self._get_driver_settings(self.config))
-        self.driver.implicitly_wait(self.config.implicit_wait_time)
+        # in explicit waits mode elements are waited by PyCats, see DynamicElement find_timeout
+        self.driver.implicitly_wait(0 if self.config.explicit_waits else self.config.implicit_wait_time)
 
         self.action_chains = ActionChains(self.driver)
         self.driver_wait = WebDriverWait
@@ -62,7 +64,9 @@ def stop_webdriver_session():
 def navigate_to(url: str):
     """ Open {url} address in active webdriver session """
     logger.info(f"Navigate to {url}")
-    get_webdriver_session().driver.get(url)
+    driver = get_webdriver_session().driver
+    driver.get(url)
+    invalidate_element_cache(driver)
 
 
 def close_cookie_consent():
@@ -82,3 +86,4 @@ def switch_to_tab(tab_number=0):
     logger.info(f"Switch to tab - {tab_number}")
     driver = get_webdriver_session().driver
     driver.switch_to.window(driver.window_handles[tab_number])
+    invalidate_element_cache(driver)
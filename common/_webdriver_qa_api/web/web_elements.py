@@ -30,13 +30,16 @@ class WebElement(BaseElement):
         That allow to work with element inside frame containers.
         """
         if item == 'element':
-            if self.frame is not None:
-                frame_element = self.frame.element.selenium_element
-                self.driver.switch_to.frame(frame_element)
-            else:
-                self.driver.switch_to.default_content()
+            self._switch_to_frame()
         return super(WebElement, self).__getattribute__(item)
 
+    def _switch_to_frame(self):
+        if self.frame is not None:
+            frame_element = self.frame.element.selenium_element
+            self.driver.switch_to.frame(frame_element)
+        else:
+            self.driver.switch_to.default_content()
+
     def assert_element_placeholder(self, expected: str):
         """
         assert that element placeholder is equal to expected
@@ -1,4 +1,5 @@
-from common.config_parser.config_dto import APIValidationDTO, WebDriverSettingsDTO, MobileDriverSettingsDTO
+from common.config_parser.config_dto import APIValidationDTO, APISettingsDTO, WebDriverSettingsDTO, \
+    MobileDriverSettingsDTO
 from common.config_parser.config_parser import ParseConfig
 from common._libs.helpers.singleton import Singleton
 
@@ -21,12 +22,24 @@ class ConfigManager(metaclass=Singleton):
         return APIValidationDTO(settings.validate_status_code, settings.validate_headers,
                                 settings.validate_body, settings.validate_is_field_missing)
 
+    def get_api_settings(self) -> APISettingsDTO:
+        settings = self.config.api_settings()
+        return APISettingsDTO(settings.pool_connections, settings.pool_maxsize, settings.max_retries,
+                              settings.backoff_factor, settings.retry_status_codes, settings.verify_ssl,
+                              settings.proxy, settings.transport_mode, settings.cache_dir, settings.cache_ttl,
+                              settings.cache_max_entries, settings.cache_methods, settings.token_cache_file,
+                              settings.token_refresh_ahead, settings.conditional_requests,
+                              settings.conditional_cache_max_bytes, settings.rate_limit,
+                              settings.rate_limit_burst, settings.rate_limit_backend, settings.rate_limit_dir,
+                              settings.rate_limit_retries)
+
     def get_webdriver_settings(self) -> WebDriverSettingsDTO:
         settings = self.config.web_settings()
         return WebDriverSettingsDTO(settings.webdriver_folder, settings.default_wait_time,
                                     settings.implicit_wait_time, settings.selenium_server_executable,
                                     settings.chrome_driver_name, settings.firefox_driver_name, settings.browser,
-                                    settings.driver_path, settings.stop_server, settings.chrome_options)
+                                    settings.driver_path, settings.stop_server, settings.chrome_options,
+                                    settings.element_cache_ttl, settings.explicit_waits)
 
     def get_mobile_settings(self) -> MobileDriverSettingsDTO:
         settings = self.config.mobile_settings()
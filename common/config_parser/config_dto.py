@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 
 @dataclass
@@ -9,6 +10,31 @@ class APIValidationDTO:
     check_is_field_missing: bool
 
 
+@dataclass
+class APISettingsDTO:
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    max_retries: int = 0
+    backoff_factor: float = 0.0
+    retry_status_codes: List[int] = field(default_factory=list)
+    verify_ssl: bool = True
+    proxy: Optional[str] = None
+    transport_mode: str = 'passthrough'
+    cache_dir: Optional[str] = None
+    cache_ttl: int = 3600
+    cache_max_entries: int = 1000
+    cache_methods: List[str] = field(default_factory=lambda: ['get'])
+    token_cache_file: Optional[str] = None
+    token_refresh_ahead: int = 60
+    conditional_requests: bool = False
+    conditional_cache_max_bytes: int = 16777216
+    rate_limit: float = 0.0
+    rate_limit_burst: int = 1
+    rate_limit_backend: str = 'memory'
+    rate_limit_dir: Optional[str] = None
+    rate_limit_retries: int = 3
+
+
 @dataclass
 class WebDriverSettingsDTO:
     webdriver_folder: str
@@ -21,6 +47,8 @@ class WebDriverSettingsDTO:
     driver_path: str
     stop_server: bool
     chrome_options: list
+    element_cache_ttl: float = 0.0
+    explicit_waits: bool = False
 
 
 @dataclass
@@ -10,6 +10,7 @@ from typing import Optional
 
 from configparser import ConfigParser
 
+from common.config_parser.section.api_section import APISection
 from common.config_parser.section.api_validation_section import APIValidationSection
 from common.config_parser.section.base_section import ConfigSection
 from common.config_parser.config_error import ConfigError
@@ -29,6 +30,7 @@ class ParseConfig:
          config:                  ConfigParser object.
          global_settings:         GlobalSection/BaseGlobalSection object.
          api_validation_settings: APIValidationSection object
+         api_settings:            APISection object
          web_settings:            WebSection object
 
     Examples:
@@ -62,6 +64,7 @@ class ParseConfig:
 
         self.global_settings: Optional[GlobalSection] = None
         self.api_validation_settings: Optional[APIValidationSection] = None
+        self.api_settings: Optional[APISection] = None
         self._web_settings: Optional[WebSection] = None
         self._mobile_settings: Optional[MobileSection] = None
 
@@ -69,6 +72,7 @@ class ParseConfig:
 
         self._tune_global()
         self._tune_api_validations_section()
+        self._tune_api_section()
         self._tune_web_section()
         self._tune_mobile_section()
         self._tune_project_sections()
@@ -111,6 +115,10 @@ class ParseConfig:
         setattr(self, f"{APIValidationSection.SECTION_NAME}_settings",
                 APIValidationSection(self.config, self.custom_args))
 
+    def _tune_api_section(self):
+        setattr(self, f"{APISection.SECTION_NAME}_settings",
+                APISection(self.config, self.custom_args))
+
     def _tune_web_section(self):
         # if web section does not present in config files - treat it not used in the project
         try:
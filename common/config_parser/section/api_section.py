@@ -0,0 +1,100 @@
+from configparser import ConfigParser
+
+from common.config_parser.config_error import ConfigError
+from common.config_parser.section.base_section import ConfigSection
+
+
+TRANSPORT_MODES = ('passthrough', 'record', 'replay')
+RATE_LIMIT_BACKENDS = ('memory', 'file')
+
+
+class APISection(ConfigSection):
+    """Class responsible for api transport section parsing."""
+
+    SECTION_NAME = 'api'
+
+    def __init__(self, config, custom_args):
+        """Basic initialization."""
+        self.pool_connections = 10
+        self.pool_maxsize = 10
+        self.max_retries = 0
+        self.backoff_factor = 0.0
+        self.retry_status_codes = list()
+        self.verify_ssl = True
+        self.proxy = None
+        self.transport_mode = 'passthrough'
+        self.cache_dir = None
+        self.cache_ttl = 3600
+        self.cache_max_entries = 1000
+        self.cache_methods = ['get']
+        self.token_cache_file = None
+        self.token_refresh_ahead = 60
+        self.conditional_requests = False
+        self.conditional_cache_max_bytes = 16777216
+        self.rate_limit = 0.0
+        self.rate_limit_burst = 1
+        self.rate_limit_backend = 'memory'
+        self.rate_limit_dir = None
+        self.rate_limit_retries = 3
+        self.config: ConfigParser = config
+        self.custom_args = custom_args
+        self._settings = []
+
+        super().__init__(config, self.SECTION_NAME, custom_args=custom_args)
+
+    def _configure_section(self):
+        """Divide settings according to their types.
+        Set mandatory,comma separated list, space separated list, str,
+        bool, int, list of nodes fields if it is necessary.
+        """
+        self._mandatory_fields = []
+        self._str_fields = ['backoff_factor', 'proxy', 'transport_mode', 'cache_dir',
+                            'token_cache_file', 'rate_limit', 'rate_limit_backend', 'rate_limit_dir']
+        self._int_fields = ['pool_connections', 'pool_maxsize', 'max_retries', 'cache_ttl', 'cache_max_entries',
+                            'token_refresh_ahead', 'conditional_cache_max_bytes', 'rate_limit_burst',
+                            'rate_limit_retries']
+        self._bool_fields = ['verify_ssl', 'conditional_requests']
+        self._comma_separated_list_fields = ['retry_status_codes', 'cache_methods']
+        self._settings = self._str_fields + self._int_fields + self._bool_fields + self._comma_separated_list_fields
+
+    def _load_from_config(self):
+        """Add a section to initial config object if it absences to support optional logic for section and
+        execute default _load_from_config behaviour"""
+        try:
+            self.check_if_section_exists(self.config, self.SECTION_NAME, None)
+        except ConfigError:
+            self.config.add_section(self.SECTION_NAME)
+        super()._load_from_config()
+
+    def to_dict(self):
+        """Convert to dictionary."""
+        return {field: getattr(self, field, None) for field in self._settings}
+
+    def _perform_custom_tunings(self):
+        """Perform custom tunings for obtained settings."""
+        super()._perform_custom_tunings()
+        try:
+            self.backoff_factor = float(self.backoff_factor)
+            self.rate_limit = float(self.rate_limit)
+            self.retry_status_codes = [int(code) for code in self.retry_status_codes]
+        except ValueError as err:
+            raise ConfigError(f"Invalid numeric value in section '{self.SECTION_NAME}': {err}")
+        if self.proxy in ('', 'None'):
+            self.proxy = None
+        if self.cache_dir in ('', 'None'):
+            self.cache_dir = None
+        if self.token_cache_file in ('', 'None'):
+            self.token_cache_file = None
+        if self.rate_limit_dir in ('', 'None'):
+            self.rate_limit_dir = None
+        self.rate_limit_backend = self.rate_limit_backend.lower()
+        self.transport_mode = self.transport_mode.lower()
+        self.cache_methods = [method.lower() for method in self.cache_methods]
+
+    def _check_settings(self):
+        if self.transport_mode not in TRANSPORT_MODES:
+            raise ConfigError(f"Invalid transport_mode '{self.transport_mode}' in section '{self.SECTION_NAME}'. "
+                              f"Supported modes: {', '.join(TRANSPORT_MODES)}")
+        if self.rate_limit_backend not in RATE_LIMIT_BACKENDS:
+            raise ConfigError(f"Invalid rate_limit_backend '{self.rate_limit_backend}' in section "
+                              f"'{self.SECTION_NAME}'. Supported backends: {', '.join(RATE_LIMIT_BACKENDS)}")
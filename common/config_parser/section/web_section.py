@@ -28,6 +28,8 @@ class WebSection(ConfigSection):
         self.stop_server = True
         self.chrome_options = list()
         self.driver_path = None
+        self.element_cache_ttl = 0.0
+        self.explicit_waits = False
         self.config = config
         self.custom_args = custom_args
         self._settings = []
@@ -42,10 +44,10 @@ class WebSection(ConfigSection):
 
         self._mandatory_fields = ['webdriver_folder', 'chrome_driver_name']
         self._str_fields = ['webdriver_folder', 'selenium_server_executable', 'chrome_driver_name',
-                            'firefox_driver_name', 'browser']
+                            'firefox_driver_name', 'browser', 'element_cache_ttl']
         self._int_fields = ['default_wait_time', 'implicit_wait_time']
         self._comma_separated_list_fields = ['chrome_options']
-        self._bool_fields = ['stop_server']
+        self._bool_fields = ['stop_server', 'explicit_waits']
         self._settings = self._str_fields + self._int_fields + self._comma_separated_list_fields + self._bool_fields
 
     def to_dict(self):
@@ -58,6 +60,10 @@ class WebSection(ConfigSection):
     def _perform_custom_tunings(self):
         """Perform custom tunings for obtained settings."""
         super()._perform_custom_tunings()
+        try:
+            self.element_cache_ttl = float(self.element_cache_ttl)
+        except ValueError as err:
+            raise ConfigError(f"Invalid numeric value in section '{self.SECTION_NAME}': {err}")
 
     def _check_settings(self):
         """Check if webdriver settings are valid."""
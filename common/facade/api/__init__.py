@@ -2,3 +2,18 @@
 from common._rest_qa_api.base_endpoint import BaseEndpoint, endpoint_factory, BaseRequestModel, BaseResponseModel  # noqa
 from common._rest_qa_api import rest_checkers  # noqa
 from common._rest_qa_api.rest_utils import SKIP, pycats_dataclass  # noqa
+from common._rest_qa_api.session_manager import SessionManager  # noqa
+from common._rest_qa_api.async_executor import gather_endpoints, run_endpoints  # noqa
+from common._rest_qa_api.transport import Transport  # noqa
+from common._rest_qa_api.load_generator import LoadGenerator, run_load  # noqa
+from common._rest_qa_api.pagination import (Paginator, paginate, PagePagination, OffsetPagination,  # noqa
+                                            CursorPagination)
+from common._rest_qa_api.bulk_validator import BulkValidator, validate_responses  # noqa
+from common._rest_qa_api.auth import AuthProvider, StaticTokenAuth, TokenAuth, HMACAuth, TokenCache, Token  # noqa
+from common._rest_qa_api.instrumentation import Instrumentation, InstrumentationHook, MetricsCollector  # noqa
+from common._rest_qa_api.schema import Schema  # noqa
+from common._rest_qa_api.conditional_cache import ConditionalCache  # noqa
+from common._rest_qa_api.body_codecs import BodyCodec, register_codec, unregister_codec  # noqa
+from common._rest_qa_api.rate_limiter import RateLimiter, MemoryBackend, FileBackend  # noqa
+from common._rest_qa_api.har import HarRecorder, HarWriter  # noqa
+from common._rest_qa_api.contract_fuzzer import ContractFuzzer, RequestMutator, run_fuzz  # noqa
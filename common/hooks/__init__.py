@@ -1,5 +1,7 @@
 pytest_plugins = [
     "common.hooks.cli_options",
     "common.hooks.logger_hooks",
+    "common.hooks.instrumentation_hooks",
+    "common.hooks.webdriver_hooks",
     "common.hooks.pycats_hooks"
 ]
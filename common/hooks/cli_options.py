@@ -6,11 +6,14 @@ except ImportError:
     from _pytest.config import Parser
 
 API_URL = '--api_url'
+API_METRICS_REPORT = '--api_metrics_report'
+API_HAR = '--api_har'
 
 APP_URL = '--app_url'
 BROWSER = '--browser'
 DRIVER_PATH = '--driver_path'
 WEBDRIVER_FOLDER = '--webdriver_folder'
+WEB_TRACE = '--web_trace'
 
 CLI_ARGS = [BROWSER, WEBDRIVER_FOLDER]
 
@@ -19,6 +22,12 @@ def pytest_addoption(parser: Parser):
     api_group = parser.getgroup("api", after="web")
     api_group.addoption(API_URL,
                         help='Base URL of the application API')
+    api_group.addoption(API_METRICS_REPORT,
+                        help='Collect timings and sizes of API calls, log them per test and save the report '
+                             'to the file. CSV report for .csv file, JSON otherwise')
+    api_group.addoption(API_HAR, action='store_true', default=False,
+                        help='Write HTTP exchanges of the API calls with their timings to HAR file of each test '
+                             'next to the test log')
 
     web_group = parser.getgroup("web")
     web_group.addoption(APP_URL,
@@ -28,6 +37,9 @@ def pytest_addoption(parser: Parser):
                              'chrome | firefox')
     web_group.addoption(WEBDRIVER_FOLDER,
                         help='Path to folder with browser driver')
+    web_group.addoption(WEB_TRACE, action='store_true', default=False,
+                        help='Write interactions with the elements and their timings to JSON lines trace file '
+                             'of each test next to the test log')
 
 
 def get_cli_args(config, args):
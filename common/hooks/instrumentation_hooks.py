@@ -0,0 +1,54 @@
+import os
+
+from common.hooks.cli_options import API_HAR, API_METRICS_REPORT
+from common.pycats_facade import PyCatsFacade
+from common._libs.logger import PyCatsLogger
+from common._rest_qa_api.har import HarRecorder
+from common._rest_qa_api.instrumentation import Instrumentation, MetricsCollector
+
+_collector = None
+_har_recorder = None
+
+
+def pytest_configure(config):
+    """Start API metrics collection if report is requested and HAR recording if it is enabled"""
+    global _collector, _har_recorder
+    if config.getoption(API_METRICS_REPORT) and _collector is None:
+        _collector = MetricsCollector()
+        Instrumentation().add_hook(_collector)
+    if config.getoption(API_HAR) and _har_recorder is None:
+        _har_recorder = HarRecorder()
+        Instrumentation().add_hook(_har_recorder)
+
+
+def pytest_runtest_logstart(nodeid, location):
+    if _har_recorder:
+        Instrumentation().current_test = nodeid
+        # HAR file is named as the test log
+        _har_recorder.start_test(PyCatsLogger.test_file_path(location[2], ".har"))
+    if _collector:
+        Instrumentation().current_test = nodeid
+        # calls made outside of the tests are not included into the test metrics
+        _collector.finish_test()
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    if _collector:
+        for stats in _collector.finish_test():
+            PyCatsFacade().logger.info(f"API metrics: {stats}")
+    if _har_recorder:
+        path = _har_recorder.finish_test()
+        if path:
+            PyCatsFacade().logger.info(f"HAR file of the API calls: {path}")
+    Instrumentation().current_test = None
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if _collector:
+        path = session.config.getoption(API_METRICS_REPORT)
+        worker_input = getattr(session.config, "workerinput", None)
+        if worker_input:
+            # each pytest-xdist worker writes its own report: api_metrics.gw0.csv
+            name, extension = os.path.splitext(path)
+            path = f"{name}.{worker_input['workerid']}{extension}"
+        _collector.write_report(path)
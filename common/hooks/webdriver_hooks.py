@@ -0,0 +1,34 @@
+from common.hooks.cli_options import WEB_TRACE
+from common.pycats_facade import PyCatsFacade
+from common._libs.logger import PyCatsLogger
+from common._webdriver_qa_api.core.selenium_dynamic_elements import ElementCacheStats, ElementTrace
+
+_trace_enabled = False
+
+
+def pytest_configure(config):
+    global _trace_enabled
+    _trace_enabled = config.getoption(WEB_TRACE)
+
+
+def pytest_runtest_logstart(nodeid, location):
+    ElementCacheStats().reset()
+    if _trace_enabled:
+        ElementTrace().start()
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    """Log number of find commands saved by the element cache in the test and write element trace of the test"""
+    stats = ElementCacheStats()
+    if stats.hits or stats.misses:
+        PyCatsFacade().logger.info(f"WebDriver {stats}")
+    if _trace_enabled:
+        trace = ElementTrace()
+        dropped = trace.dropped
+        records = trace.stop()
+        if records:
+            # trace file is named as the test log
+            path = PyCatsLogger.test_file_path(location[2], ".trace.jsonl")
+            trace.write(path, records)
+            PyCatsFacade().logger.info(f"Element trace: {path}"
+                                       + (f", {dropped} records are dropped" if dropped else ""))
@@ -1,8 +1,11 @@
+import time
+
 import pytest
 
 from common._webdriver_qa_api.mobile.mobile_driver import MobileDriver
 from common._webdriver_qa_api.core.screenshot_manager import WebScreenShot, MobileScreenShot
 from common.facade import logger, raw_config, config_manager
+from common.facade.api import TokenCache, Token
 from common._webdriver_qa_api.web.web_driver import start_webdriver_session, stop_webdriver_session, navigate_to
 from common._webdriver_qa_api.core.remote_server import SeleniumServer, AppiumRemoteServer
 from sample.test_data.users import valid_user
@@ -10,6 +13,8 @@ from sample.web.steps.page_object_steps.pages.home import HomePageSteps
 from sample.web.steps.page_object_steps.pages.main import MainPageSteps
 from sample.web.steps.page_object_steps.pages.sign_in import SignInSteps
 
+API_TOKEN_TTL = 24 * 3600
+
 
 @pytest.fixture(scope="session", autouse=False)
 def start_remote_server(request):
@@ -38,23 +43,30 @@ def open_main_page(open_browser):
     navigate_to(raw_config.project_settings.web_app_url)
 
 
-@pytest.fixture(scope="module", autouse=False)
-def api_token(start_remote_server):
-    logger.log_step("Retrieve API token from UI", precondition=True)
-    try:
-        start_webdriver_session(config_manager.get_webdriver_settings())
-        navigate_to(raw_config.project_settings.web_app_url)
-        main_page = MainPageSteps()
-        main_page.click_sign_in()
-
-        login_steps = SignInSteps()
-        login_steps.login(email=valid_user.email, password=valid_user.password)
-
-        home_steps = HomePageSteps()
-        api_key = home_steps.get_api_key()
-    finally:
-        stop_webdriver_session()
-    return api_key
+@pytest.fixture(scope="session", autouse=False)
+def api_token(request):
+    logger.log_step("Retrieve API token", precondition=True)
+
+    def get_api_key_from_ui():
+        logger.log_step("Retrieve API token from UI", precondition=True)
+        # remote server is started only if the token is not cached yet
+        request.getfixturevalue("start_remote_server")
+        try:
+            start_webdriver_session(config_manager.get_webdriver_settings())
+            navigate_to(raw_config.project_settings.web_app_url)
+            main_page = MainPageSteps()
+            main_page.click_sign_in()
+
+            login_steps = SignInSteps()
+            login_steps.login(email=valid_user.email, password=valid_user.password)
+
+            home_steps = HomePageSteps()
+            return Token(home_steps.get_api_key(), time.time() + API_TOKEN_TTL)
+        finally:
+            stop_webdriver_session()
+
+    # token is shared by pytest-xdist workers and subsequent runs via the token cache file
+    return TokenCache().get_or_fetch(f"weather_api_key_{valid_user.email}", get_api_key_from_ui).value
 
 
 @pytest.fixture(scope='session', autouse=False)
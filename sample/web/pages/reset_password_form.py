@@ -1,8 +1,8 @@
-import time
 from typing import Union
 
 from selenium.webdriver.common.by import By
 
+from common._libs.helpers.waiters import poll_until
 from common._webdriver_qa_api.core.base_elements import BaseElement
 from common._webdriver_qa_api.web.web_elements import WebElement, WebTextBox
 from common.facade import logger
@@ -28,14 +28,5 @@ class ResetPasswordForm(SignInPage):
         Get page initial element and return True if element present
         """
         logger.info(f"Check is page '{self.name}' present in {second} seconds")
-        end_time = time.time() + second
-        present_status = False
-        try:
-            while time.time() < end_time and not present_status:
-                self.driver.implicitly_wait(1)
-                present_status = BaseElement(self.locator_type, self.locator,
-                                             self.web_driver, self.name).is_displayed()
-                time.sleep(0.1)
-        finally:
-            self.driver.implicitly_wait(self.config.implicit_wait_time)
-        return present_status
+        form = BaseElement(self.locator_type, self.locator, self.web_driver, self.name)
+        return poll_until(lambda: form.is_present_without_waiting() and form.is_displayed(), bool, second)[0]
@@ -0,0 +1,52 @@
+"""Measures latency of the waiting assertions: time from the moment the value becomes expected till the assertion
+passes. Backoff polling of _smart_assert is compared with the previous polling with fixed 1 second sleep,
+it is emulated by _fixed_sleep_assert and printed for the reference.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.assert_polling_benchmark
+"""
+import time
+from operator import eq
+
+from common._webdriver_qa_api.core.utils import _smart_assert
+
+DELAYS = (0.05, 0.2, 0.5, 1.2)
+TIMEOUT = 5
+
+
+def _fixed_sleep_assert(actual, expected, timeout, sleep_time=1):
+    end_time = time.time() + timeout
+    while time.time() < end_time:
+        if actual() == expected:
+            return
+        time.sleep(sleep_time)
+    raise AssertionError(f"{actual()} != {expected}")
+
+
+def _delayed_value(delay):
+    """Returns getter of the value which becomes True after delay seconds and the moment it happens"""
+    ready_at = time.perf_counter() + delay
+    return (lambda: time.perf_counter() >= ready_at), ready_at
+
+
+def run_benchmark(delays=DELAYS, timeout=TIMEOUT):
+    assertions = {
+        "fixed 1 second sleep (reference)": lambda actual: _fixed_sleep_assert(actual, True, timeout),
+        "backoff polling": lambda actual: _smart_assert(actual, True, eq, msg="benchmark", timeout=timeout),
+    }
+    results = {}
+    for name, assertion in assertions.items():
+        latencies = []
+        for delay in delays:
+            actual, ready_at = _delayed_value(delay)
+            assertion(actual)
+            latencies.append(time.perf_counter() - ready_at)
+        results[name] = latencies
+    print(f"Latency of the assertion after the value is changed, delays {list(delays)} seconds:")
+    for name, latencies in results.items():
+        print(f"\t{name:<35} total {sum(latencies) * 1000:8.1f} ms, max {max(latencies) * 1000:8.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,50 @@
+"""Compares decoding of the JSON response body via response.text with decoding straight from bytes by body codecs.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.body_decode_benchmark
+"""
+import json
+import timeit
+
+from requests import Request, Response
+
+from common._rest_qa_api.body_codecs import JSON_BACKEND
+from common._rest_qa_api.response_converter import decode_body
+from unit_tests.benchmarks.validation_benchmark import make_payloads
+
+ELEMENTS = 10000
+REPEATS = 10
+
+
+def make_response(content: bytes, content_type: str) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response._content = content
+    response.request = Request(method="get")
+    return response
+
+
+def run_benchmark(elements=ELEMENTS, repeats=REPEATS):
+    _, data = make_payloads(elements)
+    content = json.dumps(data).encode()
+    results = dict()
+    for content_type in ("application/json", "application/json; charset=utf-8"):
+        def text():
+            # the way the body was decoded before: response.text detects charset if it is not set
+            response = make_response(content, content_type)
+            json.loads(response.text)
+
+        def codec():
+            decode_body(make_response(content, content_type))
+
+        results[f"text ({content_type})"] = min(timeit.repeat(text, number=1, repeat=repeats))
+        results[f"codec ({content_type})"] = min(timeit.repeat(codec, number=1, repeat=repeats))
+    print(f"Decoding of {len(content) // 1024} KB JSON body, {JSON_BACKEND} backend (best of {repeats}):")
+    for name, value in results.items():
+        print(f"\t{name:<50} {value * 1000:8.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
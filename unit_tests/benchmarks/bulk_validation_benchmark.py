@@ -0,0 +1,64 @@
+"""Compares validation of many responses one by one with the model == and with the bulk validator.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.bulk_validation_benchmark
+"""
+import json
+import time
+
+from requests import Request, Response
+
+from common._rest_qa_api.bulk_validator import validate_responses
+from common._rest_qa_api.rest_utils import SKIP
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+RESPONSES = 500
+RECORDS = 100
+REPEATS = 5
+
+
+def _response(city):
+    body = {"city": city, "days": [{"day": day, "temperature": {"min": -5, "max": 7, "unit": "C"},
+                                    "wind": {"speed": 5, "direction": "NW"}, "condition": "cloudy"}
+                                   for day in range(RECORDS)]}
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(body).encode()
+    response.encoding = "utf-8"
+    response.request = Request(method="get")
+    return response
+
+
+def _best(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(responses=RESPONSES, repeats=REPEATS, processes=2):
+    model = TestEndpointBuilder._TestResponseModel(config=DummyConfigBuilder(DummyApiValidationConfig()))
+    model.status_code = 200
+    model.get_data = {"city": SKIP, "days": [{"day": day, "temperature": {"min": SKIP, "max": SKIP, "unit": "C"},
+                                              "wind": SKIP, "condition": SKIP} for day in range(RECORDS)]}
+    raw_responses = [_response(f"city {number}") for number in range(responses)]
+
+    def one_by_one():
+        assert all(model.convert_raw_response(raw) == model for raw in raw_responses)
+
+    results = {"model ==": _best(one_by_one, repeats),
+               "bulk": _best(lambda: validate_responses(model, raw_responses), repeats),
+               f"bulk x{processes}": _best(lambda: validate_responses(model, raw_responses, processes=processes),
+                                           repeats)}
+    print(f"Validation of {responses} responses with {RECORDS} records (best of {repeats}):")
+    for name, value in results.items():
+        print(f"\t{name:<10} {value * 1000:8.2f} ms")
+    print(f"\tspeedup    {results['model =='] / results['bulk']:8.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,89 @@
+"""Measures the element access path of DynamicElement: own attributes of the proxy and attributes of WebElement
+with debug logging disabled and with the element trace.
+
+Before the change every attribute access was logged by __getattribute__ with f-strings built even if debug level
+was disabled, it is emulated by _LoggingDynamicElement and printed for the reference.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.element_access_benchmark
+"""
+import logging
+import timeit
+
+from common._webdriver_qa_api.core import selenium_dynamic_elements
+from common._webdriver_qa_api.core.selenium_dynamic_elements import DynamicElement, ElementTrace
+
+ACCESSES = 10000
+REPEATS = 10
+
+
+class _FakeWebElement:
+    text = "Login"
+
+    def click(self):
+        pass
+
+
+class _FakeDriver:
+    element = _FakeWebElement()
+
+    def find_element(self, locator_type, locator):
+        return self.element
+
+
+class _LoggingDynamicElement(DynamicElement):
+    """Previous access path: each attribute of the proxy and of WebElement is logged"""
+
+    def __getattribute__(self, item):
+        attribute = object.__getattribute__(self, item)
+        if "_DynamicElement__" not in item:
+            name = object.__getattribute__(self, "name")
+            if callable(attribute):
+                selenium_dynamic_elements.logger.debug(f"Call method {item} in element {name}")
+            else:
+                selenium_dynamic_elements.logger.debug(f"get attribute {item} in element {name}")
+            selenium_dynamic_elements.logger.debug(f"attribute getattribute {attribute} {item}")
+        return attribute
+
+    def __getattr__(self, item):
+        attribute = getattr(self.selenium_element, item)
+        if callable(attribute):
+            selenium_dynamic_elements.logger.debug(f"Call method {item} in element {self.name}")
+        else:
+            selenium_dynamic_elements.logger.debug(f"get attribute {item} in element {self.name}")
+        selenium_dynamic_elements.logger.debug(f"attribute getattr {attribute}")
+        return attribute
+
+
+def run_benchmark(accesses=ACCESSES, repeats=REPEATS):
+    selenium_dynamic_elements.logger.setLevel(logging.INFO)
+    driver = _FakeDriver()
+    elements = {
+        "logging (reference)": _LoggingDynamicElement("xpath", "//button", driver, name="login_button"),
+        "fast path": DynamicElement("xpath", "//button", driver, name="login_button"),
+    }
+
+    def access(element):
+        def run():
+            for _ in range(accesses):
+                element.name
+                element.text
+                element.click()
+        return run
+
+    results = {name: min(timeit.repeat(access(element), number=1, repeat=repeats))
+               for name, element in elements.items()}
+    trace = ElementTrace(max_records=accesses * 2)
+    trace.start()
+    try:
+        results["element trace"] = min(timeit.repeat(access(elements["fast path"]), number=1, repeat=1))
+    finally:
+        trace.stop()
+    print(f"{accesses} accesses of name, text and click() of the element (best of {repeats}):")
+    for name, value in results.items():
+        print(f"\t{name:<30} {value * 1000:8.3f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,76 @@
+"""Measures cost of endpoint declaration with endpoint_factory and of endpoint instantiation with large model.
+
+Before the lazy factory every instantiation deep-copied the model defaults, it is printed for the reference.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.endpoint_factory_benchmark
+"""
+import copy
+import json
+import timeit
+
+from requests import Request, Response
+
+from common._rest_qa_api.base_endpoint import BaseResponseModel, endpoint_factory
+from common._rest_qa_api.rest_utils import SKIP, pycats_dataclass
+from unit_tests.benchmarks.validation_benchmark import make_payloads
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+ELEMENTS = 1000
+REPEATS = 10
+DECLARATIONS = 1000
+
+
+def make_model_class(expected):
+    return pycats_dataclass(type("_LargeResponseModel", (BaseResponseModel,), dict(
+        status_code=200, headers=SKIP, get_data=expected, post_data=None, put_data=None, patch_data=None,
+        delete_data=None, error_data=None, custom_checkers=[])))
+
+
+def make_response(data) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(data).encode()
+    response.request = Request(method="get")
+    return response
+
+
+def run_benchmark(elements=ELEMENTS, repeats=REPEATS, declarations=DECLARATIONS):
+    expected, data = make_payloads(elements)
+    model_class = make_model_class(expected)
+    config = DummyConfigBuilder(DummyApiValidationConfig())
+
+    def declare():
+        for index in range(declarations):
+            endpoint_factory("https://example.com/", f"Endpoint{index % 10}", TestEndpointBuilder._TestRequestModel,
+                             model_class, config=config)
+
+    factory = endpoint_factory("https://example.com/", "LargeEndpoint", TestEndpointBuilder._TestRequestModel,
+                               model_class, config=config)
+    converted = factory().response_model.convert_raw_response(make_response(data))
+
+    def instantiate():
+        factory()
+
+    def instantiate_and_validate():
+        assert converted == factory().response_model
+
+    def deepcopy_defaults():
+        copy.deepcopy(expected)
+
+    results = {
+        f"declare {declarations} endpoints": min(timeit.repeat(declare, number=1, repeat=repeats)),
+        "instantiate endpoint": min(timeit.repeat(instantiate, number=1, repeat=repeats)),
+        "instantiate endpoint and validate response": min(timeit.repeat(instantiate_and_validate, number=1,
+                                                                        repeat=repeats)),
+        "deepcopy of model defaults (reference)": min(timeit.repeat(deepcopy_defaults, number=1, repeat=repeats)),
+    }
+    print(f"Endpoint with {elements} records in the model (best of {repeats}):")
+    for name, value in results.items():
+        print(f"\t{name:<50} {value * 1000:8.3f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,53 @@
+"""Compares request building with dir() based object introspection and with cached class fields.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.request_build_benchmark
+"""
+import timeit
+
+from common._rest_qa_api import default_exclude_list, method_exclude_lists, request_exclude_sets
+from common._rest_qa_api.rest_utils import obj_to_dict
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder
+
+NUMBER = 10000
+REPEATS = 5
+
+
+def dir_obj_to_dict(obj, exclude_params=None):
+    """Previous implementation of obj_to_dict"""
+    if not exclude_params:
+        exclude_params = []
+    return dict(
+        (key, obj.__getattribute__(key)) for key in dir(obj)
+        if not callable(obj.__getattribute__(key)) and not key.startswith('_') and key not in exclude_params)
+
+
+def run_benchmark(number=NUMBER, repeats=REPEATS):
+    endpoint = TestEndpointBuilder().endpoint
+    endpoint.request_model.allowed_methods = ("get",)
+    endpoint.request_model.headers = {"Accept": "application/json"}
+    request_model = endpoint.request_model
+    endpoint._prepare_request("get")
+    request = endpoint._request
+
+    def dir_based():
+        dir_obj_to_dict(request_model)
+        dir_obj_to_dict(request, exclude_params=default_exclude_list + method_exclude_lists["get"])
+
+    def cached():
+        obj_to_dict(request_model)
+        obj_to_dict(request, exclude_params=request_exclude_sets["get"])
+
+    results = {"dir() based": min(timeit.repeat(dir_based, number=number, repeat=repeats)),
+               "cached": min(timeit.repeat(cached, number=number, repeat=repeats)),
+               "prepare": min(timeit.repeat(lambda: endpoint._prepare_request("get"), number=number,
+                                            repeat=repeats))}
+    print(f"Request building, {number} requests (best of {repeats}):")
+    for name, value in results.items():
+        print(f"\t{name:<12} {value / number * 1e6:8.2f} us per request")
+    print(f"\tspeedup      {results['dir() based'] / results['cached']:8.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
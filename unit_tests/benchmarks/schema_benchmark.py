@@ -0,0 +1,53 @@
+"""Compares the value-based response validation with the compiled JSON Schema on large payloads.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.schema_benchmark
+"""
+import timeit
+
+from common._rest_qa_api.rest_utils import SKIP
+from common._rest_qa_api.schema import Schema
+from common._rest_qa_api.validation_plan import ValidationPlan
+from unit_tests.benchmarks.validation_benchmark import make_payloads
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+ELEMENTS = 10000
+REPEATS = 10
+
+RECORD_STRUCTURE = {"id": int, "name": str, "email": str, "active": bool, "role": "user", "score": int,
+                    "country": str, "tags": [str], "created": SKIP, "updated": SKIP,
+                    "owner": {"id": SKIP, "name": str, "active": bool}}
+
+
+def run_benchmark(elements=ELEMENTS, repeats=REPEATS):
+    expected, data = make_payloads(elements)
+    model = TestEndpointBuilder._TestResponseModel(config=DummyConfigBuilder(DummyApiValidationConfig()))
+    schema = Schema.from_structure({"count": int, "items": [RECORD_STRUCTURE]})
+
+    def validate(model_to_verify):
+        model.errors = {"default": [], "custom": []}
+        model.field_nesting = []
+        model._validate_structure("get_data", data, model_to_verify)
+        assert not model.errors["default"]
+
+    plan = ValidationPlan(expected)
+
+    def compiled_plan():
+        assert plan.check(data, expected)
+
+    def compiled_schema():
+        assert schema.is_valid(data)
+
+    results = {"recursive": min(timeit.repeat(lambda: validate(expected), number=1, repeat=repeats)),
+               "plan": min(timeit.repeat(compiled_plan, number=1, repeat=repeats)),
+               "schema": min(timeit.repeat(compiled_schema, number=1, repeat=repeats)),
+               "model": min(timeit.repeat(lambda: validate(schema), number=1, repeat=repeats))}
+    print(f"Validation of {elements} list elements (best of {repeats}):")
+    for name, value in results.items():
+        print(f"\t{name:<10} {value * 1000:8.2f} ms")
+    print(f"\tspeedup    {results['recursive'] / results['model']:8.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,55 @@
+"""Compares the recursive response validation with the compiled validation plan on large payloads.
+
+Run from the project root:
+    python -m unit_tests.benchmarks.validation_benchmark
+"""
+import timeit
+
+from common._rest_qa_api.rest_utils import SKIP
+from common._rest_qa_api.validation_plan import ValidationPlan
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+ELEMENTS = 10000
+REPEATS = 10
+
+
+def _record(index, skipped):
+    return {"id": index, "name": f"item {index}", "email": f"user{index}@example.com", "active": True,
+            "role": "user", "score": index % 100, "country": "BY", "tags": ["a", "b"],
+            "created": skipped or "2020-01-01", "updated": skipped or "2020-01-02",
+            "owner": {"id": skipped or index, "name": "owner", "active": True}}
+
+
+def make_payloads(elements=ELEMENTS):
+    expected = {"count": elements, "items": [_record(index, SKIP) for index in range(elements)]}
+    data = {"count": elements, "items": [_record(index, None) for index in range(elements)]}
+    return expected, data
+
+
+def run_benchmark(elements=ELEMENTS, repeats=REPEATS):
+    expected, data = make_payloads(elements)
+    model = TestEndpointBuilder._TestResponseModel(config=DummyConfigBuilder(DummyApiValidationConfig()))
+
+    def recursive():
+        model.errors = {"default": [], "custom": []}
+        model.field_nesting = []
+        model._validate_structure("get_data", data, expected)
+        assert not model.errors["default"]
+
+    plan = ValidationPlan(expected)
+
+    def compiled():
+        assert plan.check(data, expected)
+
+    results = {"recursive": min(timeit.repeat(recursive, number=1, repeat=repeats)),
+               "compile": min(timeit.repeat(lambda: ValidationPlan(expected), number=1, repeat=repeats)),
+               "compiled": min(timeit.repeat(compiled, number=1, repeat=repeats))}
+    print(f"Validation of {elements} list elements (best of {repeats}):")
+    for name, value in results.items():
+        print(f"\t{name:<10} {value * 1000:8.2f} ms")
+    print(f"\tspeedup    {results['recursive'] / results['compiled']:8.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,49 @@
+import itertools
+import time
+from unittest.mock import patch
+
+import pytest
+
+from common._libs.helpers.waiters import backoff_intervals, poll_until
+
+
+def test_condition_is_checked_once_without_timeout():
+    calls = itertools.count(1)
+    assert poll_until(lambda: next(calls), lambda value: value > 1, timeout=0) == (False, 1)
+    assert poll_until(lambda: 5, lambda value: value > 1, timeout=None) == (True, 5)
+
+
+def test_condition_is_polled_till_it_holds():
+    values = iter([1, 2, 3])
+    start = time.monotonic()
+    assert poll_until(lambda: next(values), lambda value: value == 3, timeout=5) == (True, 3)
+    # two sleeps of the first backoff intervals
+    assert time.monotonic() - start < 1
+
+
+def test_last_value_is_returned_on_timeout():
+    calls = itertools.count(1)
+    start = time.monotonic()
+    passed, value = poll_until(lambda: next(calls), lambda value: False, timeout=0.2)
+    elapsed = time.monotonic() - start
+    assert not passed and value > 2
+    # the value is checked once more at the deadline, sleeps do not overrun it
+    assert 0.2 <= elapsed < 0.5
+
+
+def test_sleeps_follow_backoff():
+    with patch("common._libs.helpers.waiters.sleep") as sleep:
+        values = iter(range(5))
+        poll_until(lambda: next(values), lambda value: value == 4, timeout=10, initial_interval=0.01,
+                   max_interval=0.04)
+    sleeps = [call.args[0] for call in sleep.call_args_list]
+    assert len(sleeps) == 4
+    assert sleeps[0] == pytest.approx(0.01, rel=0.11) and sleeps[1] == pytest.approx(0.02, rel=0.11)
+    assert all(interval <= 0.04 for interval in sleeps)
+
+
+@pytest.mark.parametrize("initial, max_interval, expected", [(0.01, 0.25, [0.01, 0.02, 0.04, 0.08, 0.16, 0.25]),
+                                                             (0.5, 0.25, [0.25, 0.25])])
+def test_backoff_intervals(initial, max_interval, expected):
+    intervals = list(itertools.islice(backoff_intervals(initial, max_interval, jitter=0), len(expected)))
+    assert intervals == pytest.approx(expected)
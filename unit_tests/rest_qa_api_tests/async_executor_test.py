@@ -0,0 +1,67 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from common._rest_qa_api.async_executor import AsyncHTTPClient, gather_endpoints, run_endpoints
+from common._rest_qa_api.base_endpoint import BaseResponseModel
+from common._rest_qa_api.rest_exceptions import RestResponseValidationError
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyResponseBuilder
+
+DELAY = 0.2
+
+
+def slow_response(*args, **kwargs):
+    time.sleep(DELAY)
+    return DummyResponseBuilder()
+
+
+def test_client_of_each_pool_size():
+    client = AsyncHTTPClient(3)
+    assert AsyncHTTPClient(3) is client and client.max_workers == 3
+    assert AsyncHTTPClient(5) is not client and AsyncHTTPClient(5).max_workers == 5
+
+
+@patch('requests.Session.request', side_effect=slow_response)
+class TestAsyncExecution:
+
+    def test_execute_async_returns_response_model(self, _, response, builder):
+        result = asyncio.get_event_loop().run_until_complete(builder.endpoint.execute_async("get"))
+        assert isinstance(result, BaseResponseModel)
+        assert result.raw_response is response
+
+    def test_async_method_shortcut(self, _, response, builder):
+        result = asyncio.get_event_loop().run_until_complete(builder.endpoint.get_async())
+        assert result.status_code == 200
+
+    def test_gather_executes_calls_concurrently(self, _, response):
+        endpoints = [TestEndpointBuilder().endpoint for _ in range(5)]
+        for endpoint in endpoints:
+            endpoint.request_model.allowed_methods = ("get",)
+        start = time.time()
+        results = run_endpoints([(endpoint, "get") for endpoint in endpoints], concurrency=5)
+        assert time.time() - start < DELAY * 3
+        assert len(results) == 5
+
+    def test_gather_respects_concurrency_limit(self, request_mock, response, builder):
+        start = time.time()
+        run_endpoints([(builder.endpoint, "get")] * 4, concurrency=1)
+        assert time.time() - start >= DELAY * 4
+        assert request_mock.call_count == 4
+
+    def test_gather_raises_validation_error(self, _, response, builder):
+        builder.endpoint.response_model.status_code = 400
+        with pytest.raises(RestResponseValidationError):
+            run_endpoints([(builder.endpoint, "get")])
+
+    def test_gather_returns_validation_errors(self, _, response, builder):
+        builder.endpoint.response_model.status_code = 400
+        results = asyncio.get_event_loop().run_until_complete(
+            gather_endpoints([(builder.endpoint, "get")] * 2, return_exceptions=True))
+        assert all(isinstance(result, RestResponseValidationError) for result in results)
+
+    def test_gather_without_validation(self, _, response, builder):
+        builder.endpoint.response_model.status_code = 400
+        results = run_endpoints([(builder.endpoint, "get")], base_validation=False)
+        assert results[0].status_code == 200
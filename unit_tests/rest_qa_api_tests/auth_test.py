@@ -0,0 +1,233 @@
+import hashlib
+import hmac
+import base64
+import multiprocessing
+import os
+import stat
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from common._libs.helpers.file_lock import FileLock
+from common._libs.helpers.singleton import Singleton, delete_singleton_object
+from common._rest_qa_api.auth import HMACAuth, StaticTokenAuth, Token, TokenAuth, TokenCache
+from common._rest_qa_api.base_endpoint import endpoint_factory
+from common.config_parser.config_dto import APISettingsDTO
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+FETCH_DELAY = 0.2
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    delete_singleton_object(TokenCache)
+    yield str(tmp_path / "tokens.json")
+    delete_singleton_object(TokenCache)
+
+
+class _Fetcher:
+    def __init__(self, ttl=3600, delay=0):
+        self.ttl = ttl
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"token_{self.calls}", self.ttl
+
+
+def _fetch_in_process(cache_file, log_file):
+    delete_singleton_object(TokenCache)
+
+    def fetch():
+        with open(log_file, "a") as log:
+            log.write(f"{os.getpid()}\n")
+        time.sleep(FETCH_DELAY)
+        return Token(f"token_{os.getpid()}", time.time() + 3600)
+
+    TokenCache(cache_file).get_or_fetch("shared", fetch)
+
+
+def test_token_is_cached(cache_file):
+    fetcher = _Fetcher()
+    auth = TokenAuth(fetcher, key="user", cache=TokenCache(cache_file))
+    assert auth.apply({})["headers"] == {"Authorization": "Bearer token_1"}
+    assert auth.apply({"headers": {"Accept": "json"}})["headers"] == {"Accept": "json",
+                                                                      "Authorization": "Bearer token_1"}
+    assert fetcher.calls == 1
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+
+
+def test_token_is_not_written_without_cache_file(tmp_path):
+    delete_singleton_object(TokenCache)
+    cache = TokenCache()
+    try:
+        assert cache.cache_file is None
+        assert TokenAuth(_Fetcher(), key="user", cache=cache).token() == "token_1"
+        assert cache.get("user").value == "token_1"
+        cache.remove("user")
+        assert cache.get("user") is None
+    finally:
+        delete_singleton_object(TokenCache)
+
+
+def test_options_are_read_from_config_loaded_later(tmp_path):
+    delete_singleton_object(TokenCache)
+    cache = TokenCache()
+    auth = TokenAuth(_Fetcher(), key="user", cache=cache)
+    cache_file = str(tmp_path / "tokens.json")
+    config = Mock(get_api_settings=lambda: APISettingsDTO(token_cache_file=cache_file, token_refresh_ahead=5))
+    try:
+        with patch.dict(Singleton._instances, {"ConfigManager": config}):
+            assert cache.cache_file == cache_file and auth.refresh_ahead == 5
+            auth.token()
+            assert os.path.exists(cache_file)
+    finally:
+        delete_singleton_object(TokenCache)
+
+
+def test_token_is_shared_through_file(cache_file):
+    TokenAuth(_Fetcher(), key="user", cache=TokenCache(cache_file)).token()
+    delete_singleton_object(TokenCache)
+    fetcher = _Fetcher()
+    assert TokenAuth(fetcher, key="user", cache=TokenCache(cache_file)).token() == "token_1"
+    assert fetcher.calls == 0
+
+
+def test_expired_token_is_fetched(cache_file):
+    fetcher = _Fetcher(ttl=-1)
+    auth = TokenAuth(fetcher, key="user", cache=TokenCache(cache_file), refresh_ahead=0)
+    assert auth.token() == "token_1"
+    assert auth.token() == "token_2"
+    auth.invalidate()
+    fetcher.ttl = 3600
+    assert auth.token() == "token_3"
+    assert auth.token() == "token_3"
+
+
+def test_token_is_refreshed_in_background(cache_file):
+    fetcher = _Fetcher(ttl=100, delay=FETCH_DELAY)
+    cache = TokenCache(cache_file)
+    cache.put("user", Token("old", time.time() + 10, issued_at=time.time() - 90))
+    auth = TokenAuth(fetcher, key="user", cache=cache, refresh_ahead=60)
+    # the token expires in less than refresh_ahead: it is used while the new one is fetched
+    start = time.perf_counter()
+    assert auth.token() == "old"
+    assert auth.token() == "old"
+    assert time.perf_counter() - start < FETCH_DELAY
+    auth._refresh_thread.join()
+    assert fetcher.calls == 1
+    assert auth.token() == "token_1"
+    assert auth._refresh_thread is not None and not auth._refresh_thread.is_alive()
+
+
+def test_refresh_ahead_is_limited_by_token_lifetime(cache_file):
+    fetcher = _Fetcher(ttl=30)
+    auth = TokenAuth(fetcher, key="user", cache=TokenCache(cache_file), refresh_ahead=60)
+    assert auth.token() == "token_1"
+    # refresh_ahead is 15 seconds for the token issued for 30 seconds, so it is not refreshed on each request
+    assert auth.token() == "token_1"
+    assert auth._refresh_thread is None
+    assert auth._refresh_ahead(Token("token", 1030, issued_at=1000)) == 15
+
+
+def test_short_lived_token_is_not_refreshed_in_background(cache_file):
+    fetcher = _Fetcher(ttl=20)
+    cache = TokenCache(cache_file)
+    auth = TokenAuth(fetcher, key="user", cache=cache, refresh_ahead=60)
+    auth.token()
+    # token of unknown life time, the new one would expire before refresh_ahead as the last fetched
+    cache.put("user", Token("old", time.time() + 50))
+    assert auth.token() == "old"
+    assert auth._refresh_thread is None and fetcher.calls == 1
+
+
+def test_failed_background_refresh_keeps_token(cache_file):
+    def fetch():
+        raise ConnectionError("auth server is down")
+
+    cache = TokenCache(cache_file)
+    cache.put("user", Token("old", time.time() + 10))
+    auth = TokenAuth(fetch, key="user", cache=cache, refresh_ahead=60)
+    assert auth.token() == "old"
+    auth._refresh_thread.join()
+    assert auth.token() == "old"
+
+
+def test_token_is_fetched_once_by_threads(cache_file):
+    fetcher = _Fetcher(delay=FETCH_DELAY)
+    auth = TokenAuth(fetcher, key="user", cache=TokenCache(cache_file))
+    threads = [threading.Thread(target=auth.token) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fetcher.calls == 1
+
+
+def test_token_is_fetched_once_by_processes(cache_file, tmp_path):
+    log_file = str(tmp_path / "fetch.log")
+    processes = [multiprocessing.Process(target=_fetch_in_process, args=(cache_file, log_file)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    with open(log_file) as log:
+        assert len(log.readlines()) == 1
+
+
+def test_token_in_param(cache_file):
+    auth = TokenAuth(lambda: "key", key="user", param="appid", cache=TokenCache(cache_file))
+    assert auth.apply({"params": "q=Minsk"})["params"] == [("q", "Minsk"), ("appid", "key")]
+    assert StaticTokenAuth("key", param="appid").apply({})["params"] == [("appid", "key")]
+    assert StaticTokenAuth("key", header="X-Api-Key", scheme=None).apply({})["headers"] == {"X-Api-Key": "key"}
+
+
+def test_hmac_signature():
+    request = HMACAuth("secret", key_id="qa").apply({"method": "post", "url": "https://example.com/users",
+                                                     "params": {"page": 2}, "json": {"name": "test"}})
+    assert request["data"] == b'{"name":"test"}' and "json" not in request
+    assert request["params"] == "page=2"
+    string_to_sign = "\n".join(("POST", "https://example.com/users", "page=2", request["headers"]["X-Timestamp"],
+                                hashlib.sha256(request["data"]).hexdigest()))
+    signature = base64.b64encode(hmac.new(b"secret", string_to_sign.encode(), "sha256").digest()).decode()
+    assert request["headers"]["X-Signature"] == f"qa:{signature}"
+    assert request["headers"]["Content-Type"] == "application/json"
+
+
+def test_file_lock_timeout(tmp_path):
+    path = str(tmp_path / "file.lock")
+    with FileLock(path):
+        process = multiprocessing.Process(target=_acquire_lock, args=(path,))
+        process.start()
+        process.join()
+        assert process.exitcode == 1
+
+
+def _acquire_lock(path):
+    try:
+        FileLock(path, timeout=0.1).acquire()
+    except TimeoutError:
+        os._exit(1)
+    os._exit(0)
+
+
+@patch('requests.Session.request')
+def test_endpoint_sends_auth(request_mock, response, cache_file):
+    request_mock.return_value = response
+    fetcher = _Fetcher()
+    config = DummyConfigBuilder(DummyApiValidationConfig())
+    endpoint = endpoint_factory("https://example.com/", "AuthEndpoint", TestEndpointBuilder._TestRequestModel,
+                                TestEndpointBuilder._TestResponseModel, config=config,
+                                auth=TokenAuth(fetcher, key="user", cache=TokenCache(cache_file)))
+    for _ in range(3):
+        instance = endpoint()
+        instance.request_model.allowed_methods = ("get",)
+        instance.get()
+    assert fetcher.calls == 1
+    assert request_mock.call_args.kwargs["headers"] == {"Authorization": "Bearer token_1"}
+    # request model is not changed by auth
+    assert instance.request_model.headers is None
@@ -2,8 +2,8 @@ from unittest.mock import patch
 
 import pytest
 
-from common._rest_qa_api.base_endpoint import BaseEndpoint
-from common._rest_qa_api.rest_utils import SKIP, make_request_url
+from common._rest_qa_api.base_endpoint import BaseEndpoint, endpoint_factory
+from common._rest_qa_api.rest_utils import SKIP, make_request_url, pycats_dataclass
 from common._rest_qa_api.rest_exceptions import MethodNotSupportedByEndpoint, RestResponseValidationError
 from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyApiValidationConfig, DummyConfigBuilder, \
     DummyResponseBuilder
@@ -65,7 +65,7 @@ def test_new_instance_inits_with_clean_models():
         pytest.fail(f"DID RAISE {e}")
 
 
-@patch('requests.request', return_value=fake_response())
+@patch('requests.Session.request', return_value=fake_response())
 class TestStatusCode:
 
     def test_not_equal_status_code(self, _, response, builder):
@@ -93,7 +93,7 @@ class TestStatusCode:
             pytest.fail(f"DID RAISE {e}")
 
 
-@patch('requests.request', return_value=fake_response())
+@patch('requests.Session.request', return_value=fake_response())
 class TestHeaders:
 
     def test_all_headers_present(self, _, response, builder):
@@ -159,8 +159,21 @@ class TestHeaders:
                in str(excinfo.value)
 
 
+@patch('requests.Session.request', return_value=fake_response())
+def test_stream_body_requested(request_mock, builder):
+    @pycats_dataclass
+    class _StreamedResponseModel(TestEndpointBuilder._TestResponseModel):
+        get_data = ""
+
+    _StreamedResponseModel.configure_converter(stream_body=True)
+    builder.endpoint.get()
+    assert "stream" not in request_mock.call_args[1]
+    BaseEndpoint("", builder.endpoint.request_model, _StreamedResponseModel(config=config), make_request_url).get()
+    assert request_mock.call_args[1]["stream"] is True
+
+
 @pytest.mark.parametrize("method", ["get", "post", "put", "delete", "patch"])
-@patch('requests.request', return_value=fake_response())
+@patch('requests.Session.request', return_value=fake_response())
 class TestBody:
 
     def test_json_body(self, _, response, builder, method):
@@ -411,7 +424,7 @@ class TestBody:
         assert f"Field '{method}_data->1', expected value 'testValue2', but got 'testValue1'" in str(excinfo.value)
 
 
-@patch('requests.request', return_value=fake_response())
+@patch('requests.Session.request', return_value=fake_response())
 class TestValidateConfigSetup:
 
     def test_validate_status_code_false_from_config(self, _, response):
@@ -608,3 +621,27 @@ class TestValidateConfigSetup:
         expected_log_message = "The field 'testKey2' is not present in response. Please verify your model"
         messages = [record for record in caplog.records if expected_log_message == record.message]
         assert len(messages) == 1, "Expected message not found in logs"
+
+
+def test_endpoint_factory_binds_config_on_first_call():
+    with patch('common._rest_qa_api.base_endpoint.ConfigManager') as config_manager:
+        config_manager.return_value = config
+        factory = endpoint_factory("https://example.com/", "LazyEndpoint", TestEndpointBuilder._TestRequestModel,
+                                   TestEndpointBuilder._TestResponseModel)
+        assert not config_manager.called
+        first, second = factory(), factory()
+    assert config_manager.call_count == 1
+    assert first is not second and first.response_model is not second.response_model
+    assert first.session_manager is second.session_manager and first.transport is second.transport
+
+
+def test_endpoint_factory_classes_are_cached():
+    first = endpoint_factory("https://example.com/", "CachedEndpoint", TestEndpointBuilder._TestRequestModel,
+                             TestEndpointBuilder._TestResponseModel, config=config)()
+    second = endpoint_factory("https://example.com/v2/", "CachedEndpoint", TestEndpointBuilder._TestRequestModel,
+                              TestEndpointBuilder._TestResponseModel, config=config)()
+    uncached = endpoint_factory("https://example.com/", "CachedEndpoint", TestEndpointBuilder._TestRequestModel,
+                                TestEndpointBuilder._TestResponseModel, config=config, use_response_cache=False)()
+    assert type(first) is type(second) and type(first).__name__ == "CachedEndpoint"
+    assert type(uncached) is not type(first) and not uncached.use_response_cache
+    assert second.base_url == "https://example.com/v2/"
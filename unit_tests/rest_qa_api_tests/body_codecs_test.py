@@ -0,0 +1,141 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests import Request, Response
+
+from common._libs.helpers.singleton import delete_singleton_object
+from common._rest_qa_api import body_codecs
+from common._rest_qa_api.body_codecs import BodyCodec, get_codec, parse_content_type, register_codec, \
+    unregister_codec
+from common._rest_qa_api.response_converter import decode_body, is_json_response
+from common._rest_qa_api.session_manager import SessionManager
+from common.config_parser.config_dto import APISettingsDTO
+
+BODY = {"city": "Minsk", "temperature": [1.5, 2]}
+
+
+def make_response(content: bytes, content_type: str = None):
+    response = Response()
+    response.status_code = 200
+    if content_type:
+        response.headers["Content-Type"] = content_type
+    response._content = content
+    response.request = Request(method="get")
+    return response
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa
+        body = gzip.compress(json.dumps(BODY).encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def gzip_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("content_type, expected", [
+    ("application/json", ("application/json", None)),
+    ("Application/JSON; charset=UTF-8", ("application/json", "utf-8")),
+    ('text/plain; format=flowed; charset="iso-8859-1"', ("text/plain", "iso-8859-1")),
+    (None, ("", None)),
+])
+def test_parse_content_type(content_type, expected):
+    assert parse_content_type(content_type) == expected
+
+
+@pytest.mark.parametrize("content, content_type", [
+    (json.dumps(BODY).encode(), "application/json"),
+    (json.dumps(BODY).encode("utf-16"), "application/json"),
+    (json.dumps(BODY).encode("cp1251"), "application/json; charset=cp1251"),
+    (json.dumps(BODY).encode(), "application/problem+json"),
+])
+def test_json_is_decoded_from_bytes(content, content_type):
+    response = make_response(content, content_type)
+    assert decode_body(response) == BODY
+    assert is_json_response(response)
+
+
+def test_text_body():
+    assert decode_body(make_response(b'{"city": "Minsk"}', "text/plain")) == '{"city": "Minsk"}'
+    assert decode_body(make_response(b"<html/>")) == "<html/>"
+
+
+def test_ndjson_body():
+    content = b'{"id": 1}\n\n{"id": 2}\r\n'
+    assert decode_body(make_response(content, "application/x-ndjson")) == [{"id": 1}, {"id": 2}]
+    assert not is_json_response(make_response(content, "application/x-ndjson"))
+
+
+@pytest.mark.parametrize("content, content_type, message", [
+    (b"city = Minsk", "application/json", "Incorrect json format: city = Minsk"),
+    (b'{"id": 1}\n{"id": ', "application/x-ndjson", "Incorrect ndjson format"),
+])
+def test_incorrect_body(content, content_type, message):
+    with pytest.raises(TypeError, match=message):
+        decode_body(make_response(content, content_type))
+
+
+def test_msgpack_body():
+    msgpack = pytest.importorskip("msgpack")
+    assert decode_body(make_response(msgpack.packb(BODY), "application/msgpack")) == BODY
+
+
+def test_cbor_body():
+    cbor2 = pytest.importorskip("cbor2")
+    assert decode_body(make_response(cbor2.dumps(BODY), "application/cbor")) == BODY
+
+
+@pytest.mark.parametrize("package, content_type", [("msgpack", "application/x-msgpack"),
+                                                   ("cbor2", "application/cbor")])
+def test_missing_optional_package(package, content_type):
+    if getattr(body_codecs, package) is not None:
+        pytest.skip(f"{package} is installed")
+    with pytest.raises(ImportError, match=f"{package} package is required"):
+        decode_body(make_response(b"\x81", content_type))
+
+
+def test_custom_codec():
+    class _CSVCodec(BodyCodec):
+        name = "csv"
+
+        def decode(self, content, charset):
+            return [line.split(",") for line in content.decode(charset or "utf-8").splitlines()]
+
+    register_codec(_CSVCodec(), ["text/CSV"])
+    try:
+        assert decode_body(make_response(b"a,b\n1,2", "text/csv; charset=utf-8")) == [["a", "b"], ["1", "2"]]
+    finally:
+        unregister_codec("text/csv")
+    assert get_codec("text/csv") is None
+
+
+def test_compressed_body(gzip_server):
+    delete_singleton_object(SessionManager)
+    manager = SessionManager(APISettingsDTO())
+    try:
+        session = manager.get_session(gzip_server)
+        assert "gzip" in session.headers["Accept-Encoding"]
+        assert decode_body(session.get(gzip_server)) == BODY
+    finally:
+        manager.close()
+        delete_singleton_object(SessionManager)
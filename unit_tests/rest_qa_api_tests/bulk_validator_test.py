@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from requests import Request, Response
+
+from common._rest_qa_api.bulk_validator import BulkValidator, BulkValidationReport, validate_responses
+from common._rest_qa_api.rest_checkers import BaseRESTCheckers
+from common._rest_qa_api.rest_utils import SKIP
+
+
+def json_response(body, status_code=200):
+    response = Response()
+    response.status_code = status_code
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(body).encode() if not isinstance(body, str) else body.encode()
+    response.encoding = "utf-8"
+    response.request = Request(method="get")
+    return response
+
+
+def city_responses(count, broken=()):
+    return [json_response({"city": f"city_{number}", "temperature": {"unit": "C", "value": number},
+                           "days": [{"day": 1}, {"day": 2}]},
+                          500 if number in broken else 200)
+            for number in range(count)]
+
+
+class _TemperatureCheckers(BaseRESTCheckers):
+
+    @staticmethod
+    def check_temperature_is_positive(response):
+        assert response.get_data["temperature"]["value"] > 0, "temperature is not positive"
+
+
+@pytest.fixture
+def model(builder):
+    model = builder.endpoint.response_model
+    model.status_code = 200
+    model.get_data = {"city": SKIP, "temperature": {"unit": "C", "value": SKIP}, "days": [{"day": 1}]}
+    return model
+
+
+def test_all_responses_pass(model):
+    report = validate_responses(model, city_responses(50))
+    assert report.ok and report.total == report.passed == 50
+    assert report.index == report.path == []
+
+
+def test_failed_responses_reported(model):
+    responses = city_responses(10, broken=(3, 7))
+    responses[5] = json_response({"city": "city_5", "temperature": {"unit": "F", "value": 5}, "days": []})
+    report = BulkValidator(model).validate(responses)
+    assert not report.ok and report.total == 10 and report.failed == 3
+    assert report.failed_indexes == [3, 5, 7]
+    assert list(report.rows())[:3] == [(3, "default", "status_code", 200, 500),
+                                       (5, "default", "get_data->temperature->unit", "C", "F"),
+                                       (5, "default", "get_data->days", [{"day": 1}], [])]
+    assert report.errors_by_path()["status_code"] == 2
+    assert "failed: 3" in str(report)
+
+
+def test_incorrect_json_reported(model):
+    report = validate_responses(model, [json_response("{not json")])
+    assert list(report.rows()) == [(0, "conversion", "body", None, "Incorrect json format: {not json")]
+
+
+def test_custom_checkers_reported(model):
+    model.custom_checkers.append(_TemperatureCheckers)
+    report = validate_responses(model, city_responses(3))
+    assert report.failed == 1 and report.source == ["custom"]
+    assert report.path == ["check_temperature_is_positive"]
+    assert "temperature is not positive" in report.actual[0]
+
+
+def test_same_result_as_model_comparison(model):
+    responses = city_responses(20, broken=(1, 2, 13))
+    expected_failed = [index for index, raw in enumerate(responses)
+                       if not model.convert_raw_response(raw) == model]
+    assert validate_responses(model, responses).failed_indexes == expected_failed
+
+
+def test_process_pool(model):
+    responses = city_responses(100, broken=(0, 42, 99))
+    report = validate_responses(model, iter(responses), processes=2, chunk_size=16)
+    assert report.total == 100 and report.failed_indexes == [0, 42, 99]
+    assert report.index == [0, 42, 99]
+    assert report.to_dict() == validate_responses(model, responses).to_dict()
+
+
+def test_report_extend():
+    first, second = BulkValidationReport(total=2, failed=1), BulkValidationReport(total=3, failed=1)
+    first.add_error(1, "default", "status_code", 200, 500)
+    second.add_error(4, "custom", "checker", None, "error")
+    first.extend(second)
+    assert first.total == 5 and first.passed == 3 and first.index == [1, 4]
@@ -0,0 +1,195 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from requests import Request, Response
+
+from common._libs.helpers.singleton import delete_singleton_object
+from common._rest_qa_api.base_endpoint import endpoint_factory
+from common._rest_qa_api.conditional_cache import ConditionalCache
+from common._rest_qa_api.rest_exceptions import RestResponseValidationError
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+class _Server:
+    """Answers 304 if the conditional headers match the current version of the resource"""
+
+    def __init__(self, body, headers):
+        self.body = body
+        self.headers = headers
+        self.requests = []
+
+    def __call__(self, method, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        response = Response()
+        response.request = Request(method=method)
+        response.encoding = "utf-8"
+        etag, last_modified = self.headers.get("ETag"), self.headers.get("Last-Modified")
+        if (etag and headers.get("If-None-Match") == etag) or \
+                (last_modified and headers.get("If-Modified-Since") == last_modified):
+            response.status_code = 304
+            response._content = b""
+            return response
+        response.status_code = 200
+        response.headers.update(dict(self.headers, **{"Content-Type": "application/json"}))
+        response._content = json.dumps(self.body).encode()
+        return response
+
+
+@pytest.fixture(autouse=True)
+def conditional_cache():
+    delete_singleton_object(ConditionalCache)
+    yield
+    delete_singleton_object(ConditionalCache)
+
+
+def make_endpoint(**kwargs):
+    kwargs.setdefault("use_conditional_requests", True)
+    endpoint = endpoint_factory("https://example.com/", "ConditionalEndpoint", TestEndpointBuilder._TestRequestModel,
+                                TestEndpointBuilder._TestResponseModel,
+                                config=DummyConfigBuilder(DummyApiValidationConfig()), **kwargs)()
+    endpoint.request_model.allowed_methods = ("get", "post")
+    endpoint.response_model.status_code = 200
+    endpoint.response_model.get_data = {"status": "done"}
+    return endpoint
+
+
+@pytest.mark.parametrize("validators, conditional_header", [({"ETag": ETAG}, "If-None-Match"),
+                                                            ({"Last-Modified": LAST_MODIFIED}, "If-Modified-Since")])
+def test_not_modified_response_is_served_from_cache(validators, conditional_header):
+    server = _Server({"status": "done"}, validators)
+    with patch('requests.Session.request', side_effect=server):
+        endpoint = make_endpoint()
+        first = endpoint.get()
+        second = make_endpoint().get()
+    assert conditional_header not in server.requests[0]
+    assert server.requests[1][conditional_header] == list(validators.values())[0]
+    assert second.status_code == 200 and second.get_data == {"status": "done"}
+    # raw response is of the 304 exchange with the cached body
+    assert second.raw_response is not first.raw_response
+    assert second.raw_response.content == first.raw_response.content
+    assert second.raw_response.headers["Content-Type"] == "application/json"
+    stats = ConditionalCache().stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["entries"] == 1
+    # converted model is not kept
+    entry = ConditionalCache().get(ConditionalCache.make_key("ConditionalEndpoint", endpoint._prepare_request("get")))
+    assert entry.content == first.raw_response.content and not hasattr(entry, "converted")
+
+
+def test_not_modified_body_is_not_decoded():
+    server = _Server({"status": "done"}, {"ETag": ETAG})
+    with patch('requests.Session.request', side_effect=server):
+        first = make_endpoint().get()
+        # changes of the converted body do not affect the cached body
+        first.get_data["status"] = "changed"
+        with patch('common._rest_qa_api.response_converter.decode_body') as decode_body:
+            second = make_endpoint().get()
+            third = make_endpoint().get()
+    decode_body.assert_not_called()
+    assert second.get_data == third.get_data == {"status": "done"} and second.get_data is not third.get_data
+
+
+def test_cached_response_is_validated_against_current_model():
+    server = _Server({"status": "done"}, {"ETag": ETAG})
+    with patch('requests.Session.request', side_effect=server):
+        make_endpoint().get()
+        endpoint = make_endpoint()
+        endpoint.response_model.get_data = {"status": "failed"}
+        with pytest.raises(RestResponseValidationError):
+            endpoint.get()
+    assert server.requests[1]["If-None-Match"] == ETAG
+
+
+def test_modified_response_replaces_cached():
+    server = _Server({"status": "in progress"}, {"ETag": ETAG})
+    with patch('requests.Session.request', side_effect=server):
+        endpoint = make_endpoint()
+        endpoint.execute("get", base_validation=False)
+        server.body, server.headers = {"status": "done"}, {"ETag": '"v2"'}
+        assert endpoint.get().get_data == {"status": "done"}
+        assert endpoint.get().get_data == {"status": "done"}
+    assert [headers.get("If-None-Match") for headers in server.requests] == [None, ETAG, '"v2"']
+
+
+def test_request_headers_are_kept():
+    server = _Server({"status": "done"}, {"ETag": ETAG})
+    with patch('requests.Session.request', side_effect=server):
+        endpoint = make_endpoint()
+        endpoint.request_model.headers = {"Accept": "application/json"}
+        endpoint.get()
+        endpoint.get()
+    assert server.requests[1] == {"Accept": "application/json", "If-None-Match": ETAG}
+    assert endpoint.request_model.headers == {"Accept": "application/json"}
+
+
+@pytest.mark.parametrize("validators, endpoint_kwargs, method", [
+    ({}, {}, "get"),
+    ({"ETag": ETAG}, {"use_conditional_requests": False}, "get"),
+    # disabled by default in config
+    ({"ETag": ETAG}, {"use_conditional_requests": None}, "get"),
+    ({"ETag": ETAG}, {}, "post"),
+])
+def test_request_is_not_conditional(validators, endpoint_kwargs, method):
+    server = _Server({"status": "done"}, validators)
+    with patch('requests.Session.request', side_effect=server):
+        endpoint = make_endpoint(**endpoint_kwargs)
+        endpoint.execute(method, base_validation=False)
+        endpoint.execute(method, base_validation=False)
+    assert "If-None-Match" not in server.requests[1]
+
+
+def test_async_not_modified_response():
+    server = _Server({"status": "done"}, {"ETag": ETAG})
+    with patch('requests.Session.request', side_effect=server):
+        endpoint = make_endpoint()
+        asyncio.run(endpoint.get_async())
+        assert asyncio.run(endpoint.get_async()).get_data == {"status": "done"}
+    assert server.requests[1]["If-None-Match"] == ETAG
+
+
+def test_user_validator_headers_are_kept():
+    server = _Server({"status": "done"}, {"ETag": ETAG})
+    with patch('requests.Session.request', side_effect=server):
+        endpoint = make_endpoint()
+        endpoint.get()
+        endpoint.request_model.headers = {"If-None-Match": '"other"'}
+        endpoint.get()
+    assert server.requests[1] == {"If-None-Match": '"other"'}
+
+
+def test_least_recently_used_entries_are_removed_by_size():
+    server = _Server({"status": "done"}, {"ETag": ETAG})
+    entry_size = len(json.dumps({"status": "done"})) + len("ETag") + len(ETAG) + len("Content-Type") + \
+        len("application/json")
+    cache = ConditionalCache(max_bytes=entry_size * 2)
+    with patch('requests.Session.request', side_effect=server):
+        endpoint = make_endpoint()
+        for params in ("page=1", "page=2", "page=1", "page=3"):
+            endpoint.request_model.params = params
+            endpoint.get()
+    assert cache.stats() == {"hits": 1, "misses": 3, "entries": 2, "bytes": entry_size * 2}
+    endpoint.request_model.params = "page=2"
+    assert cache.get(cache.make_key("ConditionalEndpoint", endpoint._prepare_request("get"))) is None
+
+
+def test_response_larger_than_cache_is_not_kept():
+    server = _Server({"status": "done"}, {"ETag": ETAG})
+    cache = ConditionalCache(max_bytes=10)
+    with patch('requests.Session.request', side_effect=server):
+        make_endpoint().get()
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_auth_providers_do_not_share_responses():
+    class _Auth:
+        pass
+    first, second = _Auth(), _Auth()
+    assert ConditionalCache.make_key("Users", {"method": "get", "url": "u"}, first) != \
+        ConditionalCache.make_key("Users", {"method": "get", "url": "u"}, second)
+    assert ConditionalCache.make_key("Users", {"method": "get", "url": "u"}, first) == \
+        ConditionalCache.make_key("Users", {"method": "get", "url": "u"}, first)
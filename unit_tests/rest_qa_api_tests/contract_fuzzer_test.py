@@ -0,0 +1,136 @@
+import json
+import time
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+import pytest
+import requests
+from requests import Request, Response
+
+from common._libs.helpers.singleton import delete_singleton_object
+from common._rest_qa_api.base_endpoint import BaseRequestModel, endpoint_factory
+from common._rest_qa_api.contract_fuzzer import ContractFuzzer, RequestMutator, error_signature
+from common._rest_qa_api.rate_limiter import RateLimiter
+from common._rest_qa_api.rest_utils import pycats_dataclass
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+SLOW = 0.05
+
+
+@pycats_dataclass
+class _UserRequestModel(BaseRequestModel):
+    resource = "users"
+    headers = {"Accept": "application/json"}
+    post_data: Optional[Dict[str, int]] = None
+    put_data = {"name": "user", "age": 30, "roles": ["admin"]}
+    patch_data = None
+    delete_data = None
+    params = "page=1&size=10"
+    allowed_methods = ("get", "post", "put")
+
+
+def make_endpoint():
+    return endpoint_factory("https://example.com/", "FuzzEndpoint", _UserRequestModel,
+                            TestEndpointBuilder._TestResponseModel,
+                            config=DummyConfigBuilder(DummyApiValidationConfig()))()
+
+
+def make_response(status_code, body=""):
+    response = Response()
+    response.status_code = status_code
+    response._content = body.encode()
+    response.request = Request(method="put")
+    return response
+
+
+def server(method, url, json=None, params=None, headers=None, **kwargs):
+    """Crashes on the wrong type of age, is slow on the long names and rejects unknown fields with the field name"""
+    body = json or {}
+    if not isinstance(body, dict):
+        return make_response(400, '{"error": "object expected"}')
+    if "age" in body and not isinstance(body["age"], int):
+        return make_response(500, f'{{"error": "internal", "trace_id": {id(body)}}}')
+    if "__fuzz__" in body:
+        return make_response(400, '{"error": "unknown field"}')
+    if isinstance(body.get("name"), str) and len(body["name"]) > 1000:
+        time.sleep(SLOW)
+    if body.get("roles") is None and method == "put":
+        raise requests.ConnectionError("connection reset")
+    return make_response(200, "{}")
+
+
+def test_cases_are_reproducible():
+    mutator = RequestMutator(make_endpoint(), "put", seed=7)
+    first, second = list(mutator.cases(50)), list(RequestMutator(make_endpoint(), "put", seed=7).cases(50))
+    assert [(case.field, case.path, case.strategy) for case in first] == \
+           [(case.field, case.path, case.strategy) for case in second]
+    assert mutator.case(10).request_kwargs == first[10].request_kwargs
+    assert len({str(case) for case in mutator.cases(200)}) > 50
+    # base request is never changed
+    assert mutator.base_kwargs["json"] == {"name": "user", "age": 30, "roles": ["admin"]}
+
+
+def test_mutated_fields():
+    mutator = RequestMutator(make_endpoint(), "get", seed=1)
+    assert mutator.fields == ("params", "headers")
+    assert mutator.base_kwargs["params"] == {"page": "1", "size": "10"}
+    for case in mutator.cases(200):
+        headers = case.request_kwargs["headers"]
+        assert all(isinstance(value, str) for value in headers.values()), case
+    nested = [case for case in RequestMutator(make_endpoint(), "put", seed=1, fields=("json",)).cases(200)
+              if case.path[:1] == ("roles",)]
+    assert nested and all(case.field == "json" for case in nested)
+
+
+def test_body_is_generated_from_type_hint():
+    mutator = RequestMutator(make_endpoint(), "post", seed=3)
+    assert "json" in mutator.fields and mutator.base_kwargs["json"] is None
+    strategies = {case.strategy for case in mutator.cases(300) if case.field == "json"}
+    assert "add unknown key" in strategies and "dict -> []" in strategies
+    assert {"__fuzz__": 1} in [case.request_kwargs["json"] for case in mutator.cases(300)]
+
+
+@pytest.mark.parametrize("status_code, body, error, expected", [
+    (200, '{"id": 15}', None, "200"),
+    (500, '{"error": "internal",\n "trace_id": 0x1f2e}', None, '500 {"error": "internal", "trace_id": #}'),
+    (404, "user 42 not found", None, "404 user # not found"),
+    (None, None, requests.Timeout(), "Timeout"),
+])
+def test_error_signature(status_code, body, error, expected):
+    response = make_response(status_code, body) if status_code else None
+    assert error_signature(response, error) == expected
+
+
+@patch('requests.Session.request', side_effect=server)
+def test_fuzz_run(request_mock):
+    report = ContractFuzzer(make_endpoint(), "put", count=300, concurrency=5, seed=11, fields=("json",),
+                            slowest=3).run()
+    assert report.requests == request_mock.call_count == 300
+    assert sum(bucket.count for bucket in report.buckets.values()) == 300
+    crash_signatures = {bucket.signature for bucket in report.crashes}
+    assert crash_signatures == {'500 {"error": "internal", "trace_id": #}', "ConnectionError"}
+    internal = report.buckets['500 {"error": "internal", "trace_id": #}']
+    assert 0 < len(internal.examples) <= 3
+    assert all(case.path[:1] in (("age",), ()) for case in internal.examples)
+    assert '400 {"error": "unknown field"}' in report.buckets
+    latency, slowest = report.slowest[0]
+    assert latency >= SLOW * 1000 and len(report.slowest) == 3
+    assert len(slowest.request_kwargs["json"]["name"]) > 1000
+    assert "crash buckets: 2" in str(report)
+
+
+@patch('requests.Session.request', return_value=make_response(429, '{"error": "too many requests"}'))
+def test_fuzz_requests_are_not_retried(request_mock):
+    endpoint = make_endpoint()
+    delete_singleton_object(RateLimiter)
+    # the limiter waits for 0.2 seconds after each 429 response, it is not a part of the latency
+    endpoint.rate_limiter = RateLimiter(rate=5)
+    try:
+        with patch.object(endpoint.transport, "send", wraps=endpoint.transport.send) as send:
+            report = ContractFuzzer(endpoint, "get", count=3, concurrency=1, fields=("params",)).run()
+    finally:
+        delete_singleton_object(RateLimiter)
+    assert request_mock.call_count == 3
+    assert all(call[1]["retries"] is False for call in send.call_args_list)
+    assert report.buckets['429 {"error": "too many requests"}'].count == 3
+    assert report.duration >= 0.3 and report.slowest[0][0] < 100
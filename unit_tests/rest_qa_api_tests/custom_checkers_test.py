@@ -1,10 +1,15 @@
 from unittest.mock import patch
 
 import json
+import time
 import pytest
+from common._rest_qa_api.base_endpoint import BaseEndpoint
 from common._rest_qa_api.rest_exceptions import RestResponseValidationError
-from common._rest_qa_api.rest_checkers import JSONCheckers, check_status
-from unit_tests.rest_qa_api_tests.tests_utils import DummyResponseBuilder
+from common._rest_qa_api.rest_checkers import BaseRESTCheckers, JSONCheckers, check_status
+from common._rest_qa_api.rest_utils import make_request_url, pycats_dataclass
+from unit_tests.rest_qa_api_tests.tests_utils import DummyResponseBuilder, TestEndpointBuilder
+
+DELAY = 0.2
 
 
 def fake_response():
@@ -17,7 +22,7 @@ def reset_checker_status():
     JSONCheckers.expected_json_structure = None
 
 
-@patch('requests.request', return_value=fake_response())
+@patch('requests.Session.request', return_value=fake_response())
 class TestRunCheckersBranches:
 
     def test_calling_of_multiple_custom_checkers(self, _, response, builder):
@@ -69,7 +74,7 @@ class TestRunCheckersBranches:
         assert len(first_message) == 1 and len(second_message) == 1, "Expected messages not found in logs"
 
 
-@patch('requests.request', return_value=fake_response())
+@patch('requests.Session.request', return_value=fake_response())
 class TestCustomLogger:
 
     def test_logging_after_successful_execution_of_custom_checker(self, _, response, builder, caplog):
@@ -119,3 +124,57 @@ class TestCustomLogger:
         with pytest.raises(RestResponseValidationError) as excinfo:
             builder.endpoint.get()
         assert f"{JSONCheckers.check_status.__name__} validation passed" not in str(excinfo.value)
+
+
+class _SlowCheckers(BaseRESTCheckers):
+    _deactivated_checks = []
+
+    @classmethod
+    def check_first(cls, response):
+        time.sleep(DELAY)
+
+    @classmethod
+    def check_second(cls, response):
+        raise AssertionError("second failed")
+
+
+def slow_checker(response):
+    time.sleep(DELAY)
+
+
+def failed_checker(response):
+    time.sleep(DELAY)
+    raise AssertionError("function failed")
+
+
+@pycats_dataclass
+class _ParallelResponseModel(TestEndpointBuilder._TestResponseModel):
+    custom_checkers = [slow_checker, failed_checker, _SlowCheckers]
+
+
+_ParallelResponseModel.configure_checkers(parallel=True)
+
+
+def test_checks_discovered_once():
+    assert _SlowCheckers.get_checks() == ("check_first", "check_second")
+    _SlowCheckers.deactivate(_SlowCheckers.check_second)
+    with patch("common._rest_qa_api.rest_checkers.dir", create=True) as dir_mock:
+        assert _SlowCheckers.get_checks() == ("check_first",)
+    dir_mock.assert_not_called()
+    _SlowCheckers._deactivated_checks.clear()
+
+
+@patch('requests.Session.request', return_value=fake_response())
+def test_parallel_checkers_with_timings(_, builder):
+    request_model = builder.endpoint.request_model
+    endpoint = BaseEndpoint("", request_model, _ParallelResponseModel(config=builder.config), make_request_url)
+    start = time.time()
+    with pytest.raises(RestResponseValidationError) as excinfo:
+        endpoint.get()
+    assert time.time() - start < DELAY * 2.5
+    response = excinfo.value.response
+    assert [str(error[1]) for error in response.errors["custom"]] == ["function failed", "second failed"]
+    assert set(response.checker_timings) == {"slow_checker", "failed_checker", "_SlowCheckers",
+                                             "_SlowCheckers.check_first", "_SlowCheckers.check_second"}
+    assert response.checker_timings["slow_checker"] >= DELAY
+    assert response.checker_timings["_SlowCheckers"] >= response.checker_timings["_SlowCheckers.check_first"]
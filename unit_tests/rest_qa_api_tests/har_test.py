@@ -0,0 +1,163 @@
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+from requests import Request, Response
+
+from common._libs.logger import PyCatsLogger
+from common._rest_qa_api.auth import StaticTokenAuth
+from common._rest_qa_api.har import HarRecorder, HarWriter, har_entry
+from common._rest_qa_api.instrumentation import Instrumentation, MetricsCollector, RequestMetrics
+
+URL = "https://example.com/api/v1/users?page=2&sort="
+
+
+def make_response(content=b'{"id": 1}', content_type="application/json", status_code=200):
+    response = Response()
+    response.status_code = status_code
+    response.reason = "OK"
+    response.headers["Content-Type"] = content_type
+    response._content = content
+    response.request = Request("GET", URL, headers={"Accept": "application/json"}).prepare()
+    return response
+
+
+def read_har(path):
+    with open(path) as file:
+        return json.load(file)["log"]
+
+
+@pytest.fixture
+def recorder():
+    recorder = HarRecorder(buffer_size=2, max_body_size=16)
+    Instrumentation().add_hook(recorder)
+    yield recorder
+    Instrumentation().remove_hook(recorder)
+    recorder.finish_test()
+
+
+def test_writer_streams_entries(tmp_path):
+    path = str(tmp_path / "har" / "test.har")
+    with HarWriter(path, buffer_size=2) as writer:
+        writer.write({"id": 1})
+        # buffered entries are not written yet
+        assert '"id"' not in open(path).read()
+        writer.write({"id": 2})
+        writer.write({"id": 3})
+        assert writer.entries == 2
+    log = read_har(path)
+    assert log["version"] == "1.2" and log["pages"] == []
+    assert log["entries"] == [{"id": 1}, {"id": 2}, {"id": 3}]
+    with pytest.raises(ValueError):
+        writer.write({"id": 4})
+
+
+def test_empty_har(tmp_path):
+    path = str(tmp_path / "test.har")
+    HarWriter(path).close()
+    assert read_har(path)["entries"] == []
+
+
+def test_entry():
+    metrics = RequestMetrics("Users", "get", url=URL, timestamp=0.0, network=30.0, ttfb=20.0, download=10.0,
+                             response_size=9)
+    metrics.response = make_response()
+    entry = har_entry(metrics)
+    assert entry["startedDateTime"] == "1970-01-01T00:00:00+00:00" and entry["time"] == 30.0
+    assert entry["request"]["method"] == "GET" and entry["request"]["url"] == URL
+    assert entry["request"]["queryString"] == [{"name": "page", "value": "2"}, {"name": "sort", "value": ""}]
+    assert {"name": "Accept", "value": "application/json"} in entry["request"]["headers"]
+    assert entry["response"]["status"] == 200 and entry["response"]["bodySize"] == 9
+    assert entry["response"]["content"] == {"mimeType": "application/json", "size": 9, "text": '{"id": 1}'}
+    assert entry["timings"]["wait"] == 20.0 and entry["timings"]["receive"] == 10.0
+    assert entry["_endpoint"] == "Users"
+
+
+def test_entry_redacts_credentials():
+    metrics = RequestMetrics("Users", "get")
+    metrics.secret_names = ("appid", "X-Api-Key")
+    response = make_response()
+    response.headers["Set-Cookie"] = "session=secret"
+    response.request = Request("GET", URL, params={"appid": "secret", "q": "London"}, cookies={"session": "secret"},
+                               headers={"Authorization": "Bearer secret", "x-api-key": "secret"}).prepare()
+    metrics.response = response
+    entry = har_entry(metrics, redact=("Q",))
+    assert "secret" not in json.dumps(entry)
+    assert entry["request"]["url"] == URL + "&appid=%5BREDACTED%5D&q=%5BREDACTED%5D"
+    assert {"name": "appid", "value": "[REDACTED]"} in entry["request"]["queryString"]
+    assert {"name": "page", "value": "2"} in entry["request"]["queryString"]
+    for name in ("Authorization", "x-api-key", "Cookie"):
+        assert {"name": name, "value": "[REDACTED]"} in entry["request"]["headers"]
+    assert {"name": "Set-Cookie", "value": "[REDACTED]"} in entry["response"]["headers"]
+
+
+@patch('requests.Session.request', return_value=make_response())
+def test_metrics_have_secret_names_of_auth(request_mock, builder):
+    collector = MetricsCollector()
+    Instrumentation().add_hook(collector)
+    builder.endpoint.auth = StaticTokenAuth("secret", param="appid")
+    try:
+        builder.endpoint.execute("get", base_validation=False)
+    finally:
+        Instrumentation().remove_hook(collector)
+    assert collector.records[0].secret_names == ("appid",)
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b"\xff\xd8\xff\xe0", {"mimeType": "image/jpeg", "size": 4, "text": "/9j/4A==", "encoding": "base64"}),
+    (b"x" * 20, {"mimeType": "image/jpeg", "size": 20, "text": "x" * 16, "comment": "body is cut to 16 bytes"}),
+])
+def test_entry_body(content, expected):
+    metrics = RequestMetrics("Users", "get")
+    metrics.response = make_response(content, "image/jpeg")
+    assert har_entry(metrics, max_body_size=16)["response"]["content"] == expected
+
+
+def test_entry_of_failed_call():
+    entry = har_entry(RequestMetrics("Users", "post", url=URL, error="ConnectionError"))
+    assert entry["request"]["method"] == "POST" and entry["request"]["url"] == URL
+    assert entry["response"]["status"] == 0 and entry["response"]["_error"] == "ConnectionError"
+
+
+@patch('requests.Session.request')
+def test_recorder_writes_test_calls(request_mock, builder, recorder, tmp_path):
+    request_mock.side_effect = [make_response(b'{"id": 1, "name": "first user"}'), requests.ConnectionError()]
+    path = str(tmp_path / "test_users.har")
+    recorder.start_test(path)
+    builder.endpoint.execute("get", base_validation=False)
+    with pytest.raises(requests.ConnectionError):
+        builder.endpoint.get()
+    assert recorder.finish_test() == path
+    first, failed = read_har(path)["entries"]
+    assert first["response"]["status"] == 200 and first["_endpoint"] == "Dummy"
+    assert first["response"]["content"]["text"] == '{"id": 1, "name"'
+    assert failed["response"]["status"] == 0
+    # calls outside of the test are not written
+    request_mock.side_effect = None
+    request_mock.return_value = make_response()
+    builder.endpoint.execute("get", base_validation=False)
+    assert len(read_har(path)["entries"]) == 2
+
+
+def test_har_file_is_removed_without_calls(recorder, tmp_path):
+    path = tmp_path / "test_ui.har"
+    recorder.start_test(str(path))
+    assert recorder.finish_test() is None
+    assert not path.exists()
+
+
+@patch('requests.Session.request', return_value=make_response())
+def test_collected_metrics_do_not_keep_responses(request_mock, builder):
+    collector = MetricsCollector()
+    Instrumentation().add_hook(collector)
+    try:
+        builder.endpoint.execute("get", base_validation=False)
+    finally:
+        Instrumentation().remove_hook(collector)
+    assert collector.records[0].status_code == 200 and collector.records[0].response is None
+
+
+def test_test_file_path():
+    assert PyCatsLogger.test_file_path("test_login[chrome]", ".har") == f"{PyCatsLogger.log_dir}/test_login[chrome].har"
+    assert PyCatsLogger.test_file_path("Test Login") == f"{PyCatsLogger.log_dir}/test-login.log"
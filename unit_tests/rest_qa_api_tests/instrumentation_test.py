@@ -0,0 +1,109 @@
+import asyncio
+import csv
+import json
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from common._rest_qa_api.instrumentation import Instrumentation, MetricsCollector, RequestMetrics, aggregate
+from common._rest_qa_api.rest_exceptions import RestResponseValidationError
+from unit_tests.rest_qa_api_tests.tests_utils import DummyResponseBuilder
+
+DELAY = 0.05
+
+
+@pytest.fixture
+def collector():
+    collector = MetricsCollector()
+    Instrumentation().add_hook(collector)
+    yield collector
+    Instrumentation().remove_hook(collector)
+
+
+def slow_response(*args, **kwargs):
+    time.sleep(DELAY)
+    response = DummyResponseBuilder()
+    response.elapsed = timedelta(seconds=DELAY / 2)
+    response.stream_content(b'{"key": "value"}')
+    return response
+
+
+@patch('requests.Session.request', side_effect=slow_response)
+class TestEndpointInstrumentation:
+
+    def test_call_metrics(self, request_mock, builder, collector):
+        builder.endpoint.get()
+        metrics = collector.records[0]
+        assert metrics.endpoint == "Dummy" and metrics.method == "get" and metrics.status_code == 200
+        assert metrics.passed is True and metrics.error is None
+        assert metrics.network >= DELAY * 1000
+        assert metrics.ttfb == pytest.approx(DELAY / 2 * 1000)
+        assert metrics.download == pytest.approx(metrics.network - metrics.ttfb)
+        assert metrics.response_size == 16
+        assert metrics.total == pytest.approx(metrics.build + metrics.network + metrics.convert + metrics.validate)
+
+    def test_async_call_metrics(self, request_mock, builder, collector):
+        asyncio.run(builder.endpoint.get_async())
+        assert len(collector.records) == 1 and collector.records[0].network >= DELAY * 1000
+
+    def test_failed_calls(self, request_mock, builder, collector):
+        builder.endpoint.response_model.status_code = 201
+        with pytest.raises(RestResponseValidationError):
+            builder.endpoint.get()
+        builder.endpoint.execute("get", base_validation=False)
+        request_mock.side_effect = requests.ConnectionError()
+        with pytest.raises(requests.ConnectionError):
+            builder.endpoint.get()
+        failed, not_validated, broken = collector.records
+        assert failed.passed is False and failed.error == "RestResponseValidationError"
+        assert not_validated.passed is None and not_validated.error is None
+        assert broken.status_code is None and broken.error == "ConnectionError"
+        stats, = collector.finish_test()
+        assert stats.calls == 3 and stats.errors == 2 and stats.validation_failures == 1
+
+    def test_no_hooks(self, request_mock, builder):
+        with patch.object(MetricsCollector, "on_request") as on_request:
+            builder.endpoint.get()
+        on_request.assert_not_called()
+
+    def test_per_test_aggregates(self, request_mock, builder, collector):
+        Instrumentation().current_test = "test_one"
+        builder.endpoint.get()
+        builder.endpoint.get()
+        stats, = collector.finish_test()
+        assert stats.calls == 2 and stats.p50 <= stats.p95 <= stats.max
+        assert "Dummy GET: calls 2" in str(stats)
+        Instrumentation().current_test = None
+        builder.endpoint.get()
+        assert collector.finish_test()[0].calls == 1
+        assert [metrics.test for metrics in collector.records] == ["test_one", "test_one", None]
+        assert collector.summary()[0].calls == 3
+
+
+def test_aggregate_groups_by_endpoint_and_method():
+    records = [RequestMetrics("Users", "get", status_code=200, network=10.0, response_size=100),
+               RequestMetrics("Users", "get", status_code=500, network=30.0, response_size=50),
+               RequestMetrics("Users", "post", status_code=201, network=20.0, request_size=10)]
+    users_get, users_post = aggregate(records)
+    assert (users_get.calls, users_get.errors, users_get.network, users_get.max) == (2, 1, 20.0, 30.0)
+    assert users_get.response_bytes == 150
+    assert (users_post.calls, users_post.errors, users_post.request_bytes) == (1, 0, 10)
+
+
+@pytest.mark.parametrize("extension", ["json", "csv"])
+def test_report(tmp_path, extension):
+    collector = MetricsCollector()
+    collector.on_request(RequestMetrics("Users", "get", url="https://example.com/users", status_code=200,
+                                        network=10.0, passed=True))
+    path = str(tmp_path / f"metrics.{extension}")
+    collector.write_report(path)
+    with open(path) as file:
+        if extension == "csv":
+            row, = csv.DictReader(file)
+            assert row["url"] == "https://example.com/users" and float(row["total"]) == 10.0
+        else:
+            report = json.load(file)
+            assert report["calls"][0]["status_code"] == 200 and report["summary"][0]["calls"] == 1
@@ -0,0 +1,71 @@
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from common._rest_qa_api.load_generator import LoadGenerator, run_load
+from common._rest_qa_api.rest_utils import percentile
+from unit_tests.rest_qa_api_tests.tests_utils import DummyResponseBuilder
+
+DELAY = 0.01
+
+
+def slow_response(*args, **kwargs):
+    time.sleep(DELAY)
+    return DummyResponseBuilder()
+
+
+@pytest.mark.parametrize("percent, expected", [(50, 50), (95, 95), (99, 99), (100, 100), (1, 1)])
+def test_percentile(percent, expected):
+    assert percentile(list(range(1, 101)), percent) == expected
+    assert percentile([], percent) == 0
+
+
+@patch('requests.Session.request', side_effect=slow_response)
+class TestLoadGenerator:
+
+    def test_concurrency_mode(self, request_mock, response, builder):
+        report = run_load(builder.endpoint, "get", duration=0.5, concurrency=4, sample_rate=0)
+        assert report.requests == request_mock.call_count
+        # 4 workers send requests one by one during the duration, each request takes at least DELAY
+        assert 4 <= report.requests <= 4 * 0.5 / DELAY + 4
+        assert DELAY * 1000 <= report.p50 <= report.p95 <= report.p99 <= report.max
+        assert report.errors == 0 and report.validated == 0
+        assert report.status_codes == {200: report.requests}
+        assert report.throughput == pytest.approx(report.requests / report.duration)
+
+    def test_rate_mode(self, request_mock, response, builder):
+        report = LoadGenerator(builder.endpoint, "get", duration=0.5, concurrency=4, rps=20).run()
+        # requests are scheduled at 0, 0.05, ... 0.45 seconds from the start, late requests are sent anyway
+        assert report.requests == request_mock.call_count == 10
+
+    def test_sampled_validation(self, request_mock, response, builder):
+        builder.endpoint.response_model.status_code = 201
+        report = LoadGenerator(builder.endpoint, "get", duration=0.2, concurrency=2, sample_rate=1).run()
+        assert report.validated == report.requests
+        assert report.validation_failures == report.requests and report.validation_failure_rate == 1
+
+    def test_validation_is_not_timed(self, request_mock, response, builder):
+        def slow_validation(*args, **kwargs):
+            time.sleep(0.1)
+
+        with patch.object(builder.endpoint, "_process_response", side_effect=slow_validation):
+            report = LoadGenerator(builder.endpoint, "get", duration=0.1, concurrency=1, rps=10, sample_rate=1).run()
+        assert report.validated == report.requests == 1
+        assert report.max < 50
+
+    def test_unexpected_errors_counted(self, request_mock, response, builder):
+        request_mock.side_effect = [ValueError("invalid URL")] + [response] * 100
+        with patch.object(builder.endpoint, "_process_response", side_effect=ValueError("invalid JSON")):
+            report = LoadGenerator(builder.endpoint, "get", duration=0.1, concurrency=1, rps=20, sample_rate=1).run()
+        assert report.requests == 2 and report.errors == 1
+        assert report.validated == 1 and report.validation_failures == 1
+
+    def test_errors_counted(self, request_mock, response, builder):
+        response.code(500)
+        request_mock.side_effect = [requests.ConnectionError()] + [response] * 100
+        report = LoadGenerator(builder.endpoint, "get", duration=0.1, concurrency=1, rps=20).run()
+        assert report.requests == 2 and report.errors == 2 and report.error_rate == 1
+        assert report.status_codes == {500: 1}
+        assert report.to_dict()["error_rate"] == 1
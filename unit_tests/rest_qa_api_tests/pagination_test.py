@@ -0,0 +1,185 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+import pytest
+from requests import Request, Response
+
+from common._rest_qa_api.instrumentation import Instrumentation, MetricsCollector
+from common._rest_qa_api.pagination import (CursorPagination, OffsetPagination, PagePagination, Paginator,
+                                            PaginationStrategy, get_by_path, paginate)
+from common._rest_qa_api.rest_exceptions import RestResponseValidationError
+from common._rest_qa_api.rest_utils import merge_params
+
+ITEMS = list(range(25))
+DELAY = 0.1
+
+
+def json_response(body, status_code=200):
+    response = Response()
+    response.status_code = status_code
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(body).encode()
+    response.encoding = "utf-8"
+    response.request = Request(method="get")
+    return response
+
+
+def paged_api(*args, params=None, **kwargs):
+    """Serves ITEMS with page, offset and cursor pagination"""
+    params = dict(params or [])
+    if "page" in params:
+        size = params.get("size", 10)
+        start = (params["page"] - 1) * size
+        return json_response({"data": ITEMS[start:start + size]})
+    if "offset" in params:
+        return json_response(ITEMS[params["offset"]:params["offset"] + params["limit"]])
+    start = int(params.get("cursor", 0))
+    next_cursor = str(start + 10) if start + 10 < len(ITEMS) else None
+    return json_response({"items": ITEMS[start:start + 10], "meta": {"next": next_cursor}})
+
+
+def items_of(pages, path=None):
+    return [item for page in pages for item in get_by_path(page.get_data, path)]
+
+
+def test_strategy_should_implement_abstract_methods():
+    class _FirstPageOnly(PaginationStrategy):
+        def first_params(self):
+            return {}
+
+    with pytest.raises(TypeError):
+        _FirstPageOnly()
+
+
+def test_get_by_path():
+    body = {"meta": {"next": "abc"}, "data": [{"id": 1}]}
+    assert get_by_path(body, "meta.next") == "abc"
+    assert get_by_path(body, ("data", 0, "id")) == 1
+    assert get_by_path(body, "meta.absent.key") is None
+    assert get_by_path(body, None) is body
+
+
+@pytest.mark.parametrize("params", ["_format=json&page=7", {"_format": "json", "page": 7},
+                                    [("_format", "json"), ("page", 7)]])
+def test_merge_params(params):
+    assert merge_params(params, {"page": 2}) == [("_format", "json"), ("page", 2)]
+    assert merge_params(None, {"page": 2}) == [("page", 2)]
+
+
+@patch('requests.Session.request', side_effect=paged_api)
+class TestPaginator:
+
+    def test_page_pagination(self, request_mock, builder):
+        pages = list(paginate(builder.endpoint, PagePagination(items_path="data", size_param="size", size=10)))
+        assert len(pages) == 3 and request_mock.call_count == 3
+        assert items_of(pages, "data") == ITEMS
+
+    def test_page_pagination_stops_on_empty_page(self, request_mock, builder):
+        pages = list(paginate(builder.endpoint, PagePagination(items_path="data")))
+        # the last page is full, so one more page is requested to find the end
+        assert len(pages) == 4 and items_of(pages, "data") == ITEMS
+
+    def test_offset_pagination(self, request_mock, builder):
+        pages = list(paginate(builder.endpoint, OffsetPagination(limit=5)))
+        assert len(pages) == 6 and items_of(pages) == ITEMS
+        assert [dict(call.kwargs["params"])["offset"] for call in request_mock.call_args_list] == \
+            [0, 5, 10, 15, 20, 25]
+
+    def test_cursor_pagination(self, request_mock, builder):
+        pages = list(paginate(builder.endpoint, CursorPagination(cursor_path="meta.next")))
+        assert len(pages) == 3 and items_of(pages, "items") == ITEMS
+        assert "cursor" not in dict(request_mock.call_args_list[0].kwargs["params"])
+
+    def test_request_params_kept(self, request_mock, builder):
+        builder.endpoint.request_model.params = urlencode({"_format": "json"})
+        list(paginate(builder.endpoint, CursorPagination(cursor_path="meta.next")))
+        assert all(dict(call.kwargs["params"])["_format"] == "json" for call in request_mock.call_args_list)
+        # request model is not mutated
+        assert builder.endpoint.request_model.params == "_format=json"
+
+    def test_max_pages(self, request_mock, builder):
+        pages = list(paginate(builder.endpoint, OffsetPagination(limit=5), max_pages=2))
+        assert len(pages) == 2 and request_mock.call_count == 2
+
+    def test_pages_are_lazy(self, request_mock, builder):
+        pages = iter(paginate(builder.endpoint, OffsetPagination(limit=5), prefetch=False))
+        next(pages)
+        assert request_mock.call_count == 1
+        next(pages)
+        assert request_mock.call_count == 2
+
+    def test_validation_failure(self, request_mock, builder):
+        builder.endpoint.response_model.status_code = 201
+        with pytest.raises(RestResponseValidationError):
+            list(paginate(builder.endpoint, OffsetPagination(limit=5)))
+        pages = list(paginate(builder.endpoint, OffsetPagination(limit=5), base_validation=False))
+        assert len(pages) == 6
+
+    def test_pages_are_instrumented(self, request_mock, builder):
+        collector = MetricsCollector()
+        Instrumentation().add_hook(collector)
+        builder.endpoint.response_model.status_code = 201
+        try:
+            with pytest.raises(RestResponseValidationError):
+                list(paginate(builder.endpoint, OffsetPagination(limit=5)))
+            request_mock.side_effect = [json_response(ITEMS[:5]), ConnectionError("connection reset")]
+            with pytest.raises(ConnectionError):
+                list(paginate(builder.endpoint, OffsetPagination(limit=5), base_validation=False))
+        finally:
+            Instrumentation().remove_hook(collector)
+        # the prefetched page may fail before the current page is recorded
+        assert sorted(((record.status_code, record.passed, record.error) for record in collector.records), key=str) \
+            == sorted([(200, False, "RestResponseValidationError"), (200, None, None),
+                       (None, None, "ConnectionError")], key=str)
+        assert all(record.endpoint == "Dummy" for record in collector.records)
+
+    def test_next_page_is_requested_while_page_is_validated(self, request_mock, builder):
+        validate = builder.endpoint._validate_response
+        requests_sent = []
+
+        def slow_validate(*args, **kwargs):
+            deadline = time.monotonic() + 10 * DELAY
+            while request_mock.call_count < len(requests_sent) + 2 and time.monotonic() < deadline:
+                time.sleep(DELAY / 10)
+            requests_sent.append(request_mock.call_count)
+            return validate(*args, **kwargs)
+
+        with patch.object(builder.endpoint, "_validate_response", side_effect=slow_validate):
+            pages = list(paginate(builder.endpoint, OffsetPagination(limit=5)))
+        assert len(pages) == 6
+        # the next page is already requested when the current page is validated
+        assert requests_sent[:5] == [2, 3, 4, 5, 6]
+
+    def test_error_response_stops_iteration(self, request_mock, builder):
+        request_mock.side_effect = [json_response(ITEMS[:5]), json_response({"error": "fail"}, 500)]
+        pages = list(paginate(builder.endpoint, OffsetPagination(limit=5), base_validation=False))
+        assert len(pages) == 2 and pages[1].status_code == 500
+
+    def test_prefetch(self, request_mock, builder):
+        in_flight = []
+        lock = threading.Lock()
+        counter = {"current": 0}
+
+        def slow_api(*args, **kwargs):
+            with lock:
+                counter["current"] += 1
+                in_flight.append(counter["current"])
+            time.sleep(DELAY)
+            with lock:
+                counter["current"] -= 1
+            return paged_api(*args, **kwargs)
+
+        request_mock.side_effect = slow_api
+        start = time.perf_counter()
+        for _ in Paginator(builder.endpoint, OffsetPagination(limit=5)):
+            # processing of the page overlaps with the next page request
+            time.sleep(DELAY)
+        elapsed = time.perf_counter() - start
+        assert request_mock.call_count == 6
+        # 6 requests and 6 pages processing take 12 * DELAY without prefetch
+        assert elapsed < 9 * DELAY
+        # only one page is prefetched at a time
+        assert max(in_flight) == 1
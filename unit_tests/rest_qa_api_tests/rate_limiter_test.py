@@ -0,0 +1,161 @@
+import multiprocessing
+import threading
+import time
+from email.utils import formatdate
+from unittest.mock import patch
+
+import pytest
+from requests import Response
+
+from common._libs.helpers.singleton import delete_singleton_object
+from common._rest_qa_api.rate_limiter import FileBackend, RateLimiter, parse_retry_after
+from unit_tests.rest_qa_api_tests.tests_utils import DummyResponseBuilder
+
+URL = "https://example.com/api/v1/users"
+RATE = 20
+INTERVAL = 1 / RATE
+
+
+@pytest.fixture(autouse=True)
+def limiter():
+    delete_singleton_object(RateLimiter)
+    yield RateLimiter(RATE)
+    delete_singleton_object(RateLimiter)
+
+
+def make_response(status_code=200, headers=None):
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content, response._content_consumed = b"", True
+    return response
+
+
+def _acquire_in_process(directory, log_file, count):
+    delete_singleton_object(RateLimiter)
+    limiter = RateLimiter(RATE, backend=FileBackend(directory))
+    for _ in range(count):
+        limiter.acquire(URL)
+        with open(log_file, "a") as log:
+            log.write(f"{time.time()}\n")
+
+
+def test_requests_are_spread_by_rate(limiter):
+    start = time.perf_counter()
+    for _ in range(5):
+        limiter.acquire(URL)
+    assert 4 * INTERVAL * 0.9 <= time.perf_counter() - start < 4 * INTERVAL + 0.15
+
+
+def test_burst():
+    delete_singleton_object(RateLimiter)
+    limiter = RateLimiter(1, burst=5)
+    assert [limiter._reserve("example.com") for _ in range(5)] == [0.0] * 5
+    assert limiter._reserve("example.com") == pytest.approx(1, abs=0.01)
+
+
+def test_hosts_have_separate_buckets(limiter):
+    limiter.set_limit("slow.example.com", rate=1)
+    assert limiter._reserve("example.com") == limiter._reserve("slow.example.com") == 0.0
+    assert limiter._reserve("example.com") == pytest.approx(INTERVAL, abs=0.01)
+    assert limiter._reserve("slow.example.com") == pytest.approx(1, abs=0.01)
+
+
+def test_threads_share_bucket(limiter):
+    times = []
+    threads = [threading.Thread(target=lambda: (limiter.acquire(URL), times.append(time.time())))
+               for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    times.sort()
+    assert times[-1] - times[0] >= 5 * INTERVAL * 0.9
+
+
+@pytest.mark.parametrize("http_date", [False, True])
+def test_retry_after(limiter, http_date):
+    retry_after = formatdate(time.time() + 1.5, usegmt=True) if http_date else "1"
+    limiter.acquire(URL)
+    limiter.update(URL, make_response(429, {"Retry-After": retry_after}))
+    first, second = limiter._reserve("example.com"), limiter._reserve("example.com")
+    assert 0.5 < first <= 1.5
+    # waiting requests are sent one by one after Retry-After time
+    assert second == pytest.approx(first + INTERVAL, abs=0.01)
+
+
+def test_retry_after_is_ignored_for_success_response(limiter):
+    limiter.update(URL, make_response(200, {"Retry-After": "10"}))
+    assert limiter._reserve("example.com") == 0.0
+
+
+@pytest.mark.parametrize("timestamp", [False, True])
+def test_rate_limit_headers(limiter, timestamp):
+    reset = str(time.time() + 2) if timestamp else "2"
+    limiter.update(URL, make_response(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}))
+    assert 1.5 < limiter._reserve("example.com") <= 2
+
+
+def test_rate_limit_remaining(limiter):
+    limiter.update(URL, make_response(200, {"X-RateLimit-Remaining": "3"}))
+    assert limiter._reserve("example.com") == 0.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120", 1000.0) == 1120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", 0) == 1445412480.0
+    assert parse_retry_after("soon", 0) is None
+
+
+def test_too_many_requests_are_retried(limiter):
+    responses = [make_response(429, {"Retry-After": "0"}), make_response(429), make_response(200)]
+    assert limiter.send(URL, lambda: responses.pop(0)).status_code == 200
+    assert not responses
+
+
+def test_retries_are_limited(limiter):
+    limiter.retries = 1
+    calls = []
+    response = limiter.send(URL, lambda: calls.append(1) or make_response(429))
+    assert response.status_code == 429 and len(calls) == 2
+
+
+def test_max_wait(limiter):
+    limiter.update(URL, make_response(429, {"Retry-After": "3600"}))
+    with pytest.raises(TimeoutError):
+        limiter.acquire(URL)
+
+
+def test_timed_out_request_does_not_take_token(limiter):
+    limiter.max_wait = INTERVAL / 2
+    limiter.acquire(URL)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            limiter.acquire(URL)
+    # timed out requests did not reserve the tokens, so the next request waits for one token only
+    assert limiter._reserve(limiter.host(URL)) == pytest.approx(INTERVAL, abs=0.02)
+
+
+def test_processes_share_file_backend(tmp_path):
+    directory, log_file = str(tmp_path / "limits"), str(tmp_path / "requests.log")
+    processes = [multiprocessing.Process(target=_acquire_in_process, args=(directory, log_file, 3))
+                 for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    with open(log_file) as log:
+        times = sorted(float(line) for line in log)
+    assert len(times) == 9
+    # separate buckets of the processes would send all requests in 2 intervals
+    assert times[-1] - times[0] >= 8 * INTERVAL * 0.9
+
+
+@patch('requests.Session.request')
+def test_endpoint_retries_too_many_requests(request_mock, builder, limiter):
+    too_many = make_response(429, {"Retry-After": "0"})
+    request_mock.side_effect = [too_many, DummyResponseBuilder().method().code().header({}).body()]
+    builder.endpoint.response_model.status_code = 200
+    builder.endpoint.rate_limiter = limiter
+    builder.endpoint.get()
+    assert request_mock.call_count == 2
@@ -1,8 +1,9 @@
 import pytest
 
+from common._rest_qa_api import request_exclude_sets
 from common._rest_qa_api.base_endpoint import BaseRequestModel
 from common._rest_qa_api.rest_exceptions import DataclassNameError, MissingDecoratorError
-from common._rest_qa_api.rest_utils import pycats_dataclass
+from common._rest_qa_api.rest_utils import pycats_dataclass, obj_to_dict, class_fields
 
 request_methods_list = ["resource", "headers", "post_data", "put_data", "patch_data", "delete_data",
                         "params", "allowed_methods"]
@@ -50,3 +51,35 @@ def test_missing_decorator_exception():
         test_request_class = type("_RequestModel", (BaseRequestModel,), dict.fromkeys(request_methods_list, None))
         test_request_class()
     assert "Child dataclass _RequestModel should have @pycats_dataclass decorator" in str(excinfo.value)
+
+
+@pycats_dataclass
+class _FieldsRequestModel(BaseRequestModel):
+    resource = "/test"
+    headers = {"Accept": "application/json"}
+    post_data = [1, 2]
+    put_data = None
+    patch_data = None
+    delete_data = None
+    params = "key=value"
+    allowed_methods = ("get",)
+
+    def helper(self):
+        return self.resource
+
+
+def test_obj_to_dict_fields():
+    request = _FieldsRequestModel()
+    request.extra = "value"
+    request._private = "value"
+    expected = dict.fromkeys(request_methods_list + ["extra"])
+    assert obj_to_dict(request).keys() == expected.keys()
+    assert obj_to_dict(request)["headers"] is request.headers
+    assert obj_to_dict(request, exclude_params=request_exclude_sets["get"]) == \
+        {"headers": request.headers, "params": "key=value", "extra": "value"}
+
+
+def test_class_fields_cached():
+    names, names_set = class_fields(_FieldsRequestModel)
+    assert names == tuple(sorted(request_methods_list))
+    assert class_fields(_FieldsRequestModel)[0] is names
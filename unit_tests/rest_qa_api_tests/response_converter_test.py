@@ -2,6 +2,7 @@ import json
 import pytest
 
 from common._rest_qa_api.base_endpoint import ResponseConverterMixin
+from common._rest_qa_api.rest_utils import SKIP, pycats_dataclass
 from unit_tests.rest_qa_api_tests.tests_utils import DummyResponseBuilder, TestEndpointBuilder, \
     exclude_fields_from_obj, DummyConfigBuilder, DummyApiValidationConfig
 
@@ -11,6 +12,11 @@ affected_fields_error = ("raw_response", "status_code", "headers", "error_data")
 config = DummyConfigBuilder(DummyApiValidationConfig())
 
 
+@pycats_dataclass
+class _ValidationModel(TestEndpointBuilder._TestResponseModel):
+    get_data = {"key": SKIP, "nested": {"value": 1}}
+
+
 def test_status_code_converter():
     orig_response = DummyResponseBuilder().method().code(500).body()
     converted_response = ResponseConverterMixin().convert_raw_response(orig_response)
@@ -128,3 +134,49 @@ def test_body_json_converter_as_mixin_error_status_code():
     assert converted_response.error_data == test_body
     assert exclude_fields_from_obj(converted_response, affected_fields_error) == \
         exclude_fields_from_obj(TestEndpointBuilder._TestResponseModel(config), affected_fields_error)
+
+
+def test_converter_references_model_values():
+    model = TestEndpointBuilder._TestResponseModel(config)
+    model.error_data = {"items": [{"id": index} for index in range(1000)]}
+    orig_response = DummyResponseBuilder().method().code().body("asd: asd").header({"Content-Type": "text/plain"})
+    converted_response = model.convert_raw_response(orig_response)
+    assert converted_response is not model
+    assert converted_response.error_data is model.error_data
+    assert converted_response.custom_checkers is model.custom_checkers
+    assert model.raw_response is None and model.get_data is SKIP
+
+
+def test_models_do_not_share_mutable_defaults():
+    first, second = TestEndpointBuilder().endpoint, TestEndpointBuilder().endpoint
+    assert first.response_model.custom_checkers is not second.response_model.custom_checkers
+    first_model, second_model = _ValidationModel(config), _ValidationModel(config)
+    assert first_model.get_data == second_model.get_data
+    assert first_model.get_data is not second_model.get_data
+    assert first_model.get_data["key"] is SKIP
+
+
+@pycats_dataclass
+class _StreamedModel(TestEndpointBuilder._TestResponseModel):
+    get_data = {"count": 2, "items": [{"id": 1, "name": SKIP}]}
+
+
+_StreamedModel.configure_converter(stream_body=True, chunk_size=8)
+
+
+def test_body_json_stream_converter():
+    test_body = {"count": 2, "items": [{"id": 1, "name": "first", "extra": [1]}, {"id": 2, "name": "second"}]}
+    orig_response = DummyResponseBuilder().method().code().header({"Content-Type": "application/json"}) \
+        .stream_content(json.dumps(test_body).encode())
+    model = _StreamedModel(config)
+    converted_response = model.convert_raw_response(orig_response)
+    assert converted_response.get_data == {"count": 2, "items": [{"id": 1, "name": SKIP}]}
+    assert converted_response == model
+
+
+def test_body_json_stream_converter_invalid_body():
+    orig_response = DummyResponseBuilder().method().code().header({"Content-Type": "application/json"}) \
+        .stream_content(b'{"count": 2, "items": [')
+    with pytest.raises(TypeError) as excinfo:
+        _StreamedModel(config).convert_raw_response(orig_response)
+    assert "Incorrect json format: Expecting value: char 23" in str(excinfo.value)
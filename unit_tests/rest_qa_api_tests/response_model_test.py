@@ -2,7 +2,7 @@ import pytest
 
 from common._rest_qa_api.base_endpoint import BaseResponseModel
 from common._rest_qa_api.rest_exceptions import DataclassNameError, MissingDecoratorError
-from common._rest_qa_api.rest_utils import pycats_dataclass
+from common._rest_qa_api.rest_utils import peek_field, pycats_dataclass
 from unit_tests.rest_qa_api_tests.tests_utils import DummyConfigBuilder, DummyApiValidationConfig
 
 response_methods_list = ["status_code", "headers", "get_data", "post_data", "put_data", "patch_data", "delete_data",
@@ -62,3 +62,38 @@ def test_repr_format():
                                      "=test\nerror_data=test\n" \
                                      "get_data=test\nheaders=test\npatch_data=test\npost_data=test\nput_data=test\n" \
                                      "raw_response=None\nstatus_code=test)"
+
+
+@pycats_dataclass
+class _SharedDefaultsModel(BaseResponseModel):
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+    get_data = {"items": [{"id": 1}, {"id": 2}]}
+    post_data = None
+    put_data = None
+    patch_data = None
+    delete_data = None
+    error_data = None
+    custom_checkers = []
+
+
+def test_mutable_defaults_are_copied_on_access():
+    first, second = _SharedDefaultsModel(config), _SharedDefaultsModel(config)
+    first.get_data["items"].append({"id": 3})
+    assert second.get_data == {"items": [{"id": 1}, {"id": 2}]}
+    assert _SharedDefaultsModel.get_data == {"items": [{"id": 1}, {"id": 2}]}
+    assert first.get_data is first.get_data and first.get_data is not second.get_data
+
+
+def test_peek_field_does_not_copy_defaults():
+    model = _SharedDefaultsModel(config)
+    assert peek_field(model, "get_data") is _SharedDefaultsModel.get_data
+    assert "get_data" not in model.__dict__
+    model.get_data = {"items": []}
+    assert peek_field(model, "get_data") == {"items": []}
+    assert peek_field(model, "status_code") == 200
+
+
+def test_mutable_default_passed_to_init():
+    model = _SharedDefaultsModel(config, headers={"Accept": "*/*"})
+    assert model.headers == {"Accept": "*/*"}
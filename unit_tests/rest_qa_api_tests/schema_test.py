@@ -0,0 +1,156 @@
+from unittest.mock import patch
+
+import pytest
+
+from common._rest_qa_api.bulk_validator import validate_responses
+from common._rest_qa_api.rest_exceptions import RestResponseValidationError
+from common._rest_qa_api.rest_utils import SKIP
+from common._rest_qa_api.schema import Schema, structure_to_schema
+from common._rest_qa_api.validation_plan import ValidationPlan
+from unit_tests.rest_qa_api_tests.bulk_validator_test import city_responses
+
+CITY_SCHEMA = {
+    "type": "object",
+    "required": ["city", "temperature"],
+    "properties": {
+        "city": {"type": "string", "minLength": 1},
+        "temperature": {"type": "object", "required": ["unit", "value"],
+                        "properties": {"unit": {"enum": ["C", "F"]}, "value": {"type": "number"}}},
+        "days": {"type": "array", "items": {"type": "object", "properties": {"day": {"type": "integer",
+                                                                                      "minimum": 1}}}},
+    },
+}
+
+
+def errors_of(schema, value):
+    errors = []
+    Schema(schema).validate(value, ["get_data"], errors)
+    return errors
+
+
+@pytest.mark.parametrize("schema, valid, invalid", [
+    ({"type": "integer"}, 1, 1.5),
+    ({"type": "integer"}, 1, True),
+    ({"type": "integer"}, 1.0, 1.5),
+    ({"type": ["string", "null"]}, None, 1),
+    ({"enum": [1, "a"]}, "a", 2),
+    ({"const": {"a": 1}}, {"a": 1}, {"a": 2}),
+    ({"minimum": 1, "maximum": 3}, 3, 4),
+    ({"exclusiveMinimum": 1}, 2, 1),
+    ({"exclusiveMaximum": 1}, 0, 1),
+    ({"multipleOf": 0.5}, 1.5, 1.2),
+    ({"minLength": 2, "maxLength": 3}, "abc", "abcd"),
+    ({"pattern": "^[a-z]+$"}, "abc", "ab1"),
+    ({"minItems": 1, "maxItems": 2}, [1], []),
+    ({"uniqueItems": True}, [1, 2], [1, 1]),
+    ({"uniqueItems": True}, [1, True, 0, False], [1, 1.0]),
+    ({"uniqueItems": True}, [{"a": 1}, {"a": [1]}], [{"a": 1, "b": 2}, {"b": 2, "a": 1}]),
+    ({"minProperties": 1, "maxProperties": 1}, {"a": 1}, {}),
+    ({"items": [{"type": "integer"}, {"type": "string"}], "additionalItems": False}, [1, "a"], [1, "a", 2]),
+    ({"allOf": [{"type": "integer"}, {"minimum": 1}]}, 1, 0),
+    ({"anyOf": [{"type": "integer"}, {"type": "string"}]}, "a", None),
+    ({"oneOf": [{"type": "integer"}, {"type": "number"}]}, 1.5, 1),
+    ({"not": {"type": "string"}}, 1, "a"),
+    ({"properties": {"a": {"type": "integer"}}, "additionalProperties": False}, {"a": 1}, {"a": 1, "b": 2}),
+])
+def test_keywords(schema, valid, invalid):
+    compiled = Schema(schema)
+    assert compiled.is_valid(valid) and not compiled.is_valid(invalid)
+    assert errors_of(schema, valid) == [] and errors_of(schema, invalid) != []
+
+
+def test_keywords_apply_to_own_types():
+    schema = Schema({"minimum": 1, "minLength": 1, "minItems": 1, "required": ["a"]})
+    assert all(schema.is_valid(value) for value in ("a", 1, [1], {"a": 1}, None, True))
+
+
+def test_error_format():
+    data = {"city": "", "temperature": {"unit": "K"}, "days": [{"day": 1}, {"day": "2"}]}
+    assert errors_of(CITY_SCHEMA, data) == [
+        (["get_data", "city"], "minLength: 1", ""),
+        (["get_data", "temperature", "unit"], "enum: ['C', 'F']", "K"),
+        (["get_data", "temperature", "value"], "required", "field does not present in response"),
+        (["get_data", "days", 1, "day"], "type: integer", "2"),
+    ]
+
+
+def test_unsupported_keyword():
+    with pytest.raises(ValueError, match="Unsupported JSON Schema keywords: \\$ref"):
+        Schema({"properties": {"a": {"$ref": "#/definitions/a"}}})
+
+
+def test_annotations_are_ignored():
+    assert Schema({"title": "City", "description": "city", "format": "uri", "type": "string"}).is_valid("a")
+
+
+def test_from_structure():
+    structure = {"name": str, "count": int, "base": "stations", "coord": {"lon": float, "lat": SKIP},
+                 "weather": [{"id": int}]}
+    assert structure_to_schema({"a": [int]}) == {"type": "object", "required": ["a"],
+                                                 "properties": {"a": {"type": "array", "items": {"type": "integer"}}}}
+    schema = Schema.from_structure(structure, additional_properties=False)
+    data = {"name": "Minsk", "count": 1, "base": "stations", "coord": {"lon": 1.5, "lat": None},
+            "weather": [{"id": 1}, {"id": 2}]}
+    assert schema.is_valid(data)
+    assert not schema.is_valid(dict(data, base="other"))
+    assert not schema.is_valid(dict(data, extra=1))
+    assert not schema.is_valid(dict(data, weather=[{"id": 1}, {"id": "2"}]))
+    with pytest.raises(ValueError):
+        Schema.from_structure({"a": set})
+
+
+@pytest.mark.parametrize("verify_expected", [True, False])
+def test_validation_plan(verify_expected):
+    expected = {"data": Schema(CITY_SCHEMA), "count": 1}
+    plan = ValidationPlan(expected)
+    data = {"city": "Minsk", "temperature": {"unit": "C", "value": 1}}
+    assert plan.check({"data": data, "count": 1}, expected, verify_expected=verify_expected)
+    assert not plan.check({"data": dict(data, city=1), "count": 1}, expected, verify_expected=verify_expected)
+
+
+@patch('requests.Session.request')
+class TestSchemaModel:
+
+    def test_valid_response(self, request_mock, response, builder):
+        request_mock.return_value = response.body({"city": "Minsk", "temperature": {"unit": "C", "value": 1.5}})
+        builder.endpoint.response_model.get_data = Schema(CITY_SCHEMA)
+        builder.endpoint.get()
+
+    def test_invalid_response(self, request_mock, response, builder):
+        request_mock.return_value = response.body({"city": 1, "temperature": {"unit": "C"}})
+        builder.endpoint.response_model.get_data = Schema(CITY_SCHEMA)
+        with pytest.raises(RestResponseValidationError) as excinfo:
+            builder.endpoint.get()
+        assert "Field 'get_data->city', expected value 'type: string', but got '1'" in str(excinfo.value)
+        assert "Field 'get_data->temperature->value', expected value 'required'" in str(excinfo.value)
+
+    def test_schema_with_expected(self, request_mock, response, builder):
+        request_mock.return_value = response.body({"city": "Minsk", "temperature": {"unit": "C", "value": 1}})
+        builder.endpoint.response_model.get_data = Schema(CITY_SCHEMA, expected={"city": "Paris", "temperature": SKIP})
+        with pytest.raises(RestResponseValidationError) as excinfo:
+            builder.endpoint.get()
+        assert "Field 'get_data->city', expected value 'Paris', but got 'Minsk'" in str(excinfo.value)
+
+    def test_expected_is_not_verified_for_invalid_schema(self, request_mock, response, builder):
+        request_mock.return_value = response.body({"city": 1, "temperature": {"unit": "C", "value": 1}})
+        builder.endpoint.response_model.get_data = Schema(CITY_SCHEMA, expected={"city": "Paris", "temperature": SKIP})
+        with pytest.raises(RestResponseValidationError) as excinfo:
+            builder.endpoint.get()
+        assert "'Paris'" not in str(excinfo.value)
+
+    def test_nested_schema(self, request_mock, response, builder):
+        request_mock.return_value = response.body({"count": 2, "items": [{"id": 1}, {"id": "2"}]})
+        builder.endpoint.response_model.get_data = {"count": 2, "items": Schema({"items": {"properties": {
+            "id": {"type": "integer"}}}})}
+        with pytest.raises(RestResponseValidationError) as excinfo:
+            builder.endpoint.get()
+        assert "Field 'get_data->items->1->id', expected value 'type: integer', but got '2'" \
+               in str(excinfo.value)
+
+
+def test_bulk_validation(builder):
+    model = builder.endpoint.response_model
+    model.status_code = 200
+    model.get_data = Schema(CITY_SCHEMA)
+    report = validate_responses(model, city_responses(10, broken=(4,)))
+    assert report.failed_indexes == [4] and report.passed == 9
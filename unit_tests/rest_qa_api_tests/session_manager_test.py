@@ -0,0 +1,99 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from common._rest_qa_api.session_manager import SessionManager
+from common._libs.helpers.singleton import delete_singleton_object
+from common.config_parser.config_dto import APISettingsDTO
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="function")
+def session_manager():
+    delete_singleton_object(SessionManager)
+    manager = SessionManager(APISettingsDTO(pool_maxsize=2))
+    yield manager
+    manager.close()
+    delete_singleton_object(SessionManager)
+
+
+def test_session_is_shared_for_the_same_base_url(session_manager):
+    assert session_manager.get_session("http://test/") is session_manager.get_session("http://test/")
+
+
+def test_session_is_not_shared_for_different_settings(session_manager):
+    session = session_manager.get_session("http://test/")
+    assert session is not session_manager.get_session("http://test2/")
+    assert session is not session_manager.get_session("http://test/", verify=False)
+    assert session is not session_manager.get_session("http://test/", headers={"Accept": "text/plain"})
+
+
+def test_session_settings_applied(session_manager):
+    session = session_manager.get_session("http://test/", verify=False, headers={"X-Test": "1"},
+                                          proxies={"http": "http://proxy:8080"})
+    assert session.verify is False
+    assert session.headers["X-Test"] == "1"
+    assert session.proxies["http"] == "http://proxy:8080"
+    assert session.get_adapter("http://test/")._pool_maxsize == 2
+
+
+def test_connection_reused_for_multiple_requests(session_manager, local_server):
+    session = session_manager.get_session(local_server)
+    for _ in range(5):
+        assert session.get(local_server).json() == {"status": "ok"}
+    assert session_manager.connection_stats(local_server) == {"requests": 5, "connections_opened": 1,
+                                                              "reused_connections": 4}
+    assert session_manager.connection_stats("http://other/")["requests"] == 0
+
+
+def test_session_without_retries(session_manager):
+    manager = SessionManager(APISettingsDTO(max_retries=3))
+    assert manager.get_session("http://test/").get_adapter("http://test/").max_retries.total == 3
+    session = manager.get_session("http://test/", retries=False)
+    assert session.get_adapter("http://test/").max_retries.total == 0
+    assert session is manager.get_session("http://test/", retries=False)
+    manager.close()
+
+
+def test_session_manager_per_settings(session_manager):
+    assert SessionManager() is session_manager
+    other = SessionManager(APISettingsDTO(pool_maxsize=5))
+    assert other is not session_manager
+    assert other.api_settings.pool_maxsize == 5
+    assert SessionManager() is other
+    assert SessionManager(APISettingsDTO(pool_maxsize=2)) is session_manager
+    assert SessionManager() is session_manager
+
+
+def test_proxied_connections_counted(session_manager, local_server):
+    # local server answers any absolute URL, so it is used as the proxy for the other host
+    session = session_manager.get_session("http://proxied.test/", proxies={"http": local_server})
+    for _ in range(3):
+        assert session.get("http://proxied.test/").json() == {"status": "ok"}
+    assert session_manager.connection_stats("http://proxied.test/") == {"requests": 3, "connections_opened": 1,
+                                                                        "reused_connections": 2}
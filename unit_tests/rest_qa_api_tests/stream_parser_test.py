@@ -0,0 +1,92 @@
+import json
+import random
+
+import pytest
+
+from common._rest_qa_api.rest_utils import SKIP
+from common._rest_qa_api.stream_parser import StreamingJSONParser, parse_json_stream
+
+
+def chunks(document, size):
+    data = json.dumps(document).encode() if not isinstance(document, bytes) else document
+    return (data[index:index + size] for index in range(0, len(data), size))
+
+
+def pruned(document, model):
+    """Reference implementation of the pruning rules"""
+    if model is SKIP:
+        return SKIP
+    if isinstance(document, dict) and isinstance(model, dict) and model:
+        return {key: pruned(value, model[key]) for key, value in document.items() if key in model}
+    if isinstance(document, list) and isinstance(model, list) and model:
+        return [pruned(value, expected) for value, expected in zip(document, model)]
+    return document
+
+
+@pytest.mark.parametrize("size", [1, 3, 64])
+@pytest.mark.parametrize("document", [
+    {"key": "value", "escaped": "q\"uo\\te é € ]}", "list": [1, -2.5, 3e10, True, False, None]},
+    [[], {}, [{}], "", 0, 12345678901234567890123456789012345678901234567890],
+    "text",
+    -0.5,
+    None,
+])
+def test_parse_whole_document(document, size):
+    assert parse_json_stream(chunks(document, size)) == document
+
+
+@pytest.mark.parametrize("size", [1, 5, 4096])
+def test_skipped_subtrees_are_not_built(size):
+    document = {"id": 1, "extra": {"nested": ["]", "}"]},
+                "items": [{"id": 1, "name": "first", "tags": ["a"]}, {"id": 2, "name": "[{"}, {"id": 3}]}
+    model = {"id": 1, "items": [{"id": 1, "tags": SKIP}, SKIP]}
+    assert parse_json_stream(chunks(document, size), model) == {"id": 1, "items": [{"id": 1, "tags": SKIP}, SKIP]}
+
+
+def test_whole_subtree_kept_for_primitive_and_empty_model_values():
+    document = {"primitive": {"key": [1]}, "empty_dict": {"key": 1}, "empty_list": [1, 2]}
+    model = {"primitive": None, "empty_dict": {}, "empty_list": []}
+    assert parse_json_stream(chunks(document, 2), model) == document
+
+
+@pytest.mark.parametrize("document", [b'{"key":}', b'[1,]', b'{"key" 1}', b'"text', b'[1 2]', b'', b'{}x',
+                                      b'tru', b'"\\x"', b'{"skipped": [1, 2}', b'[{"skipped": "'])
+def test_invalid_document(document):
+    with pytest.raises(ValueError):
+        parse_json_stream(chunks(document, 2), {"skipped": SKIP})
+
+
+def test_buffer_is_dropped_while_parsing():
+    document = {"items": [{"id": index, "name": f"item {index}"} for index in range(10000)]}
+    stream = chunks(document, 1024)
+    parser = StreamingJSONParser(stream, buffer_size=4096)
+    assert parser.parse({"items": [{"id": 0}, SKIP]}) == {"items": [{"id": 0}, SKIP]}
+    assert len(parser._buffer) < 8192
+
+
+def random_tree(depth):
+    choice = random.random()
+    if depth == 0 or choice < 0.3:
+        return random.choice([1, -2.5, "a\"b\\c]", None, True, SKIP, [], {}])
+    if choice < 0.65:
+        return {random.choice("abc"): random_tree(depth - 1) for _ in range(random.randint(0, 3))}
+    return [random_tree(depth - 1) for _ in range(random.randint(0, 3))]
+
+
+def document_tree(tree):
+    if tree is SKIP:
+        return {"skipped": ["value"]}
+    if isinstance(tree, dict):
+        return {key: document_tree(value) for key, value in tree.items()}
+    if isinstance(tree, list):
+        return [document_tree(value) for value in tree]
+    return tree
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pruning_matches_reference(seed):
+    random.seed(seed)
+    for _ in range(200):
+        model, document = random_tree(4), document_tree(random_tree(4))
+        assert parse_json_stream(chunks(document, random.randint(1, 16)), model) == pruned(document, model), \
+            (model, document)
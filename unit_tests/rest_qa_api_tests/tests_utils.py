@@ -1,7 +1,7 @@
 from requests import Response, Request
 
 from common._libs.helpers.singleton import Singleton
-from common.config_parser.config_dto import APIValidationDTO
+from common.config_parser.config_dto import APIValidationDTO, APISettingsDTO
 from common._rest_qa_api.base_endpoint import BaseRequestModel, BaseResponseModel, endpoint_factory
 from common._rest_qa_api.rest_utils import pycats_dataclass, SKIP
 
@@ -39,6 +39,10 @@ class DummyConfigBuilder:
         return APIValidationDTO(self.api_validations.validate_status_code, self.api_validations.validate_headers,
                                 self.api_validations.validate_body, self.api_validations.validate_is_field_missing)
 
+    @staticmethod
+    def get_api_settings():
+        return APISettingsDTO()
+
 
 @pycats_dataclass
 class TestEndpointBuilder:
@@ -99,10 +103,18 @@ class DummyResponseBuilder(Response, metaclass=Singleton):
 
     def body(self, body=""):
         self.text = body
+        # codecs decode the body from bytes
+        self._content = body.encode() if isinstance(body, str) else b""
+        return self
+
+    def stream_content(self, body=b""):
+        # content is used by the streaming converter via iter_content
+        self._content = body
+        self._content_consumed = True
         return self
 
     def set_default_state(self):
-        self.method().code().header({}).body()
+        self.method().code().header({}).body().stream_content()
 
 
 def exclude_fields_from_obj(obj, affected_fields):
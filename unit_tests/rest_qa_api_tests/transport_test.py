@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from common._libs.helpers.singleton import delete_singleton_object
+from common._rest_qa_api.base_endpoint import BaseEndpoint
+from common._rest_qa_api.rest_utils import make_request_url
+from common._rest_qa_api.session_manager import SessionManager
+from common._rest_qa_api.transport import ResponseCache, Transport, _make_private_dir, default_cache_dir
+from common.config_parser.config_dto import APISettingsDTO
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_count = 0
+
+    def do_GET(self):  # noqa
+        _CountingHandler.requests_count += 1
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="function")
+def make_transport(tmp_path):
+    def factory(mode):
+        delete_singleton_object(SessionManager)
+        _CountingHandler.requests_count = 0
+        return Transport(SessionManager(APISettingsDTO(transport_mode=mode, cache_dir=str(tmp_path))))
+    yield factory
+    SessionManager().close()
+    delete_singleton_object(SessionManager)
+
+
+def make_response(content=b"{}", status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+def test_cache_key_is_canonical():
+    key = ResponseCache.make_key(dict(method="get", url="http://test/", headers={"A": "1", "B": "2"}))
+    assert key == ResponseCache.make_key(dict(url="http://test/", headers={"B": "2", "A": "1"}, method="GET"))
+    assert key == ResponseCache.make_key(dict(method="get", url="http://test/", headers={"A": "1", "B": "2"},
+                                              stream=True))
+    assert key != ResponseCache.make_key(dict(method="get", url="http://test/", headers={"A": "1"}))
+    assert key != ResponseCache.make_key(dict(method="get", url="http://test/", headers={"A": "1", "B": "2"},
+                                              params="page=2"))
+
+
+def test_cache_entry_expires(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put("key", make_response(b"cached"))
+    assert cache.get("key").content == b"cached"
+    with patch("common._rest_qa_api.transport.time.time", return_value=time.time() + 3600):
+        assert cache.get("key") is None
+    assert cache.get("key") is None
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_least_recently_used_entry_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    cache.put("first", make_response())
+    cache.put("second", make_response())
+    os.utime(cache._path("first"), (1000, 1000))
+    os.utime(cache._path("second"), (2000, 2000))
+    assert cache.get("first") is not None
+    cache.put("third", make_response())
+    assert cache.get("second") is None
+    assert cache.get("first") is not None and cache.get("third") is not None
+
+
+def test_cached_response_is_json(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    response = make_response(b"\xff\xd8")
+    response.headers["Content-Type"] = "image/jpeg"
+    response.request = requests.Request("POST", "http://test/", data=b"body").prepare()
+    cache.put("key", response)
+    with open(cache._path("key")) as file:
+        assert json.load(file)["status_code"] == 200
+    cached = cache.get("key")
+    assert cached.content == b"\xff\xd8" and cached.headers["content-type"] == "image/jpeg"
+    assert cached.request.method == "POST" and cached.request.body == b"body"
+
+
+def test_unsuccessful_response_not_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert not cache.put("key", make_response(status_code=503))
+    assert cache.get("key") is None
+
+
+def test_cache_index_restored_from_files(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    cache.put("first", make_response())
+    cache.put("second", make_response())
+    os.utime(cache._path("first"), (2000, 2000))
+    os.utime(cache._path("second"), (1000, 1000))
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    with patch("common._rest_qa_api.transport.os.listdir") as listdir:
+        cache.put("third", make_response())
+    assert not listdir.called
+    assert cache.get("second") is None and cache.get("first") is not None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="folder permissions are checked on POSIX systems only")
+def test_default_cache_dir_is_private(tmp_path):
+    with patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        path = default_cache_dir()
+        _make_private_dir(path)
+        assert os.stat(path).st_mode & 0o777 == 0o700
+        os.chmod(path, 0o777)
+        with pytest.raises(PermissionError):
+            _make_private_dir(path)
+
+
+def test_replay_mode_returns_cached_response(make_transport, local_server):
+    transport = make_transport("replay")
+    for _ in range(3):
+        response = transport.send(local_server, method="get", url=local_server)
+        assert response.json() == {"status": "ok"}
+    assert _CountingHandler.requests_count == 1
+    assert transport.cache.stats() == {"hits": 2, "misses": 1}
+
+
+def test_record_mode_sends_requests(make_transport, local_server):
+    transport = make_transport("record")
+    for _ in range(2):
+        transport.send(local_server, method="get", url=local_server)
+    assert _CountingHandler.requests_count == 2
+    assert transport.cache.get(ResponseCache.make_key(dict(method="get", url=local_server))).json() == \
+        {"status": "ok"}
+
+
+@pytest.mark.parametrize("mode, kwargs", [("passthrough", {}), ("replay", {"stream": True}),
+                                          ("replay", {"use_cache": False})])
+def test_request_not_cached(make_transport, local_server, mode, kwargs):
+    transport = make_transport(mode)
+    for _ in range(2):
+        transport.send(local_server, method="get", url=local_server, **kwargs).close()
+    assert _CountingHandler.requests_count == 2
+
+
+def test_endpoint_opt_out(make_transport, local_server):
+    transport = make_transport("replay")
+    request_model = TestEndpointBuilder._TestRequestModel()
+    request_model.allowed_methods = ("get",)
+    response_model = TestEndpointBuilder._TestResponseModel(config=DummyConfigBuilder(DummyApiValidationConfig()))
+    endpoint = BaseEndpoint(local_server, request_model, response_model, make_request_url, transport=transport)
+    endpoint.get()
+    endpoint.get()
+    assert _CountingHandler.requests_count == 1
+    endpoint.use_response_cache = False
+    endpoint.get()
+    assert _CountingHandler.requests_count == 2
+
+
+def test_transport_of_each_session_manager(make_transport):
+    replay = make_transport("replay")
+    passthrough_manager = SessionManager(APISettingsDTO(pool_maxsize=3))
+    passthrough = Transport(passthrough_manager)
+    assert passthrough is not replay and passthrough.session_manager is passthrough_manager
+    assert passthrough.mode == "passthrough" and passthrough.cache is None
+    assert Transport(passthrough_manager) is passthrough and Transport() is passthrough
+    assert Transport(replay.session_manager) is replay
@@ -0,0 +1,123 @@
+import logging
+import random
+
+import pytest
+
+from common._rest_qa_api.rest_utils import SKIP
+from common._rest_qa_api.validation_plan import ValidationPlan, get_validation_plan
+from unit_tests.rest_qa_api_tests.tests_utils import TestEndpointBuilder, DummyConfigBuilder, DummyApiValidationConfig
+
+config = DummyConfigBuilder(DummyApiValidationConfig())
+
+
+def recursive_errors(data, expected, field_name="get_data"):
+    response = TestEndpointBuilder._TestResponseModel(config=config)
+    response._check_is_field_missing = True
+    response.errors = {"default": [], "custom": []}
+    response.field_nesting = []
+    response._validate_structure(field_name, data, expected)
+    return response.errors["default"]
+
+
+@pytest.mark.parametrize("expected, data", [
+    (SKIP, {"key": "value"}),
+    ({"key": "value"}, {"key": "value", "other": 1}),
+    ({"key": SKIP, "list": [1, SKIP, {"nested": [None]}]}, {"key": 1, "list": [1, 2, {"nested": [None]}, 4]}),
+    ({"key": []}, {"key": []}),
+    (None, None),
+    ([], []),
+    (200, 200),
+])
+def test_plan_passes_valid_data(expected, data):
+    assert not recursive_errors(data, expected)
+    assert ValidationPlan(expected).check(data, expected) is True
+    assert ValidationPlan(expected).check(data, None, verify_expected=False) is True
+
+
+@pytest.mark.parametrize("expected, data", [
+    ({"key": "value"}, {"key": "other"}),
+    ({"key": SKIP}, {"other": 1}),
+    ({"key": "value"}, {}),
+    ({}, {"key": "value"}),
+    ([1, 2], [1]),
+    ([1], []),
+    ({"key": [1]}, {"key": {"0": 1}}),
+    ({"key": {"nested": 1}}, {"key": [1]}),
+    (200, 400),
+    ("a", ["a"]),
+])
+def test_plan_fails_on_any_mismatch(expected, data):
+    assert ValidationPlan(expected).check(data, expected) is False
+    assert ValidationPlan(expected).check(data, None, verify_expected=False) is False
+
+
+def test_plan_detects_in_place_changes_of_expected_tree():
+    expected = {"key": "value", "nested": {"inner": SKIP}}
+    plan = ValidationPlan(expected)
+    expected["nested"]["other"] = 1
+    assert plan.check({"key": "value", "nested": {"inner": 1}}, expected) is None
+    expected = {"key": "value"}
+    plan = ValidationPlan(expected)
+    expected["key"] = SKIP
+    assert plan.check({"key": "value"}, expected) is None
+
+
+def test_plan_detects_in_place_changes_of_expected_values():
+    expected = {"key": "value"}
+    plan = ValidationPlan(expected)
+    expected["key"] = "changed"
+    assert plan.check({"key": "value"}, expected) is None
+    assert ValidationPlan(expected).check({"key": "value"}, expected) is False
+
+
+def test_plan_is_cached_per_expected_object():
+    expected = {"key": "value"}
+    plan = get_validation_plan(dict, "get_data", expected)
+    assert get_validation_plan(dict, "get_data", expected) is plan
+    assert get_validation_plan(dict, "get_data", dict(expected)) is not plan
+
+
+def random_tree(depth):
+    choice = random.random()
+    if depth == 0 or choice < 0.3:
+        return random.choice([1, "a", None, True, SKIP, [], {}])
+    if choice < 0.65:
+        return {random.choice("abc"): random_tree(depth - 1) for _ in range(random.randint(0, 3))}
+    return [random_tree(depth - 1) for _ in range(random.randint(0, 3))]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_plan_result_matches_recursive_validation(seed, caplog):
+    random.seed(seed)
+    for _ in range(200):
+        expected, data = random_tree(4), random_tree(4)
+        if data is SKIP:
+            continue
+        caplog.clear()
+        with caplog.at_level(logging.WARNING):
+            try:
+                errors = recursive_errors(data, expected)
+            except (AttributeError, TypeError, KeyError):
+                errors = ["crash"]
+        if ValidationPlan(expected).check(data, expected):
+            assert not errors and not caplog.records, (expected, data)
+
+
+def conforming_data(expected):
+    if expected is SKIP:
+        return "skipped"
+    if isinstance(expected, dict):
+        return {key: conforming_data(value) for key, value in expected.items()}
+    if isinstance(expected, list):
+        return [conforming_data(value) for value in expected]
+    return expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_plan_passes_conforming_data(seed):
+    random.seed(seed)
+    for _ in range(200):
+        expected = random_tree(4)
+        data = conforming_data(expected)
+        if not recursive_errors(data, expected):
+            assert ValidationPlan(expected).check(data, expected) is True, (expected, data)
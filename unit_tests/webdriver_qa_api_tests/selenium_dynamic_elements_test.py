@@ -0,0 +1,119 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException  # noqa: E402
+from selenium.webdriver.common.by import By  # noqa: E402
+
+from common._libs.helpers.singleton import delete_singleton_object  # noqa: E402
+from common._webdriver_qa_api.core.selenium_dynamic_elements import (DynamicElement, DynamicElements,  # noqa: E402
+                                                                      ElementCacheStats, invalidate_element_cache)
+
+TTL = 0.1
+
+
+@pytest.fixture(autouse=True)
+def stats():
+    delete_singleton_object(ElementCacheStats)
+    yield ElementCacheStats()
+    delete_singleton_object(ElementCacheStats)
+
+
+@pytest.fixture
+def driver():
+    driver = Mock()
+    driver.find_element.side_effect = lambda *args: Mock(name="handle")
+    return driver
+
+
+def test_element_is_found_on_each_access_without_cache(driver):
+    element = DynamicElement(By.ID, "login", driver)
+    assert element() is not element()
+    assert driver.find_element.call_count == 2
+
+
+def test_cached_handle_is_reused(driver, stats):
+    element = DynamicElement(By.ID, "login", driver, cache_ttl=10)
+    assert element() is element()
+    assert driver.find_element.call_count == 1
+    assert stats.reset() == dict(hits=1, misses=1, stale=0)
+
+
+def test_cached_handle_expires(driver, stats):
+    element = DynamicElement(By.ID, "login", driver, cache_ttl=TTL)
+    handle = element()
+    time.sleep(TTL * 1.5)
+    assert element() is not handle
+    assert driver.find_element.call_count == 2 and stats.misses == 2
+
+
+def test_navigation_invalidates_cached_handles(driver, stats):
+    element = DynamicElement(By.ID, "login", driver, cache_ttl=10)
+    other_driver_element = DynamicElement(By.ID, "login", Mock(), cache_ttl=10)
+    handle, other_handle = element(), other_driver_element()
+    invalidate_element_cache(driver)
+    assert element() is not handle and other_driver_element() is other_handle
+    assert driver.find_element.call_count == 2
+
+
+def test_stale_handle_is_found_again(driver, stats):
+    stale, fresh = Mock(), Mock()
+    stale.click.side_effect = StaleElementReferenceException("stale")
+    fresh.click.return_value = "clicked"
+    driver.find_element.side_effect = [stale, fresh]
+    element = DynamicElement(By.ID, "login", driver, cache_ttl=10)
+    assert element.click() == "clicked"
+    assert element() is fresh and driver.find_element.call_count == 2
+    assert stats.stale == 1
+
+
+def test_stale_handle_is_not_retried_without_cache(driver):
+    driver.find_element.side_effect = None
+    driver.find_element.return_value.click.side_effect = StaleElementReferenceException("stale")
+    element = DynamicElement(By.ID, "login", driver)
+    with pytest.raises(StaleElementReferenceException):
+        element.click()
+
+
+def test_stale_parent_is_found_again(driver, stats):
+    stale_parent, parent = Mock(), Mock()
+    stale_parent.find_element.side_effect = StaleElementReferenceException("stale")
+    driver.find_element.side_effect = [stale_parent, parent]
+    form = Mock(element=DynamicElement(By.ID, "form", driver, cache_ttl=10))
+    form.element()
+    element = DynamicElement(By.ID, "login", driver, parent=form)
+    assert element() is parent.find_element.return_value
+    assert stats.stale == 1
+
+
+def test_element_is_waited_with_find_timeout(driver):
+    handle = Mock()
+    driver.find_elements.side_effect = [[], [], [handle]]
+    assert DynamicElement(By.ID, "login", driver, find_timeout=1)() is handle
+    driver.find_elements.side_effect = None
+    driver.find_elements.return_value = []
+    with pytest.raises(NoSuchElementException):
+        DynamicElement(By.ID, "login", driver, find_timeout=TTL)()
+
+
+def test_elements_are_waited_with_find_timeout(driver):
+    handles = [Mock(), Mock()]
+    driver.find_elements.side_effect = [[], handles]
+    assert DynamicElements(By.ID, "row", driver, find_timeout=1)() == handles
+
+
+def test_find_without_waiting(driver):
+    parent_handle, handle = Mock(), Mock()
+    parent_handle.find_elements.return_value = [handle]
+    driver.find_elements.return_value = [parent_handle]
+    form = Mock(element=DynamicElement(By.ID, "form", driver, cache_ttl=10))
+    element = DynamicElement(By.ID, "login", driver, parent=form, cache_ttl=10)
+    assert element.find_without_waiting() == [handle]
+    parent_handle.find_elements.assert_called_once_with(By.ID, "login")
+    # cached handles are not used and find_element is not sent
+    driver.find_element.assert_not_called()
+    driver.find_elements.return_value = []
+    assert element.find_without_waiting() == []